@@ -11,6 +11,8 @@ import json
 from typing import List, Dict
 import random
 
+from scraper.categorizer import categorize
+
 async def scrape_amazon_deals(max_deals: int = 120) -> List[Dict]:
     """Scrape deals from Amazon.ca goldbox and today's deals."""
     print(f"Scraping Amazon.ca for up to {max_deals} deals...")
@@ -132,22 +134,7 @@ async def create_deal_from_asin(client: httpx.AsyncClient, asin: str, headers: D
         original_price = price * (1 + discount_percent / 100)
         
         # Determine category from title keywords
-        category = "General"
-        title_lower = title.lower()
-        if any(word in title_lower for word in ['laptop', 'computer', 'phone', 'tablet', 'tv', 'speaker']):
-            category = "Electronics"
-        elif any(word in title_lower for word in ['shirt', 'shoes', 'pants', 'dress', 'jacket']):
-            category = "Clothing"
-        elif any(word in title_lower for word in ['book', 'kindle']):
-            category = "Books"
-        elif any(word in title_lower for word in ['toy', 'game', 'lego']):
-            category = "Toys & Games"
-        elif any(word in title_lower for word in ['cream', 'lotion', 'shampoo', 'makeup']):
-            category = "Health & Beauty"
-        elif any(word in title_lower for word in ['home', 'kitchen', 'furniture', 'decor']):
-            category = "Home & Garden"
-        elif any(word in title_lower for word in ['sports', 'fitness', 'exercise', 'bike']):
-            category = "Sports"
+        category = categorize(title)
         
         deal = {
             "id": f"deal_{asin}_scraped",
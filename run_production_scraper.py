@@ -4,35 +4,51 @@ Production scraper runner for maintaining ~120 deals.
 This script is designed for scheduled runs (cron jobs, etc.) to keep the site fresh.
 """
 
+import argparse
 import asyncio
 import sys
 import os
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 # Add scraper directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scraper'))
 
-from scraper.focused_scraper import FocusedScraper
-from scraper.settings import Settings
-from scraper.utils import setup_logging
+# Scraper modules are imported where they are used, so --help and --dry-run start fast
+if TYPE_CHECKING:
+    from scraper.settings import Settings
 
 
-async def run_production_scrape():
+async def run_production_scrape(dry_run: bool = False):
     """Run a production scrape targeting ~120 deals."""
     print(f"🚀 Starting production scrape at {datetime.now()}")
     print("Target: ~120 deals with real Amazon pricing")
     
     try:
+        from scraper.marketplaces import parse_marketplaces
+        from scraper.settings import get_settings
+        
         # Initialize with production settings
-        settings = Settings()
+        settings = get_settings()
         
         # Validate environment
         print("🔍 Validating production environment...")
         if not validate_production_environment(settings):
             return False
         
+        marketplaces = parse_marketplaces(settings.amz_marketplaces)
+        if dry_run:
+            print(f"🧪 Dry run: would scrape {', '.join(marketplaces)} into public/deals.json")
+            return True
+        
+        # Several marketplaces run concurrently, each writing its own locale's deals
+        if len(marketplaces) > 1:
+            return await run_multi_marketplace_scrape(settings)
+        
+        from scraper.focused_scraper import FocusedScraper
+        
         # Run the scraper with deal management
         async with FocusedScraper(settings) as scraper:
             deals = await scraper.scrape_deals(
@@ -54,6 +70,8 @@ async def run_production_scrape():
                     print(f"   - PAAPI successes: {stats.get('paapi_success', 0)}")
                     print(f"   - Scraping successes: {stats.get('scraping_success', 0)}")
                     print(f"   - Products skipped: {stats.get('products_skipped', 0)}")
+                    if stats.get('checkpoint_reused'):
+                        print(f"   - Resumed from checkpoint: {stats['checkpoint_reused']} lookups reused")
                 
                 return True
             else:
@@ -66,7 +84,20 @@ async def run_production_scrape():
         return False
 
 
-def validate_production_environment(settings: Settings) -> bool:
+async def run_multi_marketplace_scrape(settings: 'Settings') -> bool:
+    """Scrape every configured marketplace concurrently from this process."""
+    from scraper.multi_marketplace import MultiMarketplaceScraper
+    
+    async with MultiMarketplaceScraper(settings) as scraper:
+        results = await scraper.scrape_deals(output_file="public/deals.json")
+    
+    for code, deals in results.items():
+        print(f"{'✅' if deals else '❌'} {code}: {len(deals)} deals")
+    
+    return all(results.values())
+
+
+def validate_production_environment(settings: 'Settings') -> bool:
     """Validate the production environment is ready."""
     
     # Check Amazon API credentials
@@ -100,8 +131,26 @@ def validate_production_environment(settings: Settings) -> bool:
     return True
 
 
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Run a production scrape that keeps ~120 deals fresh'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Validate the production environment and exit without scraping'
+    )
+    
+    return parser.parse_args()
+
+
 def main():
     """Main entry point for production scraper."""
+    args = parse_arguments()
+    
+    from scraper.utils import setup_logging
     
     # Set up production logging
     setup_logging("INFO")
@@ -115,7 +164,7 @@ def main():
     logging.getLogger().addHandler(file_handler)
     
     # Run the scraper
-    success = asyncio.run(run_production_scrape())
+    success = asyncio.run(run_production_scrape(dry_run=args.dry_run))
     
     if success:
         print("🎉 Production scrape completed successfully")
@@ -9,13 +9,14 @@ import sys
 import os
 import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add scraper directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scraper'))
 
-from scraper.focused_scraper import FocusedScraper
-from scraper.settings import Settings
-from scraper.utils import setup_logging
+# Scraper modules are imported where they are used, so --help and --dry-run start fast
+if TYPE_CHECKING:
+    from scraper.settings import Settings
 
 
 def parse_arguments():
@@ -57,6 +58,12 @@ def parse_arguments():
         help='Run in test mode with limited data'
     )
     
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Verify configuration and show what would run, without scraping'
+    )
+    
     return parser.parse_args()
 
 
@@ -64,6 +71,9 @@ async def main():
     """Main entry point for the scraper."""
     args = parse_arguments()
     
+    from scraper.settings import get_settings
+    from scraper.utils import setup_logging
+    
     # Setup logging
     setup_logging(args.log_level)
     
@@ -72,7 +82,7 @@ async def main():
     # Use settings default if pages not specified
     pages_to_scrape = args.pages
     if pages_to_scrape is None:
-        settings = Settings()
+        settings = get_settings()
         pages_to_scrape = settings.max_pages_to_scrape
     
     print(f"Pages to scrape: {pages_to_scrape}")
@@ -88,12 +98,18 @@ async def main():
     
     try:
         # Initialize settings
-        settings = Settings()
+        settings = get_settings()
         
         # Verify environment
         if not verify_environment(settings, args.no_paapi):
             return 1
         
+        if args.dry_run:
+            print("Dry run: configuration OK, nothing scraped")
+            return 0
+        
+        from scraper.focused_scraper import FocusedScraper
+        
         # Ensure output directory exists
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -114,7 +130,7 @@ async def main():
                 print(f"Output saved to: {args.output}")
                 
                 # Print summary statistics
-                print_summary_stats(deals, scraper.stats)
+                print_summary_stats(deals, scraper.stats, scraper.metrics)
                 
                 return 0
             else:
@@ -129,7 +145,7 @@ async def main():
         return 1
 
 
-def verify_environment(settings: Settings, skip_paapi: bool = False) -> bool:
+def verify_environment(settings: 'Settings', skip_paapi: bool = False) -> bool:
     """Verify that the environment is properly configured."""
     print("Verifying environment configuration...")
     
@@ -164,7 +180,7 @@ def verify_environment(settings: Settings, skip_paapi: bool = False) -> bool:
     return True
 
 
-def print_summary_stats(deals, stats):
+def print_summary_stats(deals, stats, metrics=None):
     """Print summary statistics about the scraping session."""
     print("\nScraping Summary:")
     print(f"   SavingsGuru posts processed: {stats['posts_scraped']}")
@@ -202,6 +218,13 @@ def print_summary_stats(deals, stats):
     print(f"\nCategories:")
     for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
         print(f"   {category}: {count} deals")
+    
+    if metrics is not None:
+        print("\nPerformance (compare runs with: python -m scraper.perf_report):")
+        for stage, seconds in metrics.stage_seconds.items():
+            print(f"   {stage}: {seconds:.1f}s")
+        for source, requests in metrics.requests.items():
+            print(f"   {source}: {requests} requests, {metrics.bytes[source] / 1024:.0f} KiB")
 
 
 if __name__ == "__main__":
@@ -1,21 +1,21 @@
 #!/usr/bin/env python3
 """
 Scheduler for running the production scraper at regular intervals.
-Maintains ~120 deals by running scraper every few hours.
+Maintains ~120 deals by running a persistent daemon that keeps clients,
+caches and the deal store warm between runs.
 """
 
 import asyncio
-import schedule
-import time
+import argparse
 import logging
 from datetime import datetime
 from pathlib import Path
 
-from run_production_scraper import run_production_scrape
+from run_production_scraper import run_production_scrape, validate_production_environment
 
 
 def job_wrapper():
-    """Wrapper to run async scraper in sync context."""
+    """Wrapper to run a single async scrape in sync context."""
     print(f"\n⏰ Scheduled scraper run started at {datetime.now()}")
     
     try:
@@ -29,8 +29,25 @@ def job_wrapper():
         logging.exception("Scheduled run error")
 
 
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Run the SavingsGuru scraper continuously as a daemon'
+    )
+    
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Run a single production scrape and exit'
+    )
+    
+    return parser.parse_args()
+
+
 def main():
-    """Set up and run the scheduler."""
+    """Set up and run the scheduler daemon."""
+    args = parse_arguments()
+    
     print("🕒 SavingsGuru Deal Scraper Scheduler")
     print("Maintaining ~120 deals with regular updates")
     
@@ -44,34 +61,33 @@ def main():
         ]
     )
     
-    # Schedule scraper runs
-    # Run every 6 hours to keep deals fresh
-    schedule.every(6).hours.do(job_wrapper)
+    if args.once:
+        job_wrapper()
+        return
     
-    # Optional: Run daily at specific time (e.g., 6 AM)
-    # schedule.every().day.at("06:00").do(job_wrapper)
+    from scraper.settings import get_settings
+    from scraper.daemon import ScraperDaemon
     
-    print("📅 Scheduler configured:")
-    print("   - Every 6 hours: Full scraper run")
-    print("   - Target: ~120 deals")
-    print("   - Deal freshness: 24 hours")
-    print("   - Press Ctrl+C to stop\n")
+    settings = get_settings()
+    if not validate_production_environment(settings):
+        return
     
-    # Run initial scrape
-    print("🚀 Running initial scrape...")
-    job_wrapper()
+    print("📅 Daemon configured:")
+    print(f"   - Every {settings.daemon_scrape_interval_hours:g} hours: Full scraper run")
+    if settings.daemon_refresh_enabled:
+        print(f"   - Continuous ASIN refresh (up to {settings.refresh_quota_per_hour}/hour)")
+        print(f"   - Every {settings.daemon_commit_interval_minutes:g} minutes: Commit refreshed prices")
+    print(f"   - Target: ~{settings.target_deal_count} deals")
+    print(f"   - Deal freshness: {settings.deal_freshness_hours} hours")
+    print("   - Press Ctrl+C or send SIGTERM to stop (in-flight jobs are drained)\n")
     
-    # Start scheduler loop
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    except KeyboardInterrupt:
-        print("\n⏹️ Scheduler stopped by user")
+        asyncio.run(ScraperDaemon(settings).run())
+        print("\n⏹️ Scheduler stopped")
     except Exception as e:
         print(f"\n💥 Scheduler crashed: {e}")
         logging.exception("Scheduler error")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -10,27 +10,40 @@ from typing import Optional, List, Dict, Any
 from decimal import Decimal
 
 from amazon_paapi import AmazonApi
+from amazon_paapi.errors import TooManyRequests
 from pydantic import ValidationError
 
 from .settings import Settings
 from .models import AmazonProduct, DataSource, ScrapingResult
+from .concurrency import AdaptiveLimiter
+from .retry import RetryBudget, RetryPolicy
 
 
 logger = logging.getLogger(__name__)
 
+# PAAPI failures worth retrying: throttling and network trouble (not bad ASINs or credentials)
+TRANSIENT_ERRORS = (TooManyRequests, ConnectionError, TimeoutError)
+
 
 class AmazonAPIClient:
     """
-    Amazon Product Advertising API client with Canadian marketplace support.
+    Amazon Product Advertising API client for the configured marketplace (Canada by default).
     Implements rate limiting, error handling, and structured data extraction.
     """
     
-    def __init__(self, settings: Settings):
-        """Initialize the Amazon API client with settings."""
+    def __init__(self, settings: Settings, retry_budget: Optional[RetryBudget] = None):
+        """Initialize the Amazon API client with settings (retries draw from `retry_budget` if given)."""
         self.settings = settings
         self._last_request_time = 0.0
+        self._throttle_lock = asyncio.Lock()
+        # Requests sent, i.e. PAAPI quota consumed (cumulative over the client's lifetime)
+        self.stats = {'requests': 0}
+        
+        # Overlap request latency up to what PAAPI accepts; the rate limit delay still spaces request starts
+        self.limiter = AdaptiveLimiter.from_settings(f"paapi:{settings.amz_marketplace}", settings)
+        self.retry_policy = RetryPolicy.from_settings(settings, budget=retry_budget)
         
-        # Initialize Amazon API for Canadian marketplace
+        # Initialize Amazon API for the configured marketplace (one client, and throttle, per marketplace)
         try:
             self.amazon_api = AmazonApi(
                 key=settings.amz_access_key,
@@ -47,16 +60,18 @@ class AmazonAPIClient:
         """
         Implement rate limiting to comply with PAAPI limits.
         CRITICAL: PAAPI free tier allows 1 request per second.
+        Concurrent callers queue on a lock, so request starts stay spaced.
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        if time_since_last_request < self.settings.api_rate_limit_delay:
-            sleep_time = self.settings.api_rate_limit_delay - time_since_last_request
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            await asyncio.sleep(sleep_time)
-        
-        self._last_request_time = time.time()
+        async with self._throttle_lock:
+            current_time = time.time()
+            time_since_last_request = current_time - self._last_request_time
+            
+            if time_since_last_request < self.settings.api_rate_limit_delay:
+                sleep_time = self.settings.api_rate_limit_delay - time_since_last_request
+                logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+                await asyncio.sleep(sleep_time)
+            
+            self._last_request_time = time.time()
     
     def _extract_price_from_offers(self, offers: Dict[str, Any]) -> Optional[Decimal]:
         """
@@ -115,6 +130,30 @@ class AmazonAPIClient:
             logger.warning(f"Error extracting image URL: {e}")
             return None
     
+    async def _get_items(self, asin: str, resources: List[Any]) -> Any:
+        """GetItems for one ASIN, retrying throttling and network errors under the retry policy."""
+        retry = self.retry_policy.start(f"PAAPI {asin}")
+        while True:
+            try:
+                return await self._send_get_items(asin, resources)
+            except TRANSIENT_ERRORS as e:
+                if not await retry.backoff(type(e).__name__):
+                    raise
+    
+    async def _send_get_items(self, asin: str, resources: List[Any]) -> Any:
+        """One throttled GetItems request."""
+        async with self.limiter.slot() as slot:
+            await self._throttle_request()
+            
+            logger.debug(f"Making PAAPI request for ASIN: {asin}")
+            self.stats['requests'] += 1
+            try:
+                # The SDK call blocks; run it off the event loop so lookups can overlap
+                return await asyncio.to_thread(self.amazon_api.get_items, item_ids=[asin], resources=resources)
+            except TooManyRequests:
+                slot.overloaded()
+                raise
+    
     async def get_product_info(self, asin: str) -> Optional[AmazonProduct]:
         """
         Get product information for a single ASIN using PAAPI.
@@ -129,8 +168,6 @@ class AmazonAPIClient:
             logger.warning(f"Invalid ASIN format: {asin}")
             return None
         
-        await self._throttle_request()
-        
         try:
             from amazon_paapi.sdk.models.get_items_resource import GetItemsResource
             
@@ -143,9 +180,7 @@ class AmazonAPIClient:
                 GetItemsResource.IMAGES_PRIMARY_LARGE,
             ]
             
-            logger.debug(f"Making PAAPI request for ASIN: {asin}")
-            # Use the correct method signature
-            response = self.amazon_api.get_items(item_ids=[asin], resources=resources)
+            response = await self._get_items(asin, resources)
             
             if not response or not hasattr(response, 'items_result'):
                 logger.warning(f"No items_result in PAAPI response for {asin}")
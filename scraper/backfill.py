@@ -0,0 +1,259 @@
+"""
+Historical backfill of the SavingsGuru archive.
+Crawls month archives or category listings with several concurrent page
+fetchers (all under the scraper's SavingsGuru limiter), writes posts straight
+to a durable post store deduplicated by URL, then resolves the ASINs and seeds
+the deal store, product snapshot and refresh price history. Pages fetched and
+deals committed are recorded as it goes, so an interrupted backfill resumes.
+
+Usage:
+    python -m scraper.backfill --since 2024-01 --until 2024-06 --concurrency 8
+    python -m scraper.backfill --category electronics --category home-garden
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from .focused_scraper import FocusedScraper, SAVINGSGURU_URL
+from .models import AmazonProduct
+from .post_store import PAGE_DONE, PAGE_END, PAGE_FAILED, PostStore
+from .refresh_scheduler import RefreshScheduler
+from .settings import Settings, get_settings
+
+
+BACKFILL_FILE_NAME = "backfill.sqlite"
+
+# Statuses past the last page of an archive
+END_STATUSES = (404, 410)
+
+
+def archive_roots(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    categories: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Archive paths to crawl: one per month from `since` to `until` (YYYY-MM, newest
+    first; `until` defaults to this month) and one per category slug. With neither,
+    the front-page listing.
+    """
+    roots = []
+    if since:
+        first = datetime.strptime(since, "%Y-%m")
+        last = datetime.strptime(until, "%Y-%m") if until else datetime.utcnow()
+        year, month = last.year, last.month
+        while (year, month) >= (first.year, first.month):
+            roots.append(f"/{year}/{month:02d}")
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    roots.extend(f"/category/{slug.strip('/')}" for slug in categories or [])
+    return roots or [""]
+
+
+def page_url(root: str, page: int) -> str:
+    return f"{SAVINGSGURU_URL}{root}/page/{page}" if page > 1 else f"{SAVINGSGURU_URL}{root}"
+
+
+class ArchiveCrawler:
+    """
+    Fetches archive pages with `concurrency` workers into a post store.
+    Each archive is read page by page until it answers 404 (or `max_pages`);
+    pages recorded by an earlier attempt are skipped.
+    """
+
+    def __init__(self, scraper: FocusedScraper, store: PostStore, concurrency: int, max_pages: int):
+        self.scraper = scraper
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.ended: Dict[str, int] = {}
+        self.stats = {
+            'pages_fetched': 0,
+            'pages_resumed': 0,
+            'pages_failed': 0,
+            'posts_found': 0,
+            'new_asins': 0,
+            'seconds': 0.0
+        }
+
+    def _pending(self, roots: List[str], statuses: Dict[str, str]) -> Iterator[Tuple[str, int, str]]:
+        for root in roots:
+            for page in range(1, self.max_pages + 1):
+                if page >= self.ended.get(root, self.max_pages + 1):
+                    break
+                url = page_url(root, page)
+                status = statuses.get(url)
+                if status == PAGE_END:
+                    self.ended[root] = min(self.ended.get(root, page), page)
+                    break
+                if status == PAGE_DONE:
+                    self.stats['pages_resumed'] += 1
+                    continue
+                yield root, page, url
+
+    async def run(self, roots: List[str]) -> Dict[str, float]:
+        """Crawl every archive root; returns the crawl stats."""
+        pending = self._pending(roots, self.store.page_statuses())
+        client = self.scraper.page_client
+        started = time.monotonic()
+
+        async def worker() -> None:
+            # Workers share one iterator, so archives are read roughly in page order
+            for root, page, url in pending:
+                if page < self.ended.get(root, self.max_pages + 1):
+                    await self._fetch(client, root, page, url)
+                    self._log_progress(started)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self.stats['seconds'] = time.monotonic() - started
+        return self.stats
+
+    async def _fetch(self, client, root: str, page: int, url: str) -> None:
+        try:
+            response = await self.scraper.fetch_page(client, url)
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            self.stats['pages_failed'] += 1
+            self.store.record_page(url, [], status=PAGE_FAILED)
+            return
+
+        if response.status_code in END_STATUSES:
+            self.ended[root] = min(self.ended.get(root, page), page)
+            self.store.record_page(url, [], status=PAGE_END)
+            logger.info(f"Archive {root or '/'} ends before page {page}")
+            return
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch {url}: {response.status_code}")
+            self.stats['pages_failed'] += 1
+            self.store.record_page(url, [], status=PAGE_FAILED)
+            return
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        posts = self.scraper._extract_posts_from_page(soup, SAVINGSGURU_URL)
+        soup.decompose()
+        self.scraper.stats['posts_scraped'] += len(posts)
+        if self.scraper.settings.skip_seen_posts:
+            posts = self.scraper.filter_unseen_posts(posts)
+
+        self.stats['new_asins'] += self.store.record_page(url, posts)
+        self.stats['pages_fetched'] += 1
+        self.stats['posts_found'] += len(posts)
+
+    def _log_progress(self, started: float, every: int = 25) -> None:
+        done = self.stats['pages_fetched'] + self.stats['pages_failed']
+        if done and done % every == 0:
+            elapsed = time.monotonic() - started
+            logger.info(f"Backfill: {done} pages in {elapsed:.0f}s ({done / max(elapsed, 1e-9):.2f} pages/s), "
+                        f"{self.stats['new_asins']} new ASINs, limit {self.scraper.page_limiter.capacity}")
+
+
+def seed_price_history(settings: Settings, scraper: FocusedScraper, store: PostStore) -> int:
+    """
+    Add one price observation per resolved product to the refresh scheduler's history
+    (products already observed since they were resolved are skipped). Returns the number added.
+    """
+    scheduler = RefreshScheduler(settings, scraper.get_real_product_data)
+    scheduler.load()
+    seeded = 0
+    for asin, retrieved_at, payload in store.product_records():
+        target = scheduler.targets.get(asin)
+        if target and target.last_refreshed and target.last_refreshed >= retrieved_at:
+            continue
+        product = AmazonProduct.model_validate_json(payload)
+        target = scheduler.track(asin, product.discount_percent)
+        scheduler.record_result(target, product)
+        seeded += 1
+    if seeded:
+        scheduler.save()
+    return seeded
+
+
+async def run_backfill(
+    settings: Settings,
+    roots: List[str],
+    output_path: str,
+    concurrency: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    crawl_only: bool = False
+) -> Dict[str, float]:
+    """
+    Crawl the archives into the backfill store and, unless `crawl_only`, seed the deal
+    store and price history from it. The store is removed once every page is fetched and
+    every ASIN committed; until then a rerun resumes it.
+    """
+    store = PostStore(str(Path(settings.state_dir) / BACKFILL_FILE_NAME), scratch=False)
+    finished = False
+    try:
+        async with FocusedScraper(settings) as scraper:
+            crawler = ArchiveCrawler(
+                scraper, store,
+                concurrency or settings.backfill_concurrency,
+                max_pages or settings.backfill_max_pages
+            )
+            stats = await crawler.run(roots)
+            stats['posts_stored'] = store.count_posts()
+            stats['asins_stored'] = store.count_asins()
+            if crawl_only:
+                return stats
+
+            deals = await scraper.deals_from_store(store, output_path)
+            stats['products'] = store.count_products()
+            stats['deals'] = len(deals)
+            stats['price_history_seeded'] = seed_price_history(settings, scraper, store)
+            # ASINs whose deals failed to save stay unresolved for the rerun
+            finished = not stats['pages_failed'] and not store.count_unresolved()
+
+            scraper.session.completed_at = datetime.utcnow()
+            scraper._log_final_statistics()
+            scraper.record_run_metrics(output_path, mode='backfill')
+            return stats
+    finally:
+        # Failed pages stay recorded so a rerun fetches just those
+        store.close(delete=finished)
+
+
+def main():
+    """Run a backfill from the command line; the exit status is 1 if pages failed."""
+    parser = argparse.ArgumentParser(description='Backfill deals and price history from the SavingsGuru archive')
+    parser.add_argument('--since', help='First month archive to crawl (YYYY-MM)')
+    parser.add_argument('--until', help='Last month archive to crawl (YYYY-MM, default: this month)')
+    parser.add_argument('--category', action='append', default=[], help='Category slug to crawl (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='Concurrent page fetchers (default: BACKFILL_CONCURRENCY)')
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help='Most pages per archive (default: BACKFILL_MAX_PAGES)')
+    parser.add_argument('--output', default='deals.json', help='Deal file, relative to public/ unless absolute')
+    parser.add_argument('--crawl-only', action='store_true', help='Only crawl posts into the backfill store')
+    parser.add_argument('--restart', action='store_true', help='Discard an interrupted backfill instead of resuming it')
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.restart:
+        PostStore(str(Path(settings.state_dir) / BACKFILL_FILE_NAME), scratch=True).close()
+
+    roots = archive_roots(args.since, args.until, args.category)
+    output_path = args.output if args.output.startswith('/') else f"public/{args.output}"
+    print(f"Backfilling {len(roots)} archive(s): {', '.join(root or '/' for root in roots[:6])}"
+          f"{' ...' if len(roots) > 6 else ''}")
+
+    stats = asyncio.run(run_backfill(settings, roots, output_path, args.concurrency, args.max_pages, args.crawl_only))
+
+    pages = stats['pages_fetched'] + stats['pages_failed']
+    print(f"Crawled {pages} pages in {stats['seconds']:.1f}s ({pages / max(stats['seconds'], 1e-9):.2f} pages/s); "
+          f"{stats['pages_resumed']} resumed, {stats['pages_failed']} failed")
+    print(f"Post store: {stats['posts_stored']} posts, {stats['asins_stored']} ASINs "
+          f"({stats['new_asins']} new this run)")
+    if not args.crawl_only:
+        print(f"Resolved {stats['products']} products, {stats['deals']} deals in {output_path}, "
+              f"{stats['price_history_seeded']} price observations seeded")
+    return 1 if stats['pages_failed'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark for the adaptive concurrency limiter against a simulated upstream.
+The upstream serves `capacity` requests in parallel at base latency, queues
+beyond that (latency grows with load) and answers 429 past twice its capacity.
+Fixed limits (the old sequential path and guessed constants) are compared with
+AIMD on completed requests per second and throttled responses.
+
+Usage:
+    python -m scraper.benchmarks.bench_adaptive_concurrency --capacity 6 --requests 400
+"""
+
+import argparse
+import asyncio
+import time
+
+from ..concurrency import AdaptiveLimiter
+
+
+class SimulatedUpstream:
+    """An upstream that tolerates `capacity` concurrent requests."""
+
+    def __init__(self, capacity: int, latency: float):
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.throttled = 0
+
+    async def request(self) -> int:
+        """Returns the HTTP status of one request."""
+        if self.in_flight >= 2 * self.capacity:
+            self.throttled += 1
+            await asyncio.sleep(self.latency / 10)
+            return 429
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency * max(1.0, self.in_flight / self.capacity))
+            return 200
+        finally:
+            self.in_flight -= 1
+
+
+async def drive(limiter: AdaptiveLimiter, upstream: SimulatedUpstream, requests: int, retry_delay: float) -> float:
+    """Complete `requests` requests (retrying 429s) with many concurrent callers; returns elapsed seconds."""
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            while True:
+                async with limiter.slot() as slot:
+                    status = await upstream.request()
+                    if status == 429:
+                        slot.overloaded()
+                if status == 200:
+                    break
+                await asyncio.sleep(retry_delay)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(64)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fixed vs adaptive upstream concurrency')
+    parser.add_argument('--capacity', type=int, default=6, help='Concurrent requests the simulated upstream tolerates')
+    parser.add_argument('--latency', type=float, default=0.02, help='Base upstream latency in seconds')
+    parser.add_argument('--requests', type=int, default=400, help='Requests to complete per run')
+    args = parser.parse_args()
+
+    retry_delay = args.latency * 5
+    runs = [(f"fixed {limit}", AdaptiveLimiter("bench", initial=limit, min_limit=limit, max_limit=limit))
+            for limit in (1, 5, 16, 32)]
+    runs.append(("adaptive (AIMD, max 32)", AdaptiveLimiter("bench", initial=2, max_limit=32)))
+
+    print(f"Upstream capacity {args.capacity}, base latency {args.latency * 1000:.0f} ms, {args.requests} requests")
+    for label, limiter in runs:
+        upstream = SimulatedUpstream(args.capacity, args.latency)
+        seconds = asyncio.run(drive(limiter, upstream, args.requests, retry_delay))
+        print(f"  {label:<26} {args.requests / seconds:>8.1f} req/s  {upstream.throttled:>6} throttled  "
+              f"final limit {limiter.capacity}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark for peak memory of large SavingsGuru crawls.
+Each configuration runs in a fresh interpreter against synthetic pages (about
+the weight of a real listing page, distinct ASINs on every page) with product
+lookups stubbed out, and reports the child's peak RSS. The list-based batch
+path grows with the page count; the constant-memory crawl should stay flat.
+The state snapshot is off unless --snapshot is given: it holds every resolved
+product by design, so rewriting it grows with the products, not the crawl.
+
+Usage:
+    python -m scraper.benchmarks.bench_crawl_memory --pages 50 200 800
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+MODES = ("batch", "crawl")
+
+
+def synthetic_page(page: int, posts: int, padding_kib: int) -> bytes:
+    """A listing page with `posts` deal posts (one new ASIN each) plus inline script weight."""
+    articles = "".join(
+        f'<article class="post"><h2><a href="/deal-{page}-{n}">Deal {page}-{n} on a synthetic product</a></h2>'
+        f'<p>{"Limited time price drop on this item. " * 12}</p>'
+        f'<a href="https://amzn.to/{page:05d}{n:03d}">Short</a>'
+        f'<a href="https://amazon.ca/dp/B{page:05d}{n:04d}">Buy</a></article>'
+        for n in range(posts)
+    )
+    script = f"<script>var data = \"{'x' * padding_kib * 1024}\";</script>"
+    return f"<html><head>{script}</head><body>{articles}</body></html>".encode()
+
+
+class SyntheticPages:
+    """SavingsGuru stand-in that renders every requested page."""
+
+    def __init__(self, posts: int, padding_kib: int):
+        self.posts = posts
+        self.padding_kib = padding_kib
+
+    async def get(self, url):
+        page = int(url.rsplit("/", 1)[-1]) if "/page/" in url else 1
+        return SimpleNamespace(status_code=200, content=synthetic_page(page, self.posts, self.padding_kib))
+
+
+def run_child(mode: str, pages: int, posts: int, padding_kib: int, snapshot: bool, state_dir: str) -> Dict[str, float]:
+    """Run one crawl in this process; returns elapsed seconds and peak RSS."""
+    from ..focused_scraper import FocusedScraper
+    from ..models import AmazonProduct, DataSource
+    from ..settings import Settings
+
+    async def lookup(self, asins: List[str]):
+        return {
+            asin: AmazonProduct(
+                asin=asin, title=f"Synthetic product {asin}", current_price=Decimal("19.99"),
+                list_price=Decimal("39.99"), image_url="https://example.com/image.jpg", data_source=DataSource.PAAPI
+            )
+            for asin in asins
+        }
+
+    async def no_sleep(*_):
+        return None
+
+    settings = Settings(
+        amz_access_key="bench", amz_secret_key="bench", amz_partner_tag="bench-20",
+        state_dir=state_dir, log_level="ERROR", checkpoint_enabled=False, metrics_enabled=False,
+        snapshot_enabled=snapshot, crawl_low_memory_pages=1 if mode == "crawl" else 0
+    )
+    FocusedScraper.get_real_product_data = lookup
+    asyncio.sleep = no_sleep
+
+    async def crawl():
+        scraper = FocusedScraper(settings)
+        scraper.page_client = SyntheticPages(posts, padding_kib)
+        return await scraper.scrape_deals(max_pages=pages, output_file=str(Path(state_dir) / "deals.json"))
+
+    started = time.perf_counter()
+    deals = asyncio.run(crawl())
+    return {
+        'seconds': time.perf_counter() - started,
+        'deals': len(deals),
+        # ru_maxrss is KiB on Linux
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def measure(mode: str, pages: int, posts: int, padding_kib: int, snapshot: bool) -> Dict[str, float]:
+    """Run one configuration in a fresh interpreter so peak RSS is its own."""
+    with tempfile.TemporaryDirectory() as state_dir:
+        result = subprocess.run(
+            [sys.executable, "-m", "scraper.benchmarks.bench_crawl_memory", "--child", mode,
+             "--pages", str(pages), "--posts", str(posts), "--padding-kib", str(padding_kib),
+             "--state-dir", state_dir, *(["--snapshot"] if snapshot else [])],
+            cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True, check=True
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peak RSS of list-based vs constant-memory crawls')
+    parser.add_argument('--pages', type=int, nargs='+', default=[50, 200, 800], help='Page counts to crawl')
+    parser.add_argument('--posts', type=int, default=20, help='Posts (ASINs) per page')
+    parser.add_argument('--padding-kib', type=int, default=100, help='Extra page weight in KiB')
+    parser.add_argument('--snapshot', action='store_true', help='Also write resolved products to the state snapshot')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--state-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.pages[0], args.posts, args.padding_kib, args.snapshot, args.state_dir)))
+        return
+
+    print(f"{args.posts} posts and ~{args.padding_kib} KiB per page, lookups stubbed, "
+          f"snapshot {'on' if args.snapshot else 'off'}")
+    for mode in MODES:
+        for pages in args.pages:
+            result = measure(mode, pages, args.posts, args.padding_kib, args.snapshot)
+            print(f"  {mode:<6} {pages:>5} pages  peak RSS {result['peak_rss_mib']:>7.1f} MiB  "
+                  f"{result['seconds']:>6.1f} s  {result['deals']} deals")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for loading a stored deal set back into Deal models.
+Compares the previous json.load + per-record Deal(**data) loop against
+load_stored_models (one-pass validate_json over the array), for snake_case
+and camelCase files. Unvalidated model_construct is shown for reference.
+
+Usage:
+    python -m scraper.benchmarks.bench_deal_load --deals 10000 100000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from pydantic.alias_generators import to_camel
+
+from ..models import Deal, load_stored_models
+
+
+CATEGORIES = ["Electronics", "Home & Garden", "Clothing", "Books", "Toys & Games", "Sports"]
+
+
+def synthetic_deals(count: int, seed: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    deals = []
+    for i in range(count):
+        asin = f"B{i:09d}"
+        price = round(rng.uniform(5, 500), 2)
+        deals.append({
+            'id': f"deal_{asin}_20240101",
+            'title': f"Synthetic Product {i} with a realistic length title",
+            'image_url': f"https://m.media-amazon.com/images/I/{asin}.jpg",
+            'price': price,
+            'original_price': round(price * rng.uniform(1.1, 2.5), 2),
+            'discount_percent': rng.randint(10, 80),
+            'category': rng.choice(CATEGORIES),
+            'description': f"Great deal on Synthetic Product {i}",
+            'affiliate_url': f"https://www.amazon.ca/dp/{asin}?tag=example-20",
+            'featured': rng.random() < 0.1,
+            'date_added': "2024-01-01T00:00:00",
+            'data_source': "PAAPI",
+            'asin': asin,
+            'brand': "Brand",
+        })
+    return deals
+
+
+def legacy_load(path: Path) -> List[Deal]:
+    """The original DealManager.load_existing_deals loop."""
+    with open(path, 'r', encoding='utf-8') as f:
+        deals_data = json.load(f)
+    deals = []
+    for deal_data in deals_data:
+        try:
+            deals.append(Deal(**deal_data))
+        except Exception:
+            pass
+    return deals
+
+
+def construct_load(path: Path) -> List[Deal]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Deal.model_construct(**deal_data) for deal_data in json.load(f)]
+
+
+def best_of(runs: int, load: Callable[[], List[Deal]]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark loading stored deals into models')
+    parser.add_argument('--deals', type=int, nargs='+', default=[10000, 100000], help='Deal set sizes to load')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.deals:
+            deals = synthetic_deals(count)
+            snake_path = Path(tmp) / f"deals-{count}.json"
+            camel_path = Path(tmp) / f"deals-{count}-camel.json"
+            snake_path.write_text(json.dumps(deals))
+            camel_path.write_text(json.dumps([{to_camel(key): value for key, value in deal.items()} for deal in deals]))
+
+            legacy = best_of(args.runs, lambda: legacy_load(snake_path))
+            stored = best_of(args.runs, lambda: load_stored_models(Deal, snake_path.read_bytes()))
+            camel = best_of(args.runs, lambda: load_stored_models(Deal, camel_path.read_bytes()))
+            construct = best_of(args.runs, lambda: construct_load(snake_path))
+
+            print(f"Deals:                     {count}")
+            print(f"  Legacy Deal(**data) loop: {legacy * 1000:8.1f} ms")
+            print(f"  load_stored_models:       {stored * 1000:8.1f} ms ({legacy / stored:.2f}x)")
+            print(f"  load_stored_models camel: {camel * 1000:8.1f} ms")
+            print(f"  model_construct, no URLs: {construct * 1000:8.1f} ms (unvalidated, for reference)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for the binary search index.
+Builds an index over synthetic deals, memory-maps it and times queries.
+
+Usage:
+    python -m scraper.benchmarks.bench_search_index --deals 100000 --queries 2000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..search_index import SearchIndex, write_search_index
+
+
+BRANDS = ["Sony", "Anker", "LEGO", "Samsung", "Philips", "Ninja", "Lululemon", "Apple", "Logitech", "Dyson"]
+NOUNS = ["headphones", "charger", "blender", "vacuum", "keyboard", "mouse", "yoga mat", "speaker",
+         "monitor", "backpack", "kettle", "toothbrush", "tablet", "camera", "lamp", "air fryer"]
+ADJECTIVES = ["wireless", "portable", "smart", "compact", "ergonomic", "stainless", "rechargeable",
+              "noise cancelling", "ultra", "premium", "mini", "foldable"]
+CATEGORIES = ["Electronics", "Home & Kitchen", "Sports & Outdoors", "Toys & Games", "Beauty"]
+
+
+def synthetic_deals(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Deterministic deals with realistic-looking titles and descriptions."""
+    rng = random.Random(seed)
+    deals = []
+    for i in range(count):
+        brand = rng.choice(BRANDS)
+        noun = rng.choice(NOUNS)
+        title = f"{brand} {rng.choice(ADJECTIVES)} {noun} model {rng.randint(100, 9999)}"
+        deals.append({
+            'id': f"deal_{i:07d}",
+            'title': title,
+            'brand': brand,
+            'category': rng.choice(CATEGORIES),
+            'description': f"Great deal on {title}. {rng.choice(ADJECTIVES).capitalize()} design with {rng.choice(NOUNS)} support."
+        })
+    return deals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark search index build and query latency')
+    parser.add_argument('--deals', type=int, default=100000, help='Synthetic deals to index')
+    parser.add_argument('--queries', type=int, default=2000, help='Queries to time')
+    args = parser.parse_args()
+
+    deals = synthetic_deals(args.deals)
+    rng = random.Random(1)
+    queries = [
+        rng.choice([
+            f"{rng.choice(BRANDS)} {rng.choice(NOUNS)}",
+            rng.choice(NOUNS)[:rng.randint(2, 5)],
+            f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)[:3]}",
+            f"model {rng.randint(100, 9999)}",
+        ])
+        for _ in range(args.queries)
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "search-index.bin"
+
+        started = time.perf_counter()
+        write_search_index(deals, path)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = SearchIndex.open(path)
+        open_ms = (time.perf_counter() - started) * 1000
+
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, limit=20)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        index.close()
+        size_mb = path.stat().st_size / 1_000_000
+
+    latencies.sort()
+    print(f"Deals indexed: {args.deals}")
+    print(f"Build time:    {build_seconds:.2f} s")
+    print(f"Index size:    {size_mb:.1f} MB")
+    print(f"Open (mmap):   {open_ms:.3f} ms")
+    print(f"Query p50:     {statistics.median(latencies):.3f} ms")
+    print(f"Query p99:     {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
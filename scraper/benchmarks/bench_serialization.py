@@ -0,0 +1,74 @@
+"""
+Benchmark for deal export serialization.
+Compares the previous deal.dict() + json.dump(indent=2, default=str) export
+against canonical camelCase records encoded by each installed JSON backend,
+plus direct pydantic-core encoding, for encode/decode throughput and size.
+
+Usage:
+    python -m scraper.benchmarks.bench_serialization --deals 10000
+"""
+
+import argparse
+import json
+import time
+import warnings
+from typing import Callable, List, Optional
+
+from ..models import Deal, load_stored_models
+from ..serialization import JSON_BACKENDS, deal_records, encode_deals, get_codec
+from .bench_deal_load import synthetic_deals
+
+
+def best_of(runs: int, work: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        work()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def legacy_encode(deals: List[Deal]) -> bytes:
+    """The original scrape_deals + save_json_file export path."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        records = [deal.dict() for deal in deals]
+    return json.dumps(records, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark deal export encoding and decoding')
+    parser.add_argument('--deals', type=int, default=10000, help='Synthetic deals to serialize')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    deals = load_stored_models(Deal, json.dumps(synthetic_deals(args.deals)))
+    count = len(deals)
+
+    def report(label: str, seconds: float, size: Optional[int]) -> None:
+        size_text = f"{size / 1024:>9,.0f} KiB" if size is not None else ""
+        print(f"  {label:<30} {count / seconds:>12,.0f} deals/s  {size_text}")
+
+    print(f"Deals: {count}")
+    print("Encode:")
+    legacy = legacy_encode(deals)
+    report("legacy dict() + json indent=2", best_of(args.runs, lambda: legacy_encode(deals)), len(legacy))
+    report("deal_records only (no encode)", best_of(args.runs, lambda: deal_records(deals)), None)
+
+    codecs = [get_codec(backend) for backend in JSON_BACKENDS]
+    codecs = [codec for backend, codec in zip(JSON_BACKENDS, codecs) if codec.name == backend]
+    for codec in codecs:
+        encoded = codec.dumps(deal_records(deals))
+        seconds = best_of(args.runs, lambda: codec.dumps(deal_records(deals)))
+        report(f"records + {codec.name}", seconds, len(encoded))
+    report("encode_deals (pydantic-core)", best_of(args.runs, lambda: encode_deals(deals)), len(encode_deals(deals)))
+
+    print("Decode to dicts:")
+    compact = encode_deals(deals)
+    report("json (legacy, indented file)", best_of(args.runs, lambda: json.loads(legacy)), len(legacy))
+    for codec in codecs:
+        report(codec.name, best_of(args.runs, lambda: codec.loads(compact)), len(compact))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for entry-point startup time.
+Runs each entry point's --help / --dry-run in a fresh interpreter under
+-X importtime, subtracts a bare `python -c pass` baseline, and lists the
+slowest top-level imports, so a heavy import creeping back into the
+startup path shows up as a budget failure.
+
+Usage:
+    python -m scraper.benchmarks.bench_startup --budget-ms 400
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+ENTRY_POINTS = {
+    "run_scraper --help": ["run_scraper.py", "--help"],
+    "run_scraper --dry-run --no-paapi": ["run_scraper.py", "--dry-run", "--no-paapi"],
+    "run_production_scraper --help": ["run_production_scraper.py", "--help"],
+    "schedule_scraper --help": ["schedule_scraper.py", "--help"],
+    "snapshot --help": ["-m", "scraper.snapshot", "--help"],
+}
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once(args: List[str]) -> Tuple[float, str]:
+    """Wall-clock seconds and -X importtime output of one fresh interpreter."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return time.perf_counter() - started, result.stderr
+
+
+def top_level_imports(importtime: str) -> Dict[str, int]:
+    """Cumulative microseconds of each import made directly by the program (not nested)."""
+    imports: Dict[str, int] = {}
+    for match in IMPORTTIME_LINE.finditer(importtime):
+        _, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            imports[module] = int(cumulative)
+    return imports
+
+
+def measure(args: List[str], runs: int) -> Tuple[float, Dict[str, int]]:
+    """Best wall time over `runs`, and the import profile of that run."""
+    best = None
+    for _ in range(runs):
+        seconds, importtime = run_once(args)
+        if best is None or seconds < best[0]:
+            best = (seconds, importtime)
+    return best[0], top_level_imports(best[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark entry-point startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per entry point (best is reported)')
+    parser.add_argument('--top', type=int, default=5, help='Slowest top-level imports to list')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Fail if any entry point takes longer than this over the bare interpreter')
+    args = parser.parse_args()
+
+    baseline, interpreter_imports = measure(["-c", "pass"], args.runs)
+    print(f"Bare interpreter: {baseline * 1000:.0f} ms")
+
+    over_budget = []
+    for label, command in ENTRY_POINTS.items():
+        seconds, imports = measure(command, args.runs)
+        imports = {module: micros for module, micros in imports.items() if module not in interpreter_imports}
+        startup_ms = (seconds - baseline) * 1000
+        import_ms = sum(imports.values()) / 1000
+        print(f"{label:<34} {startup_ms:>7.0f} ms over baseline  ({import_ms:.0f} ms importing)")
+        for module, micros in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {module:<40} {micros / 1000:>7.1f} ms")
+        if args.budget_ms is not None and startup_ms > args.budget_ms:
+            over_budget.append(label)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""
+Local load test for the deals query API.
+Starts the server in-process on a synthetic deal store and hammers it over
+keep-alive connections, reporting throughput and latency percentiles.
+
+Usage:
+    python -m scraper.benchmarks.load_test_query_api --deals 5000 --connections 32 --duration 10
+"""
+
+import asyncio
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from ..query_api import DealIndex, DealQueryServer
+
+
+CATEGORIES = ["Electronics", "Home & Kitchen", "Sports & Outdoors", "Toys & Games", "Beauty", "Books"]
+
+
+def synthetic_deals(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate a deterministic deal set shaped like deals.json."""
+    rng = random.Random(seed)
+    deals = []
+    for i in range(count):
+        price = round(rng.uniform(5, 500), 2)
+        discount = rng.randint(10, 80)
+        deals.append({
+            'id': f"deal_{i:06d}",
+            'title': f"Synthetic product {i}",
+            'price': price,
+            'originalPrice': round(price / (1 - discount / 100), 2),
+            'discountPercent': discount,
+            'category': rng.choice(CATEGORIES),
+            'dateAdded': f"2025-01-{rng.randint(1, 28):02d}T12:00:00",
+            'featured': rng.random() < 0.05
+        })
+    return deals
+
+
+def request_targets(rng: random.Random) -> str:
+    """Pick a representative query."""
+    choice = rng.random()
+    if choice < 0.4:
+        return "/deals"
+    if choice < 0.7:
+        return f"/deals?category={rng.choice(CATEGORIES).replace(' ', '%20').replace('&', '%26')}"
+    if choice < 0.9:
+        return f"/deals?min_discount={rng.choice([20, 40, 60])}&sort=discount&limit=24"
+    return f"/deals?min_price={rng.choice([10, 50])}&max_price={rng.choice([100, 250])}&sort=price"
+
+
+async def client(host: str, port: int, deadline: float, latencies: List[float], seed: int, revalidate: bool) -> None:
+    """One keep-alive client issuing sequential requests until the deadline."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    etags: Dict[str, str] = {}
+
+    try:
+        while time.perf_counter() < deadline:
+            target = request_targets(rng)
+            conditional = f"If-None-Match: {etags[target]}\r\n" if revalidate and target in etags else ""
+            started = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n{conditional}\r\n".encode())
+            await writer.drain()
+
+            head = await reader.readuntil(b'\r\n\r\n')
+            headers = {}
+            for line in head.decode('latin-1').split('\r\n')[1:]:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length:
+                await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - started)
+            if 'etag' in headers:
+                etags[target] = headers['etag']
+    finally:
+        writer.close()
+
+
+async def run_load_test(deal_count: int, connections: int, duration: float, revalidate: bool) -> Dict[str, float]:
+    """Run the load test and return summary statistics."""
+    index = DealIndex()
+    index.load(synthetic_deals(deal_count), version=1)
+    server = DealQueryServer(index)
+
+    http_server = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = http_server.sockets[0].getsockname()[1]
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async with http_server:
+        await asyncio.gather(*[
+            client("127.0.0.1", port, deadline, latencies, seed, revalidate)
+            for seed in range(connections)
+        ])
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        'not_modified': server.stats['not_modified'],
+        'cache_hits': server.stats['cache_hits']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the deals query API on one core')
+    parser.add_argument('--deals', type=int, default=5000, help='Synthetic deals to index')
+    parser.add_argument('--connections', type=int, default=32, help='Concurrent keep-alive connections')
+    parser.add_argument('--duration', type=float, default=10.0, help='Test duration in seconds')
+    parser.add_argument('--revalidate', action='store_true', help='Send If-None-Match with cached ETags')
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args.deals, args.connections, args.duration, args.revalidate))
+
+    print(f"Requests:      {results['requests']}")
+    print(f"Throughput:    {results['requests_per_second']:.0f} req/s")
+    print(f"Latency p50:   {results['p50_ms']:.2f} ms")
+    print(f"Latency p99:   {results['p99_ms']:.2f} ms")
+    print(f"304 responses: {results['not_modified']}")
+    print(f"Cache hits:    {results['cache_hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Persistent, memory-mapped Bloom filters for "have we ever processed this" checks.
+One filter per entity type (ASIN, post URL, short link) lives under the state
+directory; memory stays constant no matter how many items have been recorded.
+Filters rotate into a fresh generation periodically or once they fill up.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+
+BLOOM_MAGIC = b"BLMF"
+BLOOM_VERSION = 1
+
+# magic, version, hash count, bit count, item count, capacity, created at, false-positive rate
+_HEADER = struct.Struct("<4sHHQQQdd")
+
+SEEN_KINDS = ("asin", "post_url", "short_link")
+
+
+def optimal_parameters(capacity: int, fp_rate: float) -> Tuple[int, int]:
+    """Bit count and hash count for `capacity` items at the target false-positive rate."""
+    capacity = max(1, capacity)
+    fp_rate = min(max(fp_rate, 1e-9), 0.5)
+    bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    # Whole bytes keep the bit array aligned with the mmap
+    return (bits + 7) // 8 * 8, hashes
+
+
+class BloomFilter:
+    """
+    File-backed Bloom filter using double hashing over one blake2b digest.
+    Bits live in an mmap of the file, so only touched pages are resident.
+    """
+
+    def __init__(self, path: str, capacity: int = 1_000_000, fp_rate: float = 0.001):
+        """
+        Open the filter at `path`, creating it when missing.
+
+        Args:
+            path: Filter file
+            capacity: Items the filter is sized for (ignored for existing files)
+            fp_rate: Target false-positive rate at capacity (ignored for existing files)
+        """
+        self.path = Path(path)
+
+        if not self.path.exists():
+            self._create(capacity, fp_rate)
+
+        self.bits = 0
+        self._file = open(self.path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, hashes, bits, count, stored_capacity, created_at, stored_fp_rate = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a Bloom filter file")
+        if len(self._mm) < _HEADER.size + bits // 8:
+            self.close()
+            raise ValueError(f"{self.path} is truncated")
+
+        self.hashes = hashes
+        self.bits = bits
+        self.count = count
+        self.capacity = stored_capacity
+        self.created_at = created_at
+        self.fp_rate = stored_fp_rate
+
+    def _create(self, capacity: int, fp_rate: float) -> None:
+        """Write an empty filter file atomically."""
+        bits, hashes = optimal_parameters(capacity, fp_rate)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, hashes, bits, 0, capacity, time.time(), fp_rate))
+            f.truncate(_HEADER.size + bits // 8)
+        os.replace(temp_path, self.path)
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, item: str) -> bool:
+        """Record an item. Returns True if it was (probably) not present before."""
+        mm = self._mm
+        added = False
+
+        for position in self._positions(item):
+            offset = _HEADER.size + (position >> 3)
+            mask = 1 << (position & 7)
+            byte = mm[offset]
+            if not byte & mask:
+                mm[offset] = byte | mask
+                added = True
+
+        if added:
+            self.count += 1
+        return added
+
+    def update(self, items: Iterable[str]) -> int:
+        """Record several items. Returns how many were new."""
+        return sum(1 for item in items if self.add(item))
+
+    def __contains__(self, item: str) -> bool:
+        mm = self._mm
+        for position in self._positions(item):
+            if not mm[_HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def saturated(self) -> bool:
+        """True once more items were added than the filter was sized for."""
+        return self.count >= self.capacity
+
+    @property
+    def age_days(self) -> float:
+        return (time.time() - self.created_at) / 86400
+
+    def flush(self) -> None:
+        """Persist the item count and dirty pages."""
+        if self._mm is None:
+            return
+        _HEADER.pack_into(
+            self._mm, 0, BLOOM_MAGIC, BLOOM_VERSION, self.hashes, self.bits,
+            self.count, self.capacity, self.created_at, self.fp_rate
+        )
+        self._mm.flush()
+
+    def close(self) -> None:
+        """Flush and release the mapping."""
+        if self._mm is not None:
+            if self.bits:
+                self.flush()
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SeenStore:
+    """
+    Generational "seen" sets per entity type.
+    Lookups consult the current and previous generation; a rebuild retires the
+    previous one, so items not seen for two periods are eventually forgotten.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        capacity: int = 1_000_000,
+        fp_rate: float = 0.001,
+        rebuild_days: float = 30.0
+    ):
+        """
+        Args:
+            directory: Where filter files are kept
+            capacity: Items per generation before an early rebuild
+            fp_rate: Target false-positive rate per generation
+            rebuild_days: Age at which the current generation is rotated out
+        """
+        self.directory = Path(directory)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.rebuild_days = rebuild_days
+        self._current: Dict[str, BloomFilter] = {}
+        self._previous: Dict[str, Optional[BloomFilter]] = {}
+
+    def _paths(self, kind: str) -> Tuple[Path, Path]:
+        if kind not in SEEN_KINDS:
+            raise ValueError(f"Unknown seen-set kind: {kind}")
+        return self.directory / f"{kind}.bloom", self.directory / f"{kind}.prev.bloom"
+
+    def _filters(self, kind: str) -> Tuple[BloomFilter, Optional[BloomFilter]]:
+        """Open (lazily) and, when due, rotate the filters of one kind."""
+        if kind not in self._current:
+            current_path, previous_path = self._paths(kind)
+            self._current[kind] = BloomFilter(str(current_path), self.capacity, self.fp_rate)
+            self._previous[kind] = BloomFilter(str(previous_path)) if previous_path.exists() else None
+            self._rotate_if_due(kind)
+        return self._current[kind], self._previous[kind]
+
+    def _rotate_if_due(self, kind: str) -> None:
+        current = self._current[kind]
+        if not current.saturated and current.age_days < self.rebuild_days:
+            return
+        self.rebuild(kind)
+
+    def rebuild(self, kind: str) -> None:
+        """Start a fresh generation for `kind`, keeping the current one as the previous."""
+        current_path, previous_path = self._paths(kind)
+        self._close_kind(kind)
+
+        if current_path.exists():
+            os.replace(current_path, previous_path)
+
+        self._current[kind] = BloomFilter(str(current_path), self.capacity, self.fp_rate)
+        self._previous[kind] = BloomFilter(str(previous_path)) if previous_path.exists() else None
+        logger.info(f"Rebuilt seen filter for {kind} ({self.capacity} items at {self.fp_rate:.2%} FP rate)")
+
+    def contains(self, kind: str, item: str) -> bool:
+        """True if the item was (probably) recorded before; never a false negative."""
+        # Avoid creating files just to answer "no"
+        if kind not in self._current and not any(path.exists() for path in self._paths(kind)):
+            return False
+
+        current, previous = self._filters(kind)
+        if item in current:
+            return True
+        if previous is not None and item in previous:
+            # Carry still-active items into the new generation
+            current.add(item)
+            return True
+        return False
+
+    def add(self, kind: str, items: Iterable[str]) -> int:
+        """Record items of one kind. Returns how many were new to the current generation."""
+        current, _ = self._filters(kind)
+        added = current.update(item for item in items if item)
+        if current.saturated:
+            self.rebuild(kind)
+        return added
+
+    def flush(self) -> None:
+        """Persist every open filter."""
+        for kind in list(self._current):
+            self._current[kind].flush()
+
+    def _close_kind(self, kind: str) -> None:
+        for filters in (self._current, self._previous):
+            bloom = filters.pop(kind, None)
+            if bloom is not None:
+                bloom.close()
+
+    def close(self) -> None:
+        """Flush and release every open filter."""
+        for kind in list(self._current):
+            self._close_kind(kind)
@@ -0,0 +1,135 @@
+"""
+Keyword categorizer shared by the scrapers.
+Category keywords are loaded once from a JSON config and compiled into a single
+trie-shaped regular expression, so each title is categorized in one linear,
+word-boundary-aware pass with weighted scores per category.
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+
+
+DEFAULT_CONFIG_PATH = Path(__file__).with_name("categories.json")
+
+
+def keyword_variants(keyword: str, plural: bool = True) -> List[str]:
+    """Surface forms matched for a keyword: itself plus simple English plurals."""
+    keyword = keyword.lower().strip()
+    variants = [keyword]
+
+    if plural:
+        if len(keyword) > 1 and keyword.endswith('y') and keyword[-2] not in 'aeiou':
+            variants.append(keyword[:-1] + 'ies')
+        variants.extend([keyword + 's', keyword + 'es'])
+
+    return variants
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation factored by shared prefixes.
+    The regex engine then walks the keyword trie instead of retrying every keyword.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy optional: prefer the longest keyword, backtrack to the shorter one
+            return body + '?' if len(branches) == 1 and len(branches[0]) == 1 else '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class Categorizer:
+    """
+    Weighted keyword categorizer.
+    Each matched keyword adds its weight to its category; the highest score wins,
+    ties going to the category listed first in the config.
+    """
+
+    def __init__(self, categories: List[Dict[str, Any]], default: str = "General"):
+        """
+        Args:
+            categories: [{"name": ..., "keywords": [str | {"keyword", "weight", "plural"}]}]
+            default: Category returned when nothing matches
+        """
+        self.default = default
+        self.category_names = [category['name'] for category in categories]
+        self._rank = {name: position for position, name in enumerate(self.category_names)}
+
+        # Surface form -> list of (category, weight)
+        self._keywords: Dict[str, List[Tuple[str, float]]] = {}
+
+        for category in categories:
+            for entry in category.get('keywords', []):
+                if isinstance(entry, str):
+                    entry = {'keyword': entry}
+                weight = float(entry.get('weight', 1.0))
+                for variant in keyword_variants(entry['keyword'], entry.get('plural', True)):
+                    targets = self._keywords.setdefault(variant, [])
+                    if all(name != category['name'] for name, _ in targets):
+                        targets.append((category['name'], weight))
+
+        if self._keywords:
+            # Every keyword starts and ends with a word character, so \b marks a whole-word match
+            self._pattern = re.compile(r'\b(?:' + _trie_pattern(self._keywords) + r')\b')
+        else:
+            self._pattern = None
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> 'Categorizer':
+        """Load categories from a JSON config (defaults to scraper/categories.json)."""
+        config_path = Path(path) if path else DEFAULT_CONFIG_PATH
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['categories'], default=config.get('default', "General"))
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Accumulated keyword weight per matching category."""
+        totals: Dict[str, float] = {}
+        if not text or self._pattern is None:
+            return totals
+
+        for keyword in self._pattern.findall(text.lower()):
+            for category, weight in self._keywords[keyword]:
+                totals[category] = totals.get(category, 0.0) + weight
+
+        return totals
+
+    def categorize(self, text: str) -> str:
+        """Best category for a title, or the default when no keyword matches."""
+        totals = self.scores(text)
+        if not totals:
+            return self.default
+        return max(totals, key=lambda name: (totals[name], -self._rank[name]))
+
+    def categorize_many(self, texts: Iterable[str]) -> List[str]:
+        """Categorize a batch of titles."""
+        return [self.categorize(text) for text in texts]
+
+
+@lru_cache(maxsize=None)
+def get_categorizer(path: Optional[str] = None) -> Categorizer:
+    """Shared categorizer per config path, compiled on first use."""
+    return Categorizer.from_config(path)
+
+
+def categorize(title: str, path: Optional[str] = None) -> str:
+    """Categorize a title with the shared categorizer."""
+    return get_categorizer(path).categorize(title)
@@ -0,0 +1,106 @@
+"""
+Checkpoint/resume for long scrape runs.
+SavingsGuru pages and ASIN lookups are tracked as tasks in the durable job
+queue, with results checkpointed as they finish. A run that crashes or is
+killed resumes where it stopped instead of redoing finished network calls.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from .models import AmazonProduct, SavingsGuruPost, load_stored_models
+from .job_queue import JobQueue
+
+
+class ScrapeCheckpoint:
+    """
+    Durable progress of one scrape run, keyed by its output file.
+    Pages and ASINs live in separate queue runs; both are dropped once the run's deals are exported.
+    """
+
+    def __init__(self, db_path: str, output_path: str, max_age_hours: float = 12.0):
+        """
+        Open the checkpoint for `output_path`, discarding one older than `max_age_hours`
+        (prices that old are not worth resuming from).
+        """
+        self.queue = JobQueue(db_path)
+        key = str(Path(output_path).resolve())
+        self.pages_run = f"scrape:{key}:pages"
+        self.asins_run = f"scrape:{key}:asins"
+        self.worker_id = f"scrape-{time.time():.0f}"
+
+        starts = [start for start in (self.queue.started_at(self.pages_run), self.queue.started_at(self.asins_run))
+                  if start is not None]
+        started = min(starts) if starts else None
+        if started is not None and time.time() - started > max_age_hours * 3600:
+            logger.info(f"Discarding checkpoint for {output_path} from {(time.time() - started) / 3600:.1f}h ago")
+            self.discard()
+            started = None
+
+        self.resumed = started is not None
+        if self.resumed:
+            # Whatever was in flight belonged to the process that died; failures get another try
+            released = self.queue.release_stale(self.pages_run, 0.0) + self.queue.release_stale(self.asins_run, 0.0)
+            retried = self.queue.requeue_failed(self.pages_run) + self.queue.requeue_failed(self.asins_run)
+            logger.info(f"Resuming checkpointed run for {output_path} ({released} in-flight and {retried} failed tasks requeued)")
+
+    # Pages
+
+    def pages_to_fetch(self, max_pages: int) -> List[int]:
+        """Queue pages 1..max_pages (once) and return those not fetched yet, in order."""
+        self.queue.enqueue(self.pages_run, ((f"page:{page:05d}", 0) for page in range(1, max_pages + 1)))
+        return [int(key.split(':')[1]) for key in self.queue.claim(self.pages_run, self.worker_id, limit=max_pages)]
+
+    def record_page(self, page: int, posts: List[SavingsGuruPost]) -> None:
+        self.queue.complete(self.pages_run, f"page:{page:05d}", json.dumps([post.model_dump(mode='json') for post in posts]))
+
+    def fail_page(self, page: int, error: str) -> None:
+        self.queue.fail(self.pages_run, f"page:{page:05d}", error)
+
+    def posts(self) -> List[SavingsGuruPost]:
+        """Posts of every fetched page, in page order."""
+        stored = self.queue.results(self.pages_run)
+        posts = []
+        for key in sorted(stored):
+            posts.extend(load_stored_models(SavingsGuruPost, stored[key] or "[]", label="post"))
+        return posts
+
+    # ASIN lookups
+
+    def add_asins(self, asins: Iterable[str]) -> int:
+        return self.queue.enqueue(self.asins_run, ((asin, 0) for asin in asins))
+
+    def claim_asins(self, limit: int) -> List[str]:
+        return self.queue.claim(self.asins_run, self.worker_id, limit=limit)
+
+    def record_products(self, products: Dict[str, Optional[AmazonProduct]]) -> None:
+        for asin, product in products.items():
+            self.queue.complete(self.asins_run, asin, product.model_dump_json() if product else None)
+
+    def fail_asins(self, asins: Iterable[str], error: str) -> None:
+        for asin in asins:
+            self.queue.fail(self.asins_run, asin, error)
+
+    def products(self) -> Dict[str, Optional[AmazonProduct]]:
+        """Checkpointed lookup results (None for ASINs with no real data)."""
+        return {
+            asin: AmazonProduct.model_validate_json(result) if result else None
+            for asin, result in self.queue.results(self.asins_run).items()
+        }
+
+    def counts(self) -> Dict[str, int]:
+        return self.queue.counts(self.asins_run)
+
+    # Lifecycle
+
+    def discard(self) -> None:
+        """Drop the checkpoint (after a successful export or a clean abort, or when stale)."""
+        self.queue.delete_run(self.pages_run)
+        self.queue.delete_run(self.asins_run)
+
+    def close(self) -> None:
+        self.queue.close()
@@ -0,0 +1,165 @@
+"""
+Adaptive concurrency limits for upstream requests (PAAPI, Amazon product pages).
+Instead of a guessed constant, each upstream's limit grows additively while
+responses stay fast and successful, and is cut multiplicatively on throttling
+(429/503) or timeouts (AIMD), so parallelism settles at what the upstream tolerates.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple, Type
+
+from loguru import logger
+
+from .settings import Settings
+
+
+class Slot:
+    """One admitted request; mark it overloaded when the upstream pushed back."""
+
+    def __init__(self):
+        self.overload = False
+
+    def overloaded(self) -> None:
+        self.overload = True
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one upstream.
+
+    Every healthy response (latency within `latency_tolerance` times the best
+    recently observed) adds 1/limit, i.e. about one slot per round of requests.
+    Latency above that is queueing at the upstream and takes 1/limit off; an
+    overload (throttling status, timeout) multiplies the limit by `backoff_ratio`,
+    at most once per round trip so one burst of failures is one congestion event.
+    """
+
+    # How fast the latency baseline follows the current latency (lets it recover
+    # when the upstream gets permanently slower instead of pinning the limit low)
+    BASELINE_DRIFT = 0.01
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+        overload_exceptions: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, TimeoutError)
+    ):
+        """
+        Args:
+            name: Upstream name, for logs and stats
+            initial: Starting limit
+            min_limit: The limit never drops below this
+            max_limit: The limit never grows past this
+            latency_tolerance: Latency over this multiple of the baseline counts as congestion
+            backoff_ratio: Factor applied to the limit on overload
+            overload_exceptions: Exceptions raised inside a slot that count as overload
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.overload_exceptions = overload_exceptions
+
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._last_backoff = 0.0
+        self._changed = asyncio.Condition()
+
+        self.stats = {
+            'requests': 0,
+            'overloads': 0,
+            'backoffs': 0,
+            'peak_limit': int(self.limit)
+        }
+
+    @classmethod
+    def from_settings(
+        cls,
+        name: str,
+        settings: Settings,
+        overload_exceptions: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, TimeoutError)
+    ) -> 'AdaptiveLimiter':
+        """Limiter configured by the adaptive_* settings (a fixed limit of 1 when disabled)."""
+        if not settings.adaptive_concurrency_enabled:
+            return cls(name, initial=1, min_limit=1, max_limit=1, overload_exceptions=overload_exceptions)
+        return cls(
+            name,
+            initial=settings.adaptive_initial_concurrency,
+            min_limit=settings.adaptive_min_concurrency,
+            max_limit=settings.adaptive_max_concurrency,
+            latency_tolerance=settings.adaptive_latency_tolerance,
+            backoff_ratio=settings.adaptive_backoff_ratio,
+            overload_exceptions=overload_exceptions
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Requests currently allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        """Wait for capacity, then hold a slot for one request and learn from its outcome."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < self.capacity)
+            self.in_flight += 1
+
+        slot = Slot()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield slot
+        except self.overload_exceptions:
+            slot.overloaded()
+            raise
+        except BaseException:
+            # Says nothing about upstream capacity (e.g. a parse error or cancellation)
+            failed = True
+            raise
+        finally:
+            self._observe(time.monotonic() - started, slot.overload, failed)
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def _observe(self, latency: float, overload: bool, failed: bool = False) -> None:
+        self.stats['requests'] += 1
+        if failed and not overload:
+            return
+        now = time.monotonic()
+
+        if overload:
+            self.stats['overloads'] += 1
+            # One cut per round trip: the other in-flight failures belong to the same event
+            if now - self._last_backoff >= (self.latency or 0.0):
+                self._last_backoff = now
+                self.stats['backoffs'] += 1
+                previous = self.capacity
+                self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                if self.capacity != previous:
+                    logger.info(f"[{self.name}] Upstream pushed back - concurrency limit {previous} -> {self.capacity}")
+            return
+
+        self.latency = latency if self.latency is None else (
+            self.latency + (latency - self.latency) * self.LATENCY_SMOOTHING
+        )
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += (self.latency - self.baseline_latency) * self.BASELINE_DRIFT
+
+        if self.latency > self.baseline_latency * self.latency_tolerance:
+            self.limit = max(float(self.min_limit), self.limit - 1 / self.limit)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self.stats['peak_limit'] = max(self.stats['peak_limit'], self.capacity)
@@ -0,0 +1,219 @@
+"""
+Long-running scraper daemon with an in-process asyncio scheduler.
+Settings, PAAPI client, HTTP clients, caches and the deal store are created once
+and stay warm across cycles; SIGTERM drains in-flight jobs before exiting.
+"""
+
+import asyncio
+import signal
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from datetime import datetime
+
+from loguru import logger
+
+from .models import AmazonProduct
+from .settings import Settings, get_settings
+from .focused_scraper import FocusedScraper
+from .refresh_scheduler import RefreshScheduler
+from .serialization import deal_records
+
+
+JobFunc = Callable[[], Awaitable[None]]
+
+
+class ScraperDaemon:
+    """
+    Runs periodic scraper jobs on a single persistent event loop.
+    Jobs: full SavingsGuru scrape, continuous ASIN refresh and price-update commits.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, output_file: str = "public/deals.json"):
+        """Initialize the daemon; clients are created when run() starts."""
+        self.settings = settings or get_settings()
+        self.output_file = output_file
+
+        self.scraper: Optional[FocusedScraper] = None
+        self.refresh_scheduler: Optional[RefreshScheduler] = None
+
+        self.stop_event = asyncio.Event()
+        self._job_loops: List[asyncio.Task] = []
+        self._in_flight: Set[asyncio.Task] = set()
+        self._pending_updates: Dict[str, Optional[AmazonProduct]] = {}
+        # Held by a scrape for its whole run and by each refresh lookup, so refreshes
+        # pause while a scrape runs and never count towards its session or metrics
+        self._scraper_lock = asyncio.Lock()
+
+        self.stats = {
+            'scrape_runs': 0,
+            'commit_runs': 0,
+            'job_failures': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling primitives
+    # ------------------------------------------------------------------
+
+    def every(self, interval_seconds: float, name: str, job: JobFunc, run_immediately: bool = True) -> None:
+        """Schedule job to run every interval_seconds on the daemon's loop."""
+        task = asyncio.create_task(self._job_loop(name, interval_seconds, job, run_immediately), name=name)
+        self._job_loops.append(task)
+
+    def spawn(self, name: str, job: JobFunc) -> None:
+        """Run a long-lived job (e.g. the refresh loop) until shutdown."""
+        task = asyncio.create_task(job(), name=name)
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _job_loop(self, name: str, interval: float, job: JobFunc, run_immediately: bool) -> None:
+        """Run one job periodically until stop is requested."""
+        if not run_immediately and await self._sleep_or_stop(interval):
+            return
+
+        while not self.stop_event.is_set():
+            started = datetime.now()
+            logger.info(f"⏰ Job '{name}' started at {started}")
+
+            # Track the run separately so shutdown can drain it instead of cancelling it
+            run = asyncio.create_task(job(), name=f"{name}-run")
+            self._in_flight.add(run)
+            run.add_done_callback(self._in_flight.discard)
+
+            try:
+                await asyncio.shield(run)
+                logger.info(f"✅ Job '{name}' finished in {(datetime.now() - started).total_seconds():.1f}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['job_failures'] += 1
+                logger.exception(f"💥 Job '{name}' crashed: {e}")
+
+            if await self._sleep_or_stop(interval):
+                return
+
+    async def _sleep_or_stop(self, seconds: float) -> bool:
+        """Sleep for seconds, waking early on shutdown. Returns True if stopping."""
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self.stop_event.is_set()
+
+    def request_stop(self) -> None:
+        """Ask the daemon to stop scheduling new work and drain."""
+        if not self.stop_event.is_set():
+            logger.info("Shutdown requested - draining in-flight jobs")
+            self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """Translate SIGTERM/SIGINT into a graceful drain."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops do not support add_signal_handler
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.request_stop))
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    async def scrape_job(self) -> None:
+        """Full SavingsGuru scrape reusing the warm scraper (refreshes wait until it finishes)."""
+        async with self._scraper_lock:
+            self.scraper.reset_session()
+            deals = await self.scraper.scrape_deals(output_file=self.output_file)
+        self.stats['scrape_runs'] += 1
+
+        if deals and self.refresh_scheduler:
+            self.refresh_scheduler.track_deals(deals)
+
+        logger.info(f"📊 Scrape cycle produced {len(deals)} deals")
+
+    async def _refresh_lookup(self, asins: List[str]) -> Dict[str, Optional[AmazonProduct]]:
+        """Refresh lookups on the shared scraper, outside any scrape run."""
+        async with self._scraper_lock:
+            return await self.scraper.get_real_product_data(asins)
+
+    def _on_refresh(self, asin: str, product: Optional[AmazonProduct]) -> None:
+        """Buffer refreshed products for the next commit."""
+        self._pending_updates[asin] = product
+
+    async def commit_job(self) -> None:
+        """Apply buffered refresh results to the deal store."""
+        if not self._pending_updates:
+            return
+
+        updates, self._pending_updates = self._pending_updates, {}
+        manager = self.scraper.deal_manager
+
+        # Update copies so the cached deal set still matches the file if the export fails
+        deals = [deal.model_copy() for deal in await manager.load_existing_deals(self.output_file)]
+        if not manager.apply_price_updates(deals, updates):
+            return
+
+        deals = self.scraper._mark_featured_deals(deals)
+        if self.scraper.exporter.export(deal_records(deals), self.output_file):
+            manager.remember_saved_deals(deals, self.output_file)
+            self.stats['commit_runs'] += 1
+        else:
+            # Retry with the next commit; newer refresh results win
+            self._pending_updates = {**updates, **self._pending_updates}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Start clients once, schedule jobs and block until a drained shutdown."""
+        self.install_signal_handlers()
+
+        async with FocusedScraper(self.settings) as scraper:
+            self.scraper = scraper
+
+            if self.settings.daemon_refresh_enabled:
+                self.refresh_scheduler = RefreshScheduler(
+                    self.settings, self._refresh_lookup, on_refresh=self._on_refresh
+                )
+                self.refresh_scheduler.load()
+                self.refresh_scheduler.track_deals(
+                    await scraper.deal_manager.load_existing_deals(self.output_file)
+                )
+                self.spawn("refresh", lambda: self.refresh_scheduler.run(self.stop_event))
+                self.every(self.settings.daemon_commit_interval_minutes * 60, "commit", self.commit_job, run_immediately=False)
+
+            self.every(self.settings.daemon_scrape_interval_hours * 3600, "scrape", self.scrape_job)
+
+            logger.info("🕒 Scraper daemon running - send SIGTERM or Ctrl+C to stop")
+            await self.stop_event.wait()
+
+            await self._drain()
+
+            # Flush anything refreshed during the drain
+            await self.commit_job()
+
+        logger.info(f"⏹️ Scraper daemon stopped: {self.stats}")
+
+    async def _drain(self) -> None:
+        """Wait for in-flight jobs up to the drain timeout, then cancel the rest."""
+        for task in self._job_loops:
+            task.cancel()
+        await asyncio.gather(*self._job_loops, return_exceptions=True)
+
+        if self._in_flight:
+            logger.info(f"Waiting up to {self.settings.daemon_drain_timeout:.0f}s for {len(self._in_flight)} jobs")
+            done, pending = await asyncio.wait(set(self._in_flight), timeout=self.settings.daemon_drain_timeout)
+
+            for task in pending:
+                logger.warning(f"Cancelling job that did not drain in time: {task.get_name()}")
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def main():
+    """Run the daemon until SIGTERM/SIGINT."""
+    await ScraperDaemon().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,337 @@
+"""
+Export stage for processed deals.
+Writes the full deals.json plus versioned delta files and a manifest so
+clients can sync incrementally instead of re-downloading the whole catalog,
+and pre-sharded per-category / featured / top-discount feeds for first paint.
+The binary search index is rebuilt alongside every new version.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from .settings import Settings
+from .search_index import SEARCH_INDEX_NAME, write_search_index
+from .serialization import get_codec
+from .utils import save_json_file, load_json_file, sanitize_filename
+
+
+MANIFEST_NAME = "deals-manifest.json"
+DELTAS_DIR_NAME = "deltas"
+SHARDS_DIR_NAME = "deals"
+SHARD_GENERATIONS_DIR_NAME = "deals-gen"
+
+
+def category_slug(category: str) -> str:
+    """URL-safe slug for a category name ("Home & Garden" -> "home-garden")."""
+    return sanitize_filename(category).lower() or "general"
+
+
+def _discount_of(deal: Dict[str, Any]) -> int:
+    return deal.get('discount_percent', deal.get('discountPercent')) or 0
+
+
+def build_shards(deals_data: List[Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    """
+    Split a deal set into small static feeds.
+
+    Returns:
+        Mapping of relative shard path -> JSON payload, including index.json
+    """
+    shards: Dict[str, Any] = {}
+    page_size = max(page_size, 1)
+
+    categories: Dict[str, List[Dict[str, Any]]] = {}
+    for deal in deals_data:
+        categories.setdefault(deal.get('category') or "General", []).append(deal)
+
+    category_index = []
+    for name, deals in sorted(categories.items()):
+        path = f"category/{category_slug(name)}.json"
+        shards[path] = deals
+        category_index.append({'name': name, 'slug': category_slug(name), 'count': len(deals), 'path': path})
+
+    featured = [deal for deal in deals_data if deal.get('featured')]
+    shards["featured.json"] = featured
+
+    by_discount = sorted(deals_data, key=_discount_of, reverse=True)
+    page_paths = []
+    for start in range(0, len(by_discount), page_size):
+        path = f"top-discount/page-{start // page_size + 1}.json"
+        shards[path] = by_discount[start:start + page_size]
+        page_paths.append(path)
+
+    shards["index.json"] = {
+        'total': len(deals_data),
+        'categories': category_index,
+        'featured': {'count': len(featured), 'path': "featured.json"},
+        'topDiscount': {'pageSize': page_size, 'pages': len(page_paths), 'paths': page_paths}
+    }
+    return shards
+
+
+def normalize_deal_records(deals_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Round-trip records through JSON so they compare equal to what is on disk."""
+    return json.loads(json.dumps(deals_data, ensure_ascii=False, default=str))
+
+
+def content_hash(deals_data: List[Dict[str, Any]]) -> str:
+    """Stable hash of a deal set, independent of formatting."""
+    encoded = json.dumps(deals_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def compute_delta(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Diff two deal sets keyed by id.
+
+    Returns:
+        Dict with `added` (full records), `removed` (ids),
+        `changed` (id -> {field: new value}, missing fields map to None) and, only
+        when the ranking moved, `order` (every current id). Without it the order is
+        the previous one minus removed ids, followed by the added deals.
+    """
+    previous_by_id = {deal['id']: deal for deal in previous}
+    current_by_id = {deal['id']: deal for deal in current}
+
+    added = [deal for deal_id, deal in current_by_id.items() if deal_id not in previous_by_id]
+    removed = [deal_id for deal_id in previous_by_id if deal_id not in current_by_id]
+
+    changed = {}
+    for deal_id, deal in current_by_id.items():
+        old = previous_by_id.get(deal_id)
+        if old is None:
+            continue
+
+        fields = {
+            key: deal.get(key)
+            for key in set(old) | set(deal)
+            if old.get(key) != deal.get(key)
+        }
+        if fields:
+            changed[deal_id] = fields
+
+    delta = {
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+    }
+    order = list(current_by_id)
+    if order != _derived_order(list(previous_by_id), delta):
+        delta['order'] = order
+    return delta
+
+
+def _derived_order(previous_ids: List[str], delta: Dict[str, Any]) -> List[str]:
+    """Order implied by a delta without `order`: survivors in place, then the added deals."""
+    removed = set(delta['removed'])
+    return [deal_id for deal_id in previous_ids if deal_id not in removed] + [deal['id'] for deal in delta['added']]
+
+
+def apply_delta(previous: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Apply a delta to a deal set (reference client implementation)."""
+    by_id = {deal['id']: dict(deal) for deal in previous}
+
+    for deal_id in delta['removed']:
+        by_id.pop(deal_id, None)
+
+    for deal_id, fields in delta['changed'].items():
+        if deal_id in by_id:
+            by_id[deal_id].update(fields)
+
+    for deal in delta['added']:
+        by_id[deal['id']] = deal
+
+    order = delta['order'] if 'order' in delta else _derived_order([deal['id'] for deal in previous], delta)
+    return [by_id[deal_id] for deal_id in order if deal_id in by_id]
+
+
+class DealExporter:
+    """
+    Writes deals.json atomically and maintains a chain of versioned deltas.
+    The manifest lists the current version and the deltas still retained.
+    """
+
+    def __init__(self, settings: Settings):
+        """Initialize exporter with settings."""
+        self.settings = settings
+        self.codec = get_codec(settings.json_backend)
+
+    def _load_manifest(self, manifest_path: Path) -> Dict[str, Any]:
+        if manifest_path.exists():
+            manifest = load_json_file(str(manifest_path), codec=self.codec)
+            if isinstance(manifest, dict):
+                return manifest
+        return {'version': 0, 'sha256': None, 'deltas': []}
+
+    def export(self, deals_data: List[Dict[str, Any]], output_path: str) -> bool:
+        """
+        Write the full deal file, a delta against the previous version and the manifest.
+
+        Args:
+            deals_data: Serialized deals in final display order
+            output_path: Path of the full deals file (e.g. public/deals.json)
+
+        Returns:
+            True if the full deals file was written
+        """
+        output_file = Path(output_path)
+        output_dir = output_file.parent
+        manifest_path = output_dir / MANIFEST_NAME
+        deltas_dir = output_dir / DELTAS_DIR_NAME
+
+        current = normalize_deal_records(deals_data)
+        previous: Optional[List[Dict[str, Any]]] = None
+        if output_file.exists():
+            previous = load_json_file(str(output_file), codec=self.codec)
+
+        manifest = self._load_manifest(manifest_path)
+        current_hash = content_hash(current)
+
+        if previous is not None and manifest.get('sha256') == current_hash:
+            logger.info("Deal set unchanged - no new delta version")
+            if not (output_dir / SHARDS_DIR_NAME).exists():
+                self.write_shards(current, output_dir, int(manifest.get('version', 0)))
+            if not (output_dir / SEARCH_INDEX_NAME).exists():
+                write_search_index(current, output_dir / SEARCH_INDEX_NAME)
+            return self._save_full(current, output_file)
+
+        if not self._save_full(current, output_file):
+            return False
+
+        version = int(manifest.get('version', 0)) + 1
+        deltas = list(manifest.get('deltas', []))
+
+        # The chain is only valid if the file on disk is what the manifest last published
+        chain_intact = (
+            isinstance(previous, list) and
+            manifest.get('sha256') is not None and
+            manifest['sha256'] == content_hash(previous)
+        )
+
+        if chain_intact:
+            delta = compute_delta(previous, current)
+            delta_name = f"v{version:06d}.json"
+            delta_record = {
+                'fromVersion': version - 1,
+                'toVersion': version,
+                'generatedAt': datetime.utcnow().isoformat(),
+                **delta
+            }
+            if save_json_file(delta_record, str(deltas_dir / delta_name), indent=None, codec=self.codec):
+                deltas.append({
+                    'from': version - 1,
+                    'to': version,
+                    'path': f"{DELTAS_DIR_NAME}/{delta_name}",
+                    'added': len(delta['added']),
+                    'removed': len(delta['removed']),
+                    'changed': len(delta['changed']),
+                    'bytes': (deltas_dir / delta_name).stat().st_size
+                })
+        else:
+            logger.info("Delta chain reset - clients will fetch the full deals file")
+            deltas = []
+
+        deltas = self._prune_deltas(deltas, deltas_dir)
+
+        new_manifest = {
+            'version': version,
+            'sha256': current_hash,
+            'full': output_file.name,
+            'count': len(current),
+            'bytes': output_file.stat().st_size,
+            'generatedAt': datetime.utcnow().isoformat(),
+            'oldestDeltaFrom': deltas[0]['from'] if deltas else version,
+            'deltas': deltas
+        }
+        self.write_shards(current, output_dir, version)
+        write_search_index(current, output_dir / SEARCH_INDEX_NAME)
+        save_json_file(new_manifest, str(manifest_path), atomic=True, codec=self.codec)
+
+        logger.info(f"Exported deals version {version} ({len(deltas)} deltas retained)")
+        return True
+
+    def _save_full(self, deals_data: List[Dict[str, Any]], output_file: Path) -> bool:
+        indent = 2 if self.settings.json_pretty else None
+        return save_json_file(deals_data, str(output_file), indent=indent, atomic=True, codec=self.codec)
+
+    def write_shards(self, deals_data: List[Dict[str, Any]], output_dir: Path, version: int) -> bool:
+        """
+        Write per-category, featured and top-discount shards as a new generation,
+        then atomically point the shards directory at it.
+        """
+        generations_dir = output_dir / SHARD_GENERATIONS_DIR_NAME
+        generation_dir = generations_dir / f"v{version:06d}"
+        live_path = output_dir / SHARDS_DIR_NAME
+
+        shards = build_shards(deals_data, self.settings.shard_page_size)
+        shards["index.json"].update({'version': version, 'generatedAt': datetime.utcnow().isoformat()})
+
+        if generation_dir.exists():
+            shutil.rmtree(generation_dir)
+
+        for relative_path, payload in shards.items():
+            if not save_json_file(payload, str(generation_dir / relative_path), indent=None, codec=self.codec):
+                shutil.rmtree(generation_dir, ignore_errors=True)
+                return False
+
+        self._swap_live_shards(live_path, generation_dir)
+        self._prune_generations(generations_dir, keep=generation_dir)
+
+        logger.info(f"Wrote {len(shards)} deal shards for version {version}")
+        return True
+
+    def _swap_live_shards(self, live_path: Path, generation_dir: Path) -> None:
+        """Atomically replace the live shards directory with a new generation."""
+        if not live_path.exists() or live_path.is_symlink():
+            # Symlink swap: readers see either the old or the new generation, never a mix
+            temp_link = live_path.with_name(f".{live_path.name}.tmp")
+            try:
+                if temp_link.is_symlink() or temp_link.exists():
+                    temp_link.unlink()
+                temp_link.symlink_to(os.path.relpath(generation_dir, live_path.parent), target_is_directory=True)
+                os.replace(temp_link, live_path)
+                return
+            except (OSError, NotImplementedError) as e:
+                logger.debug(f"Symlink swap unavailable ({e}) - falling back to directory copy")
+
+        # Fallback for filesystems without symlinks: build a full copy and rename it in
+        staged = live_path.with_name(f".{live_path.name}.staged")
+        retired = live_path.with_name(f".{live_path.name}.retired")
+        shutil.rmtree(staged, ignore_errors=True)
+        shutil.rmtree(retired, ignore_errors=True)
+        shutil.copytree(generation_dir, staged)
+        if live_path.is_symlink():
+            live_path.unlink()
+        elif live_path.exists():
+            os.replace(live_path, retired)
+        os.replace(staged, live_path)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def _prune_generations(self, generations_dir: Path, keep: Path) -> None:
+        """Keep the live and the previous generation so in-flight readers still resolve."""
+        generations = sorted(path for path in generations_dir.iterdir() if path.is_dir())
+        for path in generations[:-2]:
+            if path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _prune_deltas(self, deltas: List[Dict[str, Any]], deltas_dir: Path) -> List[Dict[str, Any]]:
+        """Keep only the newest delta_retention deltas and delete older files."""
+        retention = max(self.settings.delta_retention, 0)
+        expired = deltas[:-retention] if retention else deltas
+        kept = deltas[-retention:] if retention else []
+
+        for entry in expired:
+            delta_file = deltas_dir / Path(entry['path']).name
+            try:
+                delta_file.unlink()
+            except FileNotFoundError:
+                pass
+
+        return kept
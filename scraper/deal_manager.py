@@ -1,17 +1,19 @@
 """
 Deal management system for maintaining target deal count and freshness.
-Handles deduplication, rotation, and cleanup to maintain ~120 active deals.
+Handles deduplication (exact and near-duplicate), rotation, and cleanup to maintain ~120 active deals.
 """
 
-import json
 import asyncio
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from loguru import logger
 
-from .models import Deal
-from .settings import Settings
+from .models import Deal, AmazonProduct, load_stored_models
+from .settings import Settings, get_settings
+from .near_duplicates import NearDuplicateDetector
+from .bloom_filter import SeenStore
+from .snapshot import KIND_DEAL, SNAPSHOT_NAME, epoch, update_snapshot
 
 
 class DealManager:
@@ -25,6 +27,41 @@ class DealManager:
         self.settings = settings
         self.existing_deals: List[Deal] = []
         self.existing_asins: Set[str] = set()
+        self.near_duplicates = NearDuplicateDetector(threshold=settings.near_duplicate_threshold)
+        
+        # Constant-memory record of every ASIN, post URL and short link ever processed
+        self.seen = SeenStore(
+            str(Path(settings.state_dir) / "seen"),
+            capacity=settings.seen_filter_capacity,
+            fp_rate=settings.seen_filter_fp_rate,
+            rebuild_days=settings.seen_filter_rebuild_days
+        )
+        
+        # (path, mtime_ns, size) of the file existing_deals mirrors, so
+        # long-running processes skip re-parsing an unchanged deal store
+        self._loaded_signature: Optional[Tuple[str, int, int]] = None
+    
+    @staticmethod
+    def _file_signature(deals_path: Path) -> Tuple[str, int, int]:
+        """Identify a deals file version by path, modification time and size."""
+        stat = deals_path.stat()
+        return (str(deals_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    
+    def remember_saved_deals(self, deals: List[Deal], deals_file: str) -> None:
+        """Keep a just-written deal set warm so the next load skips the file."""
+        self.existing_deals = list(deals)
+        self.existing_asins = {deal.asin for deal in deals}
+        self.seen.add("asin", self.existing_asins)
+        self.seen.flush()
+        if self.settings.snapshot_enabled:
+            update_snapshot(
+                Path(self.settings.state_dir) / SNAPSHOT_NAME, KIND_DEAL,
+                ((deal.asin, epoch(deal.date_added), deal.model_dump_json(by_alias=True).encode()) for deal in deals)
+            )
+        try:
+            self._loaded_signature = self._file_signature(Path(deals_file))
+        except OSError:
+            self._loaded_signature = None
     
     async def load_existing_deals(self, deals_file: str = "public/deals.json") -> List[Deal]:
         """Load existing deals from file."""
@@ -32,23 +69,22 @@ class DealManager:
         
         if not deals_path.exists():
             logger.info("No existing deals file found - starting fresh")
+            # Forget ASINs deduplicated against a set that was never saved
+            self.existing_deals, self.existing_asins = [], set()
             return []
         
+        if self._loaded_signature and self._loaded_signature == self._file_signature(deals_path):
+            self.existing_asins = {deal.asin for deal in self.existing_deals}
+            logger.debug(f"Reusing {len(self.existing_deals)} in-memory deals for unchanged {deals_file}")
+            return list(self.existing_deals)
+        
         try:
-            with open(deals_path, 'r', encoding='utf-8') as f:
-                deals_data = json.load(f)
-            
-            # Convert to Deal objects
-            deals = []
-            for deal_data in deals_data:
-                try:
-                    deal = Deal(**deal_data)
-                    deals.append(deal)
-                except Exception as e:
-                    logger.warning(f"Skipping invalid deal {deal_data.get('id', 'unknown')}: {e}")
+            # Our own output: parse and validate the whole file in one pass
+            deals = load_stored_models(Deal, deals_path.read_bytes(), label="deal")
             
             self.existing_deals = deals
             self.existing_asins = {deal.asin for deal in deals}
+            self._loaded_signature = self._file_signature(deals_path)
             
             logger.info(f"Loaded {len(deals)} existing deals from {deals_file}")
             return deals
@@ -64,7 +100,7 @@ class DealManager:
         fresh_deals = []
         for deal in deals:
             try:
-                deal_time = datetime.fromisoformat(deal.dateAdded.replace('Z', '+00:00'))
+                deal_time = datetime.fromisoformat(deal.date_added.replace('Z', '+00:00'))
                 if deal_time.replace(tzinfo=None) > cutoff_time:
                     fresh_deals.append(deal)
             except Exception as e:
@@ -81,33 +117,55 @@ class DealManager:
     def deduplicate_deals(self, new_deals: List[Deal]) -> List[Deal]:
         """Remove deals that already exist (by ASIN)."""
         unique_deals = []
+        returning = 0
         
         for deal in new_deals:
             if deal.asin not in self.existing_asins:
                 unique_deals.append(deal)
                 self.existing_asins.add(deal.asin)
+                if self.seen.contains("asin", deal.asin):
+                    returning += 1
             else:
                 logger.debug(f"Skipping duplicate deal: {deal.asin}")
         
+        if returning:
+            logger.info(f"{returning} new deals are ASINs that were listed in an earlier run")
+        
         duplicates_removed = len(new_deals) - len(unique_deals)
         if duplicates_removed > 0:
             logger.info(f"Removed {duplicates_removed} duplicate deals")
         
         return unique_deals
     
+    def collapse_near_duplicates(self, deals: List[Deal]) -> List[Deal]:
+        """
+        Collapse variants of the same product (colour/size ASINs, repeated posts)
+        to the best-priced deal of each near-duplicate cluster.
+        """
+        kept, removed = self.near_duplicates.collapse(
+            deals,
+            title=lambda deal: deal.title,
+            rank=lambda deal: (deal.price, -(deal.discount_percent or 0))
+        )
+        
+        if removed > 0:
+            logger.info(f"Collapsed {removed} near-duplicate deals")
+        
+        return kept
+    
     def filter_quality_deals(self, deals: List[Deal]) -> List[Deal]:
         """Filter deals by minimum quality criteria."""
         quality_deals = []
         
         for deal in deals:
             # Check minimum discount
-            if deal.discountPercent and deal.discountPercent >= self.settings.min_deal_discount:
+            if deal.discount_percent and deal.discount_percent >= self.settings.min_deal_discount:
                 quality_deals.append(deal)
-            elif not deal.discountPercent:
+            elif not deal.discount_percent:
                 # Keep deals without discount info (might be clearance/special deals)
                 quality_deals.append(deal)
             else:
-                logger.debug(f"Filtered out low discount deal: {deal.title} ({deal.discountPercent}%)")
+                logger.debug(f"Filtered out low discount deal: {deal.title} ({deal.discount_percent}%)")
         
         filtered_count = len(deals) - len(quality_deals)
         if filtered_count > 0:
@@ -127,8 +185,8 @@ class DealManager:
         def deal_priority(deal: Deal) -> tuple:
             return (
                 not deal.featured,  # Featured deals first (False sorts before True)
-                -(deal.discountPercent or 0),  # Higher discounts first
-                deal.dateAdded  # Newer deals first (assuming ISO format sorts correctly)
+                -(deal.discount_percent or 0),  # Higher discounts first
+                deal.date_added  # Newer deals first (assuming ISO format sorts correctly)
             )
         
         sorted_deals = sorted(all_deals, key=deal_priority)
@@ -139,6 +197,32 @@ class DealManager:
         
         return selected_deals
     
+    def apply_price_updates(self, deals: List[Deal], products: Dict[str, Optional[AmazonProduct]]) -> int:
+        """
+        Update existing deals in place with freshly retrieved pricing.
+        Products without real prices are ignored (never fake data). Returns count updated.
+        """
+        updated = 0
+        
+        for deal in deals:
+            product = products.get(deal.asin)
+            if not product or not product.current_price or product.current_price <= 0:
+                continue
+            
+            price = float(product.current_price)
+            original_price = float(product.list_price) if product.list_price else None
+            
+            if (price, original_price, product.discount_percent) != (deal.price, deal.original_price, deal.discount_percent):
+                deal.price = price
+                deal.original_price = original_price
+                deal.discount_percent = product.discount_percent
+                updated += 1
+        
+        if updated:
+            logger.info(f"Applied price updates to {updated} deals")
+        
+        return updated
+    
     def get_scraping_stats(self, existing_count: int, new_count: int, final_count: int) -> Dict[str, int]:
         """Calculate scraping statistics."""
         return {
@@ -156,7 +240,7 @@ class DealManager:
         2. Filter fresh deals
         3. Deduplicate new deals
         4. Apply quality filters
-        5. Manage total count
+        5. Collapse near-duplicates and manage total count
         6. Return statistics
         """
         logger.info("Starting deal management process")
@@ -176,7 +260,7 @@ class DealManager:
         quality_new_deals = self.filter_quality_deals(unique_new_deals)
         
         # Step 5: Combine and manage total count
-        all_deals = fresh_existing + quality_new_deals
+        all_deals = self.collapse_near_duplicates(fresh_existing + quality_new_deals)
         final_deals = self.manage_deal_count(all_deals)
         final_count = len(final_deals)
         
@@ -193,9 +277,7 @@ class DealManager:
 
 async def main():
     """Test the deal manager."""
-    from .settings import Settings
-    
-    settings = Settings()
+    settings = get_settings()
     manager = DealManager(settings)
     
     # Test with empty new deals
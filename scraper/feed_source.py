@@ -0,0 +1,235 @@
+"""
+Structured ingestion of SavingsGuru posts: the WordPress REST API first, then
+the RSS/Atom feed. Both are small, dated and sortable, so with an `after=`
+cursor and conditional requests (ETag / Last-Modified) a run fetches only the
+posts published since the last one, a few KB instead of several full listing
+pages. When neither answers usably the caller scrapes listing pages instead.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urlencode
+from xml.etree import ElementTree
+
+import httpx
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from .focused_scraper import FocusedScraper, SAVINGSGURU_URL
+from .models import SavingsGuruPost
+from .utils import load_json_file, save_json_file
+
+
+FEED_STATE_FILE_NAME = "feed_state.json"
+
+REST_PATH = "/wp-json/wp/v2/posts"
+FEED_PATH = "/feed"
+REST_FIELDS = "id,date,link,title,content"
+REST_PER_PAGE = 100
+
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+
+class FeedEntry(NamedTuple):
+    """One post as read from the REST API or a feed."""
+    title: str
+    link: str
+    published: datetime
+    content: str
+    post_id: Optional[str] = None
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """UTC datetime of an ISO 8601 (Atom, REST) or RFC 822 (RSS) timestamp; naive values are taken as UTC."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def parse_feed(content: bytes) -> List[FeedEntry]:
+    """Entries of an RSS 2.0 or Atom document (entries without a link or date are skipped)."""
+    root = ElementTree.fromstring(content)
+    entries = []
+
+    if root.tag == f"{ATOM_NS}feed":
+        for item in root.iter(f"{ATOM_NS}entry"):
+            links = item.findall(f"{ATOM_NS}link")
+            link = next((el.get('href') for el in links if el.get('rel', 'alternate') == 'alternate'), None)
+            published = parse_timestamp(item.findtext(f"{ATOM_NS}published") or item.findtext(f"{ATOM_NS}updated"))
+            body = item.findtext(f"{ATOM_NS}content") or item.findtext(f"{ATOM_NS}summary") or ""
+            if link and published:
+                entries.append(FeedEntry(item.findtext(f"{ATOM_NS}title") or "", link, published, body))
+        return entries
+
+    for item in root.iter("item"):
+        link = (item.findtext("link") or "").strip()
+        published = parse_timestamp(item.findtext("pubDate"))
+        body = item.findtext(f"{CONTENT_NS}encoded") or item.findtext("description") or ""
+        if link and published:
+            entries.append(FeedEntry(item.findtext("title") or "", link, published, body))
+    return entries
+
+
+def validators(response: httpx.Response) -> Dict[str, str]:
+    """The response's cache validators, to send back on the next request."""
+    return {
+        name: value for name, value in (
+            ('etag', response.headers.get('ETag')),
+            ('last_modified', response.headers.get('Last-Modified'))
+        ) if value
+    }
+
+
+def conditional_headers(state: Dict[str, Any], url: str) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since for `url` when the saved validators belong to it."""
+    if state.get('url') != url:
+        return {}
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+    return headers
+
+
+class FeedSource:
+    """
+    Reads new SavingsGuru posts from the REST API, or the RSS/Atom feed when the API
+    fails. The newest post date and validators are staged per endpoint and only
+    saved by commit(), once the caller has processed the posts, so a failed run
+    reads the same posts again next time.
+    """
+
+    def __init__(self, scraper: FocusedScraper, state_path: str, max_requests: int = 5):
+        """
+        Args:
+            scraper: Scraper whose fetch_page (retries, limiter, metrics) and post builder are used
+            state_path: JSON file with each endpoint's cursor and validators
+            max_requests: Most REST pages read per run
+        """
+        self.scraper = scraper
+        self.state_path = Path(state_path)
+        self.max_requests = max(1, max_requests)
+        self.state: Dict[str, Dict[str, Any]] = load_json_file(str(self.state_path)) or {}
+        self._staged: Optional[Dict[str, Dict[str, Any]]] = None
+        # Endpoint that answered the last fetch_posts ("REST API" / "feed"), None if neither did
+        self.last_source: Optional[str] = None
+
+    async def fetch_posts(self, client: httpx.AsyncClient) -> Optional[List[SavingsGuruPost]]:
+        """
+        Posts published since the last commit (an empty list when nothing changed),
+        or None when neither endpoint answered usably.
+        """
+        self.last_source = None
+        for name, read in (("REST API", self._read_rest), ("feed", self._read_feed)):
+            try:
+                entries = await read(client)
+            except Exception as e:
+                logger.warning(f"SavingsGuru {name} unusable: {e}")
+                continue
+            if entries is None:
+                continue
+
+            self.last_source = name
+            posts = [post for post in (self._post_from_entry(entry) for entry in entries) if post]
+            self.scraper.stats['posts_scraped'] += len(posts)
+            logger.info(f"Read {len(entries)} new entries ({len(posts)} with Amazon links) from the SavingsGuru {name}")
+            return posts
+        return None
+
+    def commit(self) -> None:
+        """Save the cursors and validators staged by the last fetch_posts."""
+        if self._staged is None:
+            return
+        self.state, self._staged = self._staged, None
+        save_json_file(self.state, str(self.state_path))
+
+    def _stage(self, endpoint: str, state: Dict[str, Any]) -> None:
+        self._staged = {**(self._staged or self.state), endpoint: state}
+
+    async def _read_rest(self, client: httpx.AsyncClient) -> Optional[List[FeedEntry]]:
+        state = self.state.get('rest', {})
+        cursor = state.get('after')
+        # Without a cursor only the latest page is read (newest first); after that, everything since the cursor
+        params = {'per_page': REST_PER_PAGE, '_fields': REST_FIELDS, 'orderby': 'date'}
+        params.update({'after': cursor, 'order': 'asc'} if cursor else {'order': 'desc'})
+
+        entries: List[FeedEntry] = []
+        first_url = f"{SAVINGSGURU_URL}{REST_PATH}?{urlencode(params)}"
+        new_state = dict(state)
+        for page in range(1, (self.max_requests if cursor else 1) + 1):
+            url = first_url if page == 1 else f"{first_url}&page={page}"
+            response = await self.scraper.fetch_page(
+                client, url, headers=conditional_headers(state, url) if page == 1 else None
+            )
+            if page == 1 and response.status_code == 304:
+                return []
+            if page > 1 and response.status_code == 400:
+                break  # Past the last page (rest_post_invalid_page_number)
+            if response.status_code != 200:
+                logger.warning(f"SavingsGuru REST API answered {response.status_code}")
+                return None
+            if page == 1:
+                new_state = {'url': url, **validators(response)}
+
+            items = response.json()
+            if not isinstance(items, list):
+                return None
+            for item in items:
+                # WordPress compares `after` with the site-local `date`, so that is the cursor too
+                published = parse_timestamp(item.get('date', ''))
+                if published and item.get('link'):
+                    entries.append(FeedEntry(
+                        (item.get('title') or {}).get('rendered', ""), item['link'], published,
+                        (item.get('content') or {}).get('rendered', ""), f"sg_{item.get('id')}"
+                    ))
+                    if not new_state.get('after') or item['date'] > new_state['after']:
+                        new_state['after'] = item['date']
+
+            total_pages = response.headers.get('X-WP-TotalPages')
+            if len(items) < REST_PER_PAGE or (total_pages and page >= int(total_pages)):
+                break
+
+        new_state.setdefault('after', cursor)
+        self._stage('rest', new_state)
+        return entries
+
+    async def _read_feed(self, client: httpx.AsyncClient) -> Optional[List[FeedEntry]]:
+        state = self.state.get('feed', {})
+        url = f"{SAVINGSGURU_URL}{FEED_PATH}"
+        response = await self.scraper.fetch_page(client, url, headers=conditional_headers(state, url))
+        if response.status_code == 304:
+            return []
+        if response.status_code != 200:
+            logger.warning(f"SavingsGuru feed answered {response.status_code}")
+            return None
+
+        cursor = parse_timestamp(state.get('after', ''))
+        entries = [entry for entry in parse_feed(response.content) if cursor is None or entry.published > cursor]
+        newest = max((entry.published for entry in entries), default=cursor)
+        self._stage('feed', {'url': url, **validators(response), 'after': newest.isoformat() if newest else None})
+        return entries
+
+    def _post_from_entry(self, entry: FeedEntry) -> Optional[SavingsGuruPost]:
+        body = BeautifulSoup(entry.content, 'html.parser')
+        try:
+            title = BeautifulSoup(entry.title, 'html.parser').get_text(strip=True)
+            return self.scraper._build_post(
+                title, entry.link, body, body.get_text(strip=True)[:500], post_id=entry.post_id
+            )
+        except Exception as e:
+            logger.warning(f"Error building post from feed entry {entry.link}: {e}")
+            return None
+        finally:
+            body.decompose()
@@ -6,23 +6,43 @@ NO FAKE DATA GENERATION - uses PAAPI → web scraping → skip product fallback
 import asyncio
 import re
 import json
-from typing import List, Optional, Dict, Set
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Collection, Iterable, List, Optional, Dict, Set, Tuple
 from datetime import datetime
+from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
 
-from settings import Settings
-from models import Deal, SavingsGuruPost, AmazonProduct, DataSource, ScrapingSession
-from amazon_api import AmazonAPIClient
-from scraper_fallback import AmazonScrapingClient
-from utils import (
-    setup_logging, extract_asin_from_url, save_json_file, 
-    generate_session_id, measure_execution_time
+from .settings import Settings, get_settings
+from .models import Deal, SavingsGuruPost, AmazonProduct, DataSource, NegativeReason, ScrapingSession
+from .amazon_api import AmazonAPIClient
+from .scraper_fallback import THROTTLE_STATUSES, AmazonScrapingClient
+from .singleflight import SingleFlight
+from .negative_cache import NegativeCache
+from .utils import (
+    setup_logging, extract_asin_from_url,
+    generate_session_id, measure_execution_time, validate_asin
 )
-from deal_manager import DealManager
+from .deal_manager import DealManager
+from .deal_export import DealExporter
+from .serialization import deal_records
+from .categorizer import get_categorizer
+from .checkpoint import ScrapeCheckpoint
+from .job_queue import QUEUE_FILE_NAME
+from .post_store import PostStore
+from .snapshot import KIND_PRODUCT, SNAPSHOT_NAME, Snapshot, epoch, update_snapshot
+from .run_metrics import METRICS_FILE_NAME, RunMetrics, append_run, hit_ratio
+from .retry import RetryBudget, RetryPolicy, retry_after_seconds
+from .concurrency import AdaptiveLimiter
+
+if TYPE_CHECKING:
+    from .feed_source import FeedSource
+
+
+SAVINGSGURU_URL = "https://www.savingsguru.ca"
 
 
 class FocusedScraper:
@@ -33,67 +53,137 @@ class FocusedScraper:
     
     def __init__(self, settings: Optional[Settings] = None):
         """Initialize the scraper with settings and clients."""
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         
         # Set up logging
         setup_logging(self.settings.log_level)
         
+        # One retry budget per run, shared by every upstream client
+        self.retry_budget = RetryBudget.from_settings(self.settings)
+        self.page_retry = RetryPolicy.from_settings(self.settings, budget=self.retry_budget)
+        
         # Initialize clients
-        self.amazon_api = AmazonAPIClient(self.settings)
+        self.amazon_api = AmazonAPIClient(self.settings, retry_budget=self.retry_budget)
         self.scraper_client = None  # Will be created in async context
         self.deal_manager = DealManager(self.settings)
+        self.exporter = DealExporter(self.settings)
+        self.categorizer = get_categorizer(self.settings.categories_file)
         
-        # Session tracking
-        self.session = ScrapingSession(session_id=generate_session_id())
+        # Coalesce duplicate ASIN lookups and memoize misses briefly
+        self.paapi_flight = SingleFlight(
+            "paapi",
+            negative_ttl=self.settings.negative_result_ttl,
+            is_negative=self._is_missing_price
+        )
+        self.scrape_flight = SingleFlight(
+            "scrape",
+            negative_ttl=self.settings.negative_result_ttl,
+            is_negative=self._is_missing_price
+        )
         
-        # Statistics
+        # Persistent memory of dead/unavailable ASINs across runs
+        self.negative_cache = NegativeCache(
+            str(Path(self.settings.state_dir) / "negative_cache.json"),
+            max_ttl_hours=self.settings.negative_cache_max_ttl_hours
+        )
+        
+        # Persistent HTTP client for SavingsGuru pages (created in async context), and
+        # the limit on concurrent page fetches shared by every caller (e.g. backfill workers)
+        self.page_client: Optional[httpx.AsyncClient] = None
+        self.page_limiter = AdaptiveLimiter.from_settings("savingsguru", self.settings)
+        
+        # WordPress REST / RSS reader, created on first use when POST_SOURCE=feed
+        self.feed_source: Optional['FeedSource'] = None
+        
+        # Session tracking and statistics
+        self.reset_session()
+        
+        logger.info("FocusedScraper initialized with real data sources only")
+    
+    def reset_session(self) -> None:
+        """Start a fresh session and statistics while keeping clients and caches warm."""
+        self.session = ScrapingSession(session_id=generate_session_id())
         self.stats = {
             'posts_scraped': 0,
             'asins_found': 0,
             'paapi_success': 0,
             'scraping_success': 0,
             'products_skipped': 0,
+            'negative_cache_skips': 0,
+            'snapshot_reused': 0,
+            'seen_posts_skipped': 0,
+            'checkpoint_reused': 0,
             'deals_created': 0
         }
-        
-        logger.info("FocusedScraper initialized with real data sources only")
+        self.metrics = RunMetrics()
+        # Whether the run's latest deal commit was saved
+        self.deals_saved = False
+        self.retry_budget.reset()
+        # Clients and single-flight groups outlive sessions; their counters are diffed per run
+        self._counters_at_start = self._upstream_counters()
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.scraper_client = AmazonScrapingClient(self.settings)
+        self.scraper_client = AmazonScrapingClient(self.settings, retry_budget=self.retry_budget)
+        self.page_client = httpx.AsyncClient(timeout=30.0)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         if self.scraper_client:
             await self.scraper_client.close()
+        if self.page_client:
+            await self.page_client.aclose()
+            self.page_client = None
     
     @measure_execution_time("SavingsGuru post scraping")
-    async def scrape_savingsguru_posts(self, max_pages: int = 5) -> List[SavingsGuruPost]:
+    async def scrape_savingsguru_posts(
+        self,
+        max_pages: int = 5,
+        checkpoint: Optional[ScrapeCheckpoint] = None
+    ) -> List[SavingsGuruPost]:
         """
         Scrape SavingsGuru.ca for deal posts and extract Amazon links.
         PRESERVES existing SavingsGuru.ca scraping logic for ASIN extraction.
+        With a checkpoint, pages fetched by an interrupted run are not fetched again.
+        With POST_SOURCE=feed, posts since the last run come from the REST API or
+        RSS feed instead, and listing pages are only scraped when both fail.
         """
         posts = []
-        base_url = "https://www.savingsguru.ca"
+        base_url = SAVINGSGURU_URL
+        pages = checkpoint.pages_to_fetch(max_pages) if checkpoint else list(range(1, max_pages + 1))
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for page in range(1, max_pages + 1):
+        # Reuse the warm client when running inside the context manager
+        client = self.page_client or httpx.AsyncClient(timeout=30.0)
+        try:
+            if self.settings.post_source == "feed":
+                feed_posts = await self._read_feed_source(client)
+                if feed_posts is not None:
+                    return feed_posts
+                logger.warning("SavingsGuru REST API and feed unavailable - scraping listing pages instead")
+            
+            for page in pages:
                 try:
                     url = f"{base_url}/page/{page}" if page > 1 else base_url
                     
                     logger.info(f"Scraping SavingsGuru page {page}: {url}")
-                    response = await client.get(url)
+                    response = await self.fetch_page(client, url)
                     
                     if response.status_code != 200:
                         logger.warning(f"Failed to fetch page {page}: {response.status_code}")
+                        if checkpoint:
+                            checkpoint.fail_page(page, f"HTTP {response.status_code}")
                         continue
                     
                     soup = BeautifulSoup(response.content, 'html.parser')
                     page_posts = self._extract_posts_from_page(soup, base_url)
+                    # Posts hold plain strings; break up the tree now rather than at the next GC
+                    soup.decompose()
                     
                     posts.extend(page_posts)
                     self.stats['posts_scraped'] += len(page_posts)
+                    if checkpoint:
+                        checkpoint.record_page(page, page_posts)
                     
                     logger.info(f"Found {len(page_posts)} posts on page {page}")
                     
@@ -102,11 +192,97 @@ class FocusedScraper:
                     
                 except Exception as e:
                     logger.error(f"Error scraping page {page}: {e}")
+                    if checkpoint:
+                        checkpoint.fail_page(page, str(e))
                     continue
+        finally:
+            if client is not self.page_client:
+                await client.aclose()
+        
+        if checkpoint:
+            # Include posts from pages an earlier, interrupted attempt already fetched
+            posts = checkpoint.posts()
         
         logger.info(f"Total posts scraped from SavingsGuru: {len(posts)}")
         return posts
     
+    async def _read_feed_source(self, client: httpx.AsyncClient) -> Optional[List[SavingsGuruPost]]:
+        """New posts from the REST API or feed (None when neither is usable)."""
+        from .feed_source import FEED_STATE_FILE_NAME, FeedSource
+        
+        if self.feed_source is None:
+            self.feed_source = FeedSource(
+                self,
+                str(Path(self.settings.state_dir) / FEED_STATE_FILE_NAME),
+                max_requests=self.settings.feed_max_requests
+            )
+        return await self.feed_source.fetch_posts(client)
+    
+    async def iter_savingsguru_posts(self, max_pages: int) -> AsyncIterator[List[SavingsGuruPost]]:
+        """
+        Yield each SavingsGuru page's posts as soon as the page is parsed.
+        Nothing is kept between pages, so memory does not grow with the page count.
+        """
+        base_url = SAVINGSGURU_URL
+        client = self.page_client or httpx.AsyncClient(timeout=30.0)
+        try:
+            for page in range(1, max_pages + 1):
+                url = f"{base_url}/page/{page}" if page > 1 else base_url
+                try:
+                    logger.info(f"Scraping SavingsGuru page {page}: {url}")
+                    response = await self.fetch_page(client, url)
+                    if response.status_code != 200:
+                        logger.warning(f"Failed to fetch page {page}: {response.status_code}")
+                        continue
+                    
+                    soup = BeautifulSoup(response.content, 'html.parser')
+                    del response
+                    page_posts = self._extract_posts_from_page(soup, base_url)
+                    soup.decompose()
+                except Exception as e:
+                    logger.error(f"Error scraping page {page}: {e}")
+                    continue
+                
+                self.stats['posts_scraped'] += len(page_posts)
+                logger.info(f"Found {len(page_posts)} posts on page {page}")
+                yield page_posts
+                
+                # Add delay between page requests
+                await asyncio.sleep(2)
+        finally:
+            if client is not self.page_client:
+                await client.aclose()
+    
+    async def fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        GET a SavingsGuru page, retrying throttling, server errors and network failures
+        under the run's retry budget. Returns the last response; raises the last network error.
+        """
+        retry = self.page_retry.start(f"SavingsGuru {url}")
+        extra = {'headers': headers} if headers else {}
+        while True:
+            try:
+                with self.metrics.stage('fetch_posts'):
+                    async with self.page_limiter.slot() as slot:
+                        response = await client.get(url, **extra)
+                        if response.status_code in THROTTLE_STATUSES:
+                            slot.overloaded()
+            except httpx.TransportError as e:
+                if await retry.backoff(type(e).__name__):
+                    continue
+                raise
+            
+            self.metrics.count_request('savingsguru', len(response.content))
+            if self.page_retry.is_retryable_status(response.status_code):
+                if await retry.backoff(f"HTTP {response.status_code}", retry_after_seconds(response)):
+                    continue
+            return response
+    
     def _extract_posts_from_page(self, soup: BeautifulSoup, base_url: str) -> List[SavingsGuruPost]:
         """Extract deal posts from a SavingsGuru page."""
         posts = []
@@ -161,29 +337,6 @@ class FocusedScraper:
                 if href:
                     post_url = urljoin(base_url, href)
             
-            # Find all Amazon links in the post
-            amazon_links = []
-            link_elements = post_element.select('a[href*="amzn.to"], a[href*="amazon.ca"], a[href*="amazon.com"]')
-            
-            for link in link_elements:
-                href = link.get('href')
-                if href and ('amzn.to' in href or 'amazon.ca' in href or 'amazon.com' in href):
-                    amazon_links.append(href)
-            
-            # Extract ASINs from links
-            extracted_asins = []
-            for link in amazon_links:
-                asin = extract_asin_from_url(link)
-                if asin:
-                    extracted_asins.append(asin)
-            
-            # Remove duplicates while preserving order
-            extracted_asins = list(dict.fromkeys(extracted_asins))
-            
-            if not extracted_asins:
-                logger.debug(f"No ASINs found in post: {title}")
-                return None
-            
             # Extract description/content
             content_selectors = ['.content', '.post-content', '.entry-content', 'p']
             description = ""
@@ -193,87 +346,157 @@ class FocusedScraper:
                     description = content_elem.get_text(strip=True)[:500]  # Limit length
                     break
             
-            # Generate post ID
-            post_id = f"sg_{hash(post_url)}_{datetime.utcnow().strftime('%Y%m%d')}"
-            
-            # Determine category from title (basic categorization)
-            category = self._categorize_post(title)
-            
-            return SavingsGuruPost(
-                post_id=post_id,
-                post_title=title,
-                post_url=post_url,
-                amazon_short_links=amazon_links,
-                extracted_asins=extracted_asins,
-                category=category,
-                description=description
-            )
+            return self._build_post(title, post_url, post_element, description)
             
         except Exception as e:
             logger.error(f"Error extracting single post: {e}")
             return None
     
-    def _categorize_post(self, title: str) -> str:
-        """Basic categorization based on post title keywords."""
-        title_lower = title.lower()
-        
-        categories = {
-            'Electronics': ['electronics', 'tech', 'computer', 'laptop', 'phone', 'tablet', 'camera', 'tv'],
-            'Home & Garden': ['home', 'kitchen', 'garden', 'furniture', 'decor', 'appliance'],
-            'Clothing': ['clothing', 'fashion', 'shirt', 'dress', 'shoes', 'jacket'],
-            'Books': ['book', 'novel', 'kindle', 'ebook', 'reading'],
-            'Toys & Games': ['toy', 'game', 'kids', 'children', 'play'],
-            'Health & Beauty': ['health', 'beauty', 'skincare', 'makeup', 'supplement'],
-            'Sports': ['sport', 'fitness', 'gym', 'exercise', 'outdoor'],
-        }
+    def _build_post(
+        self,
+        title: str,
+        post_url: str,
+        content,
+        description: str,
+        post_id: Optional[str] = None
+    ) -> Optional[SavingsGuruPost]:
+        """
+        Build a post from its parts, taking Amazon links and ASINs from the `content`
+        element (an HTML page's post container or a feed entry's parsed body).
+        Returns None when the post links no ASIN.
+        """
+        # Find all Amazon links in the post
+        amazon_links = []
+        link_elements = content.select('a[href*="amzn.to"], a[href*="amazon.ca"], a[href*="amazon.com"]')
+        
+        for link in link_elements:
+            href = link.get('href')
+            if href and ('amzn.to' in href or 'amazon.ca' in href or 'amazon.com' in href):
+                amazon_links.append(href)
         
-        for category, keywords in categories.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return category
+        # Extract ASINs from links
+        extracted_asins = []
+        for link in amazon_links:
+            asin = extract_asin_from_url(link)
+            if asin:
+                extracted_asins.append(asin)
         
-        return "General"
+        # Remove duplicates while preserving order
+        extracted_asins = list(dict.fromkeys(extracted_asins))
+        
+        if not extracted_asins:
+            logger.debug(f"No ASINs found in post: {title}")
+            return None
+        
+        # Generate post ID (feeds supply a stable one)
+        post_id = post_id or f"sg_{hash(post_url)}_{datetime.utcnow().strftime('%Y%m%d')}"
+        
+        # Determine category from title (basic categorization)
+        category = self._categorize_post(title)
+        
+        return SavingsGuruPost(
+            post_id=post_id,
+            post_title=title,
+            post_url=post_url,
+            amazon_short_links=amazon_links,
+            extracted_asins=extracted_asins,
+            category=category,
+            description=description
+        )
+    
+    def _categorize_post(self, title: str) -> str:
+        """Categorize a post from its title keywords."""
+        return self.categorizer.categorize(title)
     
     @measure_execution_time("Real product data retrieval")
     async def get_real_product_data(self, asins: List[str]) -> Dict[str, Optional[AmazonProduct]]:
         """
         Get real product data using PAAPI → web scraping → skip fallback chain.
+        ASINs are resolved concurrently; each upstream's adaptive limiter decides
+        how many requests actually run at once.
         CRITICAL: Never generates fake data.
         """
         results = {}
+        pending = iter(asins)
         
-        for asin in asins:
-            self.session.total_products_attempted += 1
-            self.stats['asins_found'] += 1
-            
-            logger.info(f"Processing ASIN: {asin}")
-            
-            # Step 1: Try PAAPI first
-            product = await self._try_paapi(asin)
-            
-            if product:
-                results[asin] = product
-                self.session.total_products_successful += 1
-                self.stats['paapi_success'] += 1
-                logger.info(f"✓ PAAPI success for {asin}: {product.title}")
-                continue
-            
-            # Step 2: Try web scraping fallback
-            product = await self._try_web_scraping(asin)
-            
-            if product:
-                results[asin] = product
-                self.session.total_products_successful += 1
-                self.stats['scraping_success'] += 1
-                logger.info(f"✓ Scraping success for {asin}: {product.title}")
-                continue
-            
-            # Step 3: Skip product (NO FAKE DATA)
-            results[asin] = None
-            self.stats['products_skipped'] += 1
-            logger.warning(f"✗ Skipping {asin} - no real data available")
-            self.session.add_error(f"No real data available for ASIN {asin}")
+        async def worker() -> None:
+            for asin in pending:
+                results[asin] = await self._resolve_asin(asin)
+        
+        workers = self.settings.adaptive_max_concurrency if self.settings.adaptive_concurrency_enabled else 1
+        await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(asins))))))
+        
+        self.negative_cache.save()
+        return {asin: results[asin] for asin in asins}
+    
+    async def _resolve_asin(self, asin: str) -> Optional[AmazonProduct]:
+        """Resolve one ASIN through the fallback chain (None when there is no real data)."""
+        self.stats['asins_found'] += 1
+        
+        # Step 0: Skip known-bad ASINs before any network call (recorded once per window)
+        cached_reason = self.negative_cache.should_skip(asin)
+        if not cached_reason and not validate_asin(asin):
+            cached_reason = self.negative_cache.record(asin, NegativeReason.INVALID).reason
+        
+        if cached_reason:
+            self.stats['negative_cache_skips'] += 1
+            logger.debug(f"Skipping {asin} - negative cache ({cached_reason.value})")
+            return None
+        
+        self.session.total_products_attempted += 1
+        logger.info(f"Processing ASIN: {asin}")
+        
+        # Step 1: Try PAAPI first
+        product = await self._try_paapi(asin)
         
-        return results
+        if product:
+            self.session.total_products_successful += 1
+            self.stats['paapi_success'] += 1
+            self.negative_cache.clear(asin)
+            logger.info(f"✓ PAAPI success for {asin}: {product.title}")
+            return product
+        
+        # Step 2: Try web scraping fallback
+        product = await self._try_web_scraping(asin)
+        
+        if product:
+            self.session.total_products_successful += 1
+            self.stats['scraping_success'] += 1
+            self.negative_cache.clear(asin)
+            logger.info(f"✓ Scraping success for {asin}: {product.title}")
+            return product
+        
+        # Step 3: Skip product (NO FAKE DATA)
+        self.stats['products_skipped'] += 1
+        logger.warning(f"✗ Skipping {asin} - no real data available")
+        self.session.add_error(f"No real data available for ASIN {asin}")
+        self.negative_cache.record(asin, self._failure_reason(asin))
+        return None
+    
+    async def get_sharded_product_data(self, asins: List[str]) -> Dict[str, Optional[AmazonProduct]]:
+        """
+        Resolve ASINs across shard worker processes (settings.shard_workers), each with
+        its own PAAPI credentials, throttle and cache; results come back to this run.
+        """
+        from .sharding import ShardCoordinator
+        
+        self.stats['asins_found'] += len(asins)
+        products, worker_stats = await ShardCoordinator(self.settings).resolve_products(asins)
+        
+        for key, value in worker_stats.items():
+            self.stats[key] += value
+        self.session.total_products_attempted += len(asins)
+        self.session.total_products_successful += sum(1 for product in products.values() if product)
+        
+        return products
+    
+    def _failure_reason(self, asin: str) -> NegativeReason:
+        """Determine why an ASIN yielded no data, based on the scraping client's verdict."""
+        if self.scraper_client:
+            reason = self.scraper_client.failure_reasons.pop(asin, None)
+            if reason:
+                return reason
+        return NegativeReason.NOT_FOUND
     
     async def _try_paapi(self, asin: str) -> Optional[AmazonProduct]:
         """Try to get product data using Amazon PAAPI."""
@@ -281,7 +504,9 @@ class FocusedScraper:
             logger.debug(f"Trying PAAPI for {asin}")
             self.session.total_api_calls += 1
             
-            product = await self.amazon_api.get_product_info(asin)
+            product = await self.paapi_flight.do(
+                asin, lambda: self.amazon_api.get_product_info(asin)
+            )
             
             if product and product.current_price and product.current_price > 0:
                 logger.debug(f"PAAPI returned valid product for {asin}")
@@ -300,7 +525,9 @@ class FocusedScraper:
             logger.debug(f"Trying web scraping for {asin}")
             self.session.total_scraping_calls += 1
             
-            product = await self.scraper_client.scrape_product(asin)
+            product = await self.scrape_flight.do(
+                asin, lambda: self.scraper_client.scrape_product(asin)
+            )
             
             if product and product.current_price and product.current_price > 0:
                 logger.debug(f"Web scraping returned valid product for {asin}")
@@ -313,6 +540,99 @@ class FocusedScraper:
             logger.warning(f"Web scraping error for {asin}: {e}")
             return None
     
+    def filter_unseen_posts(self, posts: List[SavingsGuruPost]) -> List[SavingsGuruPost]:
+        """
+        Drop posts processed in an earlier run: the post URL was seen, or every
+        Amazon short link in it was. Bloom filters never miss a seen item; a rare
+        false positive only skips a post.
+        """
+        seen = self.deal_manager.seen
+        unseen = []
+        
+        for post in posts:
+            short_links = [link for link in post.amazon_short_links if 'amzn.to' in link]
+            if post.post_url and seen.contains("post_url", str(post.post_url)):
+                continue
+            if short_links and all(seen.contains("short_link", link) for link in short_links):
+                continue
+            unseen.append(post)
+        
+        skipped = len(posts) - len(unseen)
+        if skipped:
+            self.stats['seen_posts_skipped'] += skipped
+            logger.info(f"Skipped {skipped} posts already processed in earlier runs")
+        
+        return unseen
+    
+    def remember_processed_posts(self, posts: List[SavingsGuruPost], resolved: Collection[str]) -> None:
+        """
+        Record post URLs and short links so later runs skip them. Only posts whose
+        every ASIN either resolved (is in `resolved`) or is negatively cached as not
+        found or invalid are recorded; a blocked, priceless or failed lookup leaves
+        the post to be fetched again next run.
+        """
+        posts = [
+            post for post in posts
+            if all(asin in resolved or self.negative_cache.is_permanent(asin) for asin in post.extracted_asins)
+        ]
+        if not posts:
+            return
+        seen = self.deal_manager.seen
+        seen.add("post_url", (str(post.post_url) for post in posts if post.post_url))
+        seen.add("short_link", (link for post in posts for link in post.amazon_short_links if 'amzn.to' in link))
+        seen.flush()
+    
+    def remember_products(self, products: Dict[str, Optional[AmazonProduct]]) -> None:
+        """Add resolved products to the state snapshot (earlier ones are kept until they age out)."""
+        resolved = [product for product in products.values() if product]
+        if resolved:
+            self._update_product_snapshot(
+                (product.asin, epoch(product.retrieved_at), product.model_dump_json().encode()) for product in resolved
+            )
+    
+    def fresh_snapshot_products(self, asins: List[str]) -> Dict[str, AmazonProduct]:
+        """
+        Products for `asins` resolved within snapshot_product_reuse_minutes, read from the
+        state snapshot. Only the matching records are decoded; the rest need a lookup.
+        """
+        max_age = self.settings.snapshot_product_reuse_minutes * 60
+        if not (self.settings.snapshot_enabled and max_age > 0 and asins):
+            return {}
+        snapshot = Snapshot.open_if_valid(Path(self.settings.state_dir) / SNAPSHOT_NAME)
+        if snapshot is None:
+            return {}
+        
+        now = time.time()
+        reused = {}
+        with snapshot:
+            for asin in asins:
+                if not snapshot.is_fresh(KIND_PRODUCT, asin, max_age, now):
+                    continue
+                try:
+                    reused[asin] = snapshot.load(KIND_PRODUCT, asin, AmazonProduct)
+                except ValueError as e:
+                    logger.warning(f"Ignoring unreadable snapshot product {asin}: {e}")
+        
+        if reused:
+            self.stats['snapshot_reused'] += len(reused)
+            logger.info(f"Reusing {len(reused)} products resolved in the last {self.settings.snapshot_product_reuse_minutes:.0f} minutes")
+        return reused
+    
+    def _update_product_snapshot(self, records: Iterable[Tuple[str, float, bytes]]) -> None:
+        """Write (asin, updated_at, JSON payload) product records into the state snapshot."""
+        if not self.settings.snapshot_enabled:
+            return
+        update_snapshot(
+            Path(self.settings.state_dir) / SNAPSHOT_NAME, KIND_PRODUCT, records,
+            keep_existing=True,
+            max_age_seconds=self.settings.snapshot_product_max_age_hours * 3600
+        )
+    
+    @staticmethod
+    def _is_missing_price(product: Optional[AmazonProduct]) -> bool:
+        """Treat lookups without a usable price as negative results."""
+        return not product or not product.current_price or product.current_price <= 0
+    
     def create_deals_from_products(
         self, 
         products: Dict[str, Optional[AmazonProduct]], 
@@ -336,7 +656,8 @@ class FocusedScraper:
             deal = Deal.from_amazon_product(
                 amazon_product=product,
                 partner_tag=self.settings.amz_partner_tag,
-                savingsguru_post=savingsguru_post
+                savingsguru_post=savingsguru_post,
+                marketplace=self.settings.amz_marketplace
             )
             
             if deal:
@@ -373,11 +694,19 @@ class FocusedScraper:
         
         return sorted_deals
     
-    async def scrape_deals(self, max_pages: int = None, output_file: str = "deals.json") -> List[Deal]:
+    async def scrape_deals(
+        self,
+        max_pages: int = None,
+        output_file: str = "deals.json",
+        posts: Optional[List[SavingsGuruPost]] = None
+    ) -> List[Deal]:
         """
         Main scraping method that orchestrates the entire process.
         Returns deals with 100% real data - no fake pricing ever generated.
         Now manages deal count to maintain target of ~120 deals.
+        Pass `posts` to reuse SavingsGuru posts already fetched (e.g. shared across marketplaces);
+        the caller then owns them, so an empty list still manages existing deals and the
+        feed cursor is left for the caller to commit.
         """
         logger.info("Starting SavingsGuru real data scraping with deal management")
         
@@ -385,14 +714,40 @@ class FocusedScraper:
         if max_pages is None:
             max_pages = self.settings.max_pages_to_scrape
         
+        # Determine output path first for checkpointing and the deal manager
+        if not output_file.startswith('/'):
+            output_path = f"public/{output_file}"
+        else:
+            output_path = output_file
+        
+        if posts is None and 0 < self.settings.crawl_low_memory_pages <= max_pages:
+            return await self.crawl_deals(max_pages, output_path)
+        
+        if self.settings.pipeline_enabled and posts is None:
+            return await self.stream_deals(max_pages, output_path)
+        
+        checkpoint = self._open_checkpoint(output_path)
+        
         try:
             # Step 1: Scrape SavingsGuru posts (more pages for more deals)
-            posts = await self.scrape_savingsguru_posts(max_pages)
+            shared_posts = posts is not None
+            if not shared_posts:
+                posts = await self.scrape_savingsguru_posts(max_pages, checkpoint=checkpoint)
             
-            if not posts:
+            # Nothing new in the feed is not a failure: existing deals are still managed
+            feed_unchanged = not posts and (
+                shared_posts or (self.feed_source is not None and self.feed_source.last_source is not None)
+            )
+            if not posts and not feed_unchanged:
                 logger.warning("No posts found on SavingsGuru - aborting")
+                # A clean abort has nothing worth resuming
+                if checkpoint:
+                    checkpoint.discard()
                 return []
             
+            if self.settings.skip_seen_posts:
+                posts = self.filter_unseen_posts(posts)
+            
             # Step 2: Extract unique ASINs
             all_asins = []
             for post in posts:
@@ -401,12 +756,18 @@ class FocusedScraper:
             unique_asins = list(dict.fromkeys(all_asins))  # Remove duplicates
             logger.info(f"Found {len(unique_asins)} unique ASINs to process")
             
-            if not unique_asins:
+            if not unique_asins and not self.stats['seen_posts_skipped'] and not feed_unchanged:
                 logger.warning("No ASINs found in posts - aborting")
+                # A clean abort has nothing worth resuming
+                if checkpoint:
+                    checkpoint.discard()
                 return []
             
             # Step 3: Get real product data (PAAPI → scraping → skip)
-            products = await self.get_real_product_data(unique_asins)
+            # (nothing new to fetch when every post was seen before; existing deals still get managed)
+            with self.metrics.stage('resolve_products'):
+                products = await self._resolve_products(unique_asins, checkpoint) if unique_asins else {}
+            self.remember_products(products)
             
             # Step 4: Create deals from real data only
             new_deals = self.create_deals_from_products(products, posts)
@@ -418,39 +779,23 @@ class FocusedScraper:
             else:
                 logger.info(f"Created {len(new_deals)} new deals from scraped data")
             
-            # Step 5: Use deal manager to handle deduplication, freshness, and count management
-            # Determine output path first for deal manager
-            if not output_file.startswith('/'):
-                output_path = f"public/{output_file}"
-            else:
-                output_path = output_file
-            
-            management_result = await self.deal_manager.process_deals(new_deals, output_path)
-            final_deals = management_result['deals']
-            deal_stats = management_result['stats']
-            
-            # Update our stats with deal management info
-            self.stats.update(deal_stats)
-            self.stats['deals_created'] = len(final_deals)
-            
-            # Step 6: Sort and mark featured deals on final set
-            final_deals = self._mark_featured_deals(final_deals)
-            
-            # Step 7: Save managed deals to output file
-            deals_data = [deal.dict() for deal in final_deals]
-            success = save_json_file(deals_data, output_path)
+            # Steps 5-7: Manage, feature and save deals
+            with self.metrics.stage('commit'):
+                final_deals, success = await self.commit_deals(new_deals, output_path)
             
             if success:
-                logger.info(f"Saved {len(final_deals)} managed deals to {output_path}")
-                logger.info(f"Deal management stats: {deal_stats}")
-            else:
-                logger.error(f"Failed to save deals to {output_path}")
+                self.remember_processed_posts(posts, {asin for asin, product in products.items() if product})
+                if self.feed_source and not shared_posts:
+                    self.feed_source.commit()
+                if checkpoint:
+                    checkpoint.discard()
             
             # Complete session tracking
             self.session.completed_at = datetime.utcnow()
             
             # Log final statistics
             self._log_final_statistics()
+            self.record_run_metrics(output_path, mode='sharded' if self.settings.shard_workers > 1 else 'batch')
             
             return final_deals
             
@@ -458,6 +803,244 @@ class FocusedScraper:
             logger.error(f"Critical error during scraping: {e}")
             self.session.add_error(f"Critical error: {e}")
             return []
+        finally:
+            if checkpoint:
+                checkpoint.close()
+    
+    async def stream_deals(self, max_pages: int, output_path: str) -> List[Deal]:
+        """
+        Streaming variant of scrape_deals: pages, posts, lookups and deals flow through
+        bounded queues and are committed incrementally (see pipeline.StreamingPipeline).
+        """
+        from .pipeline import StreamingPipeline
+        
+        try:
+            final_deals = await StreamingPipeline(self).run(max_pages, output_path)
+        except Exception as e:
+            logger.error(f"Critical error during streaming scrape: {e}")
+            self.session.add_error(f"Critical error: {e}")
+            return []
+        
+        self.session.completed_at = datetime.utcnow()
+        self._log_final_statistics()
+        self.record_run_metrics(output_path, mode='pipeline')
+        return final_deals
+    
+    async def crawl_deals(self, max_pages: int, output_path: str) -> List[Deal]:
+        """
+        Constant-memory variant of scrape_deals for very large crawls (backfills).
+        Posts are spilled to an on-disk ASIN -> post map as pages are parsed; ASINs are
+        then resolved in batches and deals committed whenever a full deal set is waiting,
+        so memory depends on the batch and deal-set sizes, not on the page count.
+        """
+        store = PostStore(str(Path(self.settings.state_dir) / f"crawl_{self.session.session_id}.sqlite"))
+        try:
+            async for page_posts in self.iter_savingsguru_posts(max_pages):
+                if self.settings.skip_seen_posts:
+                    page_posts = self.filter_unseen_posts(page_posts)
+                store.add(page_posts)
+            
+            logger.info(f"Crawled {store.count_posts()} posts with {store.count_asins()} unique ASINs to process")
+            if not store.count_asins() and not self.stats['seen_posts_skipped']:
+                logger.warning("No ASINs found in posts - aborting")
+                return []
+            
+            final_deals = await self.deals_from_store(store, output_path)
+        except Exception as e:
+            logger.error(f"Critical error during crawl: {e}")
+            self.session.add_error(f"Critical error: {e}")
+            return []
+        finally:
+            store.close()
+        
+        self.session.completed_at = datetime.utcnow()
+        self._log_final_statistics()
+        self.record_run_metrics(output_path, mode='crawl')
+        return final_deals
+    
+    async def deals_from_store(self, store: PostStore, output_path: str) -> List[Deal]:
+        """
+        Resolve a post store's unresolved ASINs in batches and commit their deals whenever
+        a full deal set is waiting. ASINs are marked resolved once their deals are saved,
+        so an interrupted run over a durable store picks up after the last commit.
+        """
+        final_deals: List[Deal] = []
+        new_deals: List[Deal] = []
+        pending: List[str] = []
+        commits = 0
+        all_saved = True
+        
+        async def commit() -> None:
+            nonlocal final_deals, new_deals, pending, commits, all_saved
+            with self.metrics.stage('commit'):
+                final_deals, success = await self.commit_deals(new_deals, output_path)
+            if success:
+                store.mark_resolved(pending)
+            all_saved = all_saved and success
+            commits += 1
+            new_deals, pending = [], []
+        
+        for batch in store.asin_batches(self.settings.checkpoint_batch_size):
+            with self.metrics.stage('resolve_products'):
+                products = await self._resolve_products(batch, None)
+            store.add_products(products)
+            pending.extend(batch)
+            new_deals.extend(self.create_deals_from_products(products, list(store.posts_for(batch).values())))
+            if len(new_deals) >= self.settings.target_deal_count:
+                await commit()
+        
+        # Final commit (also manages existing deals when nothing new was found)
+        if pending or not commits:
+            await commit()
+        
+        # One snapshot rewrite for the whole crawl instead of one per commit
+        self._update_product_snapshot(store.product_records())
+        if all_saved:
+            for posts in store.post_batches(500):
+                asins = {asin for post in posts for asin in post.extracted_asins}
+                self.remember_processed_posts(posts, store.product_asins(asins))
+        return final_deals
+    
+    async def commit_deals(self, new_deals: List[Deal], output_path: str) -> Tuple[List[Deal], bool]:
+        """
+        Merge new deals into the deal store and save it.
+        Returns (final deals, whether the save succeeded).
+        """
+        # Step 5: Use deal manager to handle deduplication, freshness, and count management
+        management_result = await self.deal_manager.process_deals(new_deals, output_path)
+        final_deals = management_result['deals']
+        deal_stats = management_result['stats']
+        
+        # Update our stats with deal management info
+        self.stats.update(deal_stats)
+        self.stats['deals_created'] = len(final_deals)
+        
+        # Step 6: Sort and mark featured deals on final set
+        final_deals = self._mark_featured_deals(final_deals)
+        
+        # Step 7: Save managed deals plus incremental delta to output directory
+        deals_data = deal_records(final_deals)
+        success = self.exporter.export(deals_data, output_path)
+        
+        self.deals_saved = success
+        if success:
+            self.deal_manager.remember_saved_deals(final_deals, output_path)
+            logger.info(f"Saved {len(final_deals)} managed deals to {output_path}")
+            logger.info(f"Deal management stats: {deal_stats}")
+        else:
+            logger.error(f"Failed to save deals to {output_path}")
+        
+        return final_deals, success
+    
+    def _upstream_counters(self) -> Dict[str, int]:
+        """Cumulative request and cache counters of the clients and single-flight groups."""
+        counters = {}
+        sources = {
+            'paapi': self.amazon_api,
+            'amazon_pages': self.scraper_client,
+            'paapi_flight': self.paapi_flight,
+            'scrape_flight': self.scrape_flight,
+        }
+        for name, source in sources.items():
+            stats = getattr(source, 'stats', None)
+            if isinstance(stats, dict):
+                counters.update((f"{name}.{key}", value) for key, value in stats.items())
+        return counters
+    
+    def record_run_metrics(self, output_path: str, mode: str) -> None:
+        """Append this run's durations, upstream requests, cache hit ratios and quota use to the metrics file."""
+        if not self.settings.metrics_enabled:
+            return
+        
+        now = self._upstream_counters()
+        used = {key: value - self._counters_at_start.get(key, 0) for key, value in now.items()}
+        self.metrics.count_request('paapi', requests=used.get('paapi.requests', 0))
+        self.metrics.count_request(
+            'amazon_pages', used.get('amazon_pages.bytes', 0), requests=used.get('amazon_pages.requests', 0)
+        )
+        
+        def flight_hit_ratio(name: str) -> Optional[float]:
+            hits = used.get(f"{name}.coalesced", 0) + used.get(f"{name}.negative_hits", 0)
+            return hit_ratio(hits, hits + used.get(f"{name}.calls", 0))
+        
+        record = self.metrics.record(
+            cache_hit_ratios={
+                'negative_cache': hit_ratio(self.stats['negative_cache_skips'], self.stats['asins_found']),
+                'snapshot': hit_ratio(
+                    self.stats['snapshot_reused'], self.stats['asins_found'] + self.stats['snapshot_reused']
+                ),
+                'checkpoint': hit_ratio(self.stats['checkpoint_reused'], self.stats['asins_found']),
+                'seen_posts': hit_ratio(self.stats['seen_posts_skipped'], self.stats['posts_scraped']),
+                'paapi_flight': flight_hit_ratio('paapi_flight'),
+                'scrape_flight': flight_hit_ratio('scrape_flight'),
+            },
+            quota={'paapi': used.get('paapi.requests', 0)},
+            counts=dict(
+                self.stats,
+                retries=self.retry_budget.stats['retries'],
+                retries_denied=self.retry_budget.stats['denied']
+            ),
+            run_id=self.session.session_id,
+            marketplace=self.settings.amz_marketplace,
+            mode=mode,
+            output=output_path
+        )
+        append_run(
+            Path(self.settings.state_dir) / METRICS_FILE_NAME, record,
+            keep=self.settings.metrics_keep_runs, codec=self.exporter.codec
+        )
+    
+    def _open_checkpoint(self, output_path: str) -> Optional[ScrapeCheckpoint]:
+        """Open the durable checkpoint for this output (None when checkpointing is disabled)."""
+        if not self.settings.checkpoint_enabled:
+            return None
+        return ScrapeCheckpoint(
+            str(Path(self.settings.state_dir) / QUEUE_FILE_NAME),
+            output_path,
+            max_age_hours=self.settings.checkpoint_max_age_hours
+        )
+    
+    async def _resolve_products(
+        self,
+        asins: List[str],
+        checkpoint: Optional[ScrapeCheckpoint]
+    ) -> Dict[str, Optional[AmazonProduct]]:
+        """
+        Resolve ASINs in-process or across shard workers. With a checkpoint, results are
+        committed batch by batch and lookups finished by an interrupted run are reused.
+        """
+        sharded = self.settings.shard_workers > 1
+        resolve = self.get_sharded_product_data if sharded else self.get_real_product_data
+        
+        # Products resolved moments ago (e.g. by the previous cycle) need no second lookup
+        recent = self.fresh_snapshot_products(asins)
+        pending = [asin for asin in asins if asin not in recent]
+        
+        if checkpoint is None:
+            found = await resolve(pending) if pending else {}
+            return {asin: recent.get(asin) or found.get(asin) for asin in asins}
+        
+        checkpoint.add_asins(pending)
+        reused = checkpoint.counts()['done']
+        if reused:
+            self.stats['checkpoint_reused'] += reused
+            logger.info(f"Reusing {reused} ASIN lookups checkpointed by an interrupted run")
+        
+        # Shard workers take the whole remainder at once; in-process lookups commit every batch
+        batch_size = len(asins) if sharded else self.settings.checkpoint_batch_size
+        while True:
+            batch = checkpoint.claim_asins(batch_size)
+            if not batch:
+                break
+            try:
+                found = await resolve(batch)
+            except Exception as e:
+                checkpoint.fail_asins(batch, str(e))
+                raise
+            checkpoint.record_products(found)
+        
+        stored = checkpoint.products()
+        return {asin: recent.get(asin) or stored.get(asin) for asin in asins}
     
     def _log_final_statistics(self):
         """Log comprehensive statistics about the scraping session."""
@@ -467,6 +1050,8 @@ class FocusedScraper:
         logger.info(f"  PAAPI successes: {self.stats['paapi_success']}")
         logger.info(f"  Web scraping successes: {self.stats['scraping_success']}")
         logger.info(f"  Products skipped (no real data): {self.stats['products_skipped']}")
+        logger.info(f"  Skipped via negative cache: {self.stats['negative_cache_skips']}")
+        logger.info(f"  Reused from state snapshot: {self.stats['snapshot_reused']}")
         logger.info(f"  Final deals created: {self.stats['deals_created']}")
         logger.info(f"  Success rate: {self.session.success_rate:.1f}%")
         logger.info(f"  Session ID: {self.session.session_id}")
@@ -0,0 +1,157 @@
+"""
+Durable SQLite work queue for per-ASIN lookups.
+Tasks move pending -> in_flight -> done/failed with atomic claims, so several
+worker processes (or hosts sharing the database file) can drain one run, and
+finished results survive a crash of any of them.
+"""
+
+import sqlite3
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+QUEUE_FILE_NAME = "job_queue.sqlite"
+
+
+class TaskStatus(str, Enum):
+    """Lifecycle of one queued task."""
+    PENDING = "pending"
+    IN_FLIGHT = "in_flight"
+    DONE = "done"
+    FAILED = "failed"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    shard INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (run_id, shard, status);
+"""
+
+
+class JobQueue:
+    """
+    Task table keyed by (run_id, key).
+    Results are opaque text (callers store JSON); a done task with no result means "looked up, nothing found".
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        """Open (creating if needed) the queue database."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.db_path), timeout=timeout, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, run_id: str, tasks: Iterable[Tuple[str, int]]) -> int:
+        """Add (key, shard) tasks as pending; keys already in the run are left alone. Returns count added."""
+        now = time.time()
+        before = self._conn.total_changes
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, key, shard, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id, key, shard, TaskStatus.PENDING.value, now, now) for key, shard in tasks)
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self._conn.total_changes - before
+
+    def claim(self, run_id: str, worker: str, shard: Optional[int] = None, limit: int = 10) -> List[str]:
+        """Atomically move up to `limit` pending tasks (of one shard, if given) to in_flight for `worker`."""
+        query = "SELECT key FROM tasks WHERE run_id = ? AND status = ?"
+        params: list = [run_id, TaskStatus.PENDING.value]
+        if shard is not None:
+            query += " AND shard = ?"
+            params.append(shard)
+        query += " ORDER BY rowid LIMIT ?"
+        params.append(limit)
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = [row[0] for row in self._conn.execute(query, params)]
+            self._conn.executemany(
+                "UPDATE tasks SET status = ?, worker = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE run_id = ? AND key = ?",
+                ((TaskStatus.IN_FLIGHT.value, worker, time.time(), run_id, key) for key in keys)
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return keys
+
+    def complete(self, run_id: str, key: str, result: Optional[str] = None) -> None:
+        """Mark a task done, storing its result."""
+        self._conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, updated_at = ? WHERE run_id = ? AND key = ?",
+            (TaskStatus.DONE.value, result, time.time(), run_id, key)
+        )
+
+    def fail(self, run_id: str, key: str, error: str) -> None:
+        """Mark a task failed with an error message."""
+        self._conn.execute(
+            "UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE run_id = ? AND key = ?",
+            (TaskStatus.FAILED.value, error[:500], time.time(), run_id, key)
+        )
+
+    def release_stale(self, run_id: str, older_than: float) -> int:
+        """Return in_flight tasks untouched for `older_than` seconds (their worker died) to pending."""
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = ?, worker = NULL, updated_at = ? "
+            "WHERE run_id = ? AND status = ? AND updated_at < ?",
+            (TaskStatus.PENDING.value, time.time(), run_id, TaskStatus.IN_FLIGHT.value, time.time() - older_than)
+        )
+        return cursor.rowcount
+
+    def requeue_failed(self, run_id: str) -> int:
+        """Return failed tasks to pending so a later attempt retries them."""
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = ?, worker = NULL, updated_at = ? WHERE run_id = ? AND status = ?",
+            (TaskStatus.PENDING.value, time.time(), run_id, TaskStatus.FAILED.value)
+        )
+        return cursor.rowcount
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        """Number of tasks per status for a run."""
+        counts = {status.value: 0 for status in TaskStatus}
+        for status, count in self._conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status", (run_id,)
+        ):
+            counts[status] = count
+        return counts
+
+    def results(self, run_id: str) -> Dict[str, Optional[str]]:
+        """Stored results of the run's done tasks."""
+        return dict(self._conn.execute(
+            "SELECT key, result FROM tasks WHERE run_id = ? AND status = ?", (run_id, TaskStatus.DONE.value)
+        ))
+
+    def started_at(self, run_id: str) -> Optional[float]:
+        """When the run's first task was queued (None if the run has no tasks)."""
+        return self._conn.execute("SELECT MIN(created_at) FROM tasks WHERE run_id = ?", (run_id,)).fetchone()[0]
+
+    def delete_run(self, run_id: str) -> int:
+        """Drop every task of a run."""
+        return self._conn.execute("DELETE FROM tasks WHERE run_id = ?", (run_id,)).rowcount
+
+    def close(self) -> None:
+        self._conn.close()
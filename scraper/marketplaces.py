@@ -0,0 +1,94 @@
+"""
+Amazon marketplace table.
+Domain, locale, currency and page conventions for every marketplace the
+settings accept, so clients and affiliate links are built per marketplace
+instead of assuming Amazon.ca.
+"""
+
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Marketplace(BaseModel):
+    """
+    One Amazon storefront.
+    `code` matches Settings.amz_marketplace and the PAAPI country code.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    code: str
+    domain: str
+    locale: str
+    currency: str
+    accept_languages: Tuple[str, ...]
+    decimal_comma: bool = False
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.domain}"
+
+    @property
+    def slug(self) -> str:
+        """Lower-case code used for per-marketplace paths."""
+        return self.code.lower()
+
+    def product_url(self, asin: str) -> str:
+        return f"{self.base_url}/dp/{asin}"
+
+    def affiliate_url(self, asin: str, partner_tag: str) -> str:
+        return f"{self.base_url}/dp/{asin}?tag={partner_tag}"
+
+
+DEFAULT_MARKETPLACE = "CA"
+
+MARKETPLACES: Dict[str, Marketplace] = {
+    market.code: market for market in [
+        Marketplace(code="CA", domain="www.amazon.ca", locale="en_CA", currency="CAD", accept_languages=(
+            'en-US,en;q=0.9', 'en-US,en;q=0.9,fr;q=0.8', 'en-CA,en;q=0.9,fr;q=0.8', 'en-US,en;q=0.8')),
+        Marketplace(code="US", domain="www.amazon.com", locale="en_US", currency="USD", accept_languages=(
+            'en-US,en;q=0.9', 'en-US,en;q=0.8')),
+        Marketplace(code="UK", domain="www.amazon.co.uk", locale="en_GB", currency="GBP", accept_languages=(
+            'en-GB,en;q=0.9', 'en-GB,en-US;q=0.9,en;q=0.8')),
+        Marketplace(code="DE", domain="www.amazon.de", locale="de_DE", currency="EUR", accept_languages=(
+            'de-DE,de;q=0.9,en;q=0.8', 'de-DE,de;q=0.9'), decimal_comma=True),
+        Marketplace(code="FR", domain="www.amazon.fr", locale="fr_FR", currency="EUR", accept_languages=(
+            'fr-FR,fr;q=0.9,en;q=0.8', 'fr-FR,fr;q=0.9'), decimal_comma=True),
+        Marketplace(code="IT", domain="www.amazon.it", locale="it_IT", currency="EUR", accept_languages=(
+            'it-IT,it;q=0.9,en;q=0.8', 'it-IT,it;q=0.9'), decimal_comma=True),
+        Marketplace(code="ES", domain="www.amazon.es", locale="es_ES", currency="EUR", accept_languages=(
+            'es-ES,es;q=0.9,en;q=0.8', 'es-ES,es;q=0.9'), decimal_comma=True),
+        Marketplace(code="IN", domain="www.amazon.in", locale="en_IN", currency="INR", accept_languages=(
+            'en-IN,en;q=0.9,hi;q=0.8', 'en-IN,en;q=0.9')),
+        Marketplace(code="JP", domain="www.amazon.co.jp", locale="ja_JP", currency="JPY", accept_languages=(
+            'ja-JP,ja;q=0.9,en;q=0.8', 'ja-JP,ja;q=0.9')),
+        Marketplace(code="AU", domain="www.amazon.com.au", locale="en_AU", currency="AUD", accept_languages=(
+            'en-AU,en;q=0.9', 'en-AU,en-GB;q=0.9,en;q=0.8')),
+    ]
+}
+
+
+def get_marketplace(code: str) -> Marketplace:
+    """Look up a marketplace by country code (case-insensitive)."""
+    try:
+        return MARKETPLACES[code.upper()]
+    except KeyError:
+        raise ValueError(f"Invalid marketplace: {code}. Must be one of {list(MARKETPLACES)}")
+
+
+def parse_marketplaces(value: str) -> List[str]:
+    """Parse a comma-separated marketplace list ("CA, us,UK") into validated codes, keeping order."""
+    codes = [code.strip().upper() for code in value.split(',') if code.strip()]
+    for code in codes:
+        get_marketplace(code)
+    return list(dict.fromkeys(codes))
+
+
+def parse_partner_tags(value: str) -> Dict[str, str]:
+    """Parse per-marketplace partner tags ("US:mytag-20,UK:mytag-21")."""
+    tags = {}
+    for entry in value.split(','):
+        if ':' in entry:
+            code, tag = entry.split(':', 1)
+            tags[get_marketplace(code.strip()).code] = tag.strip()
+    return tags
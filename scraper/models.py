@@ -3,12 +3,33 @@ Pydantic models for data validation and serialization.
 Ensures type safety and consistency across the application.
 """
 
-from pydantic import BaseModel, HttpUrl, Field, validator, field_validator
-from typing import Optional, List, Literal
+import gc
+import json
+from functools import lru_cache
+from pydantic import (
+    AliasGenerator, BaseModel, ConfigDict, HttpUrl, Field, TypeAdapter, ValidationError, validator, field_validator
+)
+from pydantic.alias_generators import to_camel
+from typing import Optional, List, Literal, Type, TypeVar, Union
 from decimal import Decimal
 from datetime import datetime
 from enum import Enum
 
+from loguru import logger
+
+from .marketplaces import DEFAULT_MARKETPLACE, get_marketplace
+
+
+# Stored records may use field names or their camelCase form (the frontend's schema);
+# dumping with by_alias=True writes camelCase
+STORED_MODEL_CONFIG = ConfigDict(
+    alias_generator=AliasGenerator(validation_alias=to_camel, serialization_alias=to_camel),
+    validate_by_name=True,
+    validate_by_alias=True
+)
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
 
 class DataSource(str, Enum):
     """Data source types for tracking where product data came from."""
@@ -18,11 +39,21 @@ class DataSource(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+class NegativeReason(str, Enum):
+    """Reason codes for ASINs that yielded no usable product data."""
+    NOT_FOUND = "NOT_FOUND"
+    NO_PRICE = "NO_PRICE"
+    BLOCKED = "BLOCKED"
+    INVALID = "INVALID"
+
+
 class AmazonProduct(BaseModel):
     """
     Amazon product data from PAAPI or scraping.
     This is the raw product data before transformation to Deal format.
     """
+    model_config = STORED_MODEL_CONFIG
+    
     asin: str = Field(..., description="Amazon ASIN", min_length=10, max_length=10)
     title: str = Field(..., description="Product title from Amazon")
     current_price: Optional[Decimal] = Field(None, description="Current price in CAD", ge=0)
@@ -61,9 +92,9 @@ class AmazonProduct(BaseModel):
             raise ValueError('ASIN must be alphanumeric')
         return v.upper()
     
-    def to_affiliate_url(self, partner_tag: str) -> str:
-        """Generate Amazon.ca affiliate URL with partner tag."""
-        return f"https://www.amazon.ca/dp/{self.asin}?tag={partner_tag}"
+    def to_affiliate_url(self, partner_tag: str, marketplace: str = DEFAULT_MARKETPLACE) -> str:
+        """Generate an affiliate URL with partner tag (Amazon.ca unless another marketplace is given)."""
+        return get_marketplace(marketplace).affiliate_url(self.asin, partner_tag)
 
 
 class SavingsGuruPost(BaseModel):
@@ -71,6 +102,8 @@ class SavingsGuruPost(BaseModel):
     Data structure for SavingsGuru.ca post information.
     Used for extracting ASINs and basic deal information.
     """
+    model_config = STORED_MODEL_CONFIG
+    
     post_id: str = Field(..., description="SavingsGuru post ID")
     post_title: str = Field(..., description="Original SavingsGuru post title")
     post_url: HttpUrl = Field(..., description="SavingsGuru post URL")
@@ -86,6 +119,8 @@ class Deal(BaseModel):
     Final deal object for frontend consumption.
     This is the processed and validated deal data ready for the React app.
     """
+    model_config = STORED_MODEL_CONFIG
+    
     id: str = Field(..., description="Unique deal identifier")
     title: str = Field(..., description="Deal title for display")
     image_url: HttpUrl = Field(..., description="Product image URL")
@@ -99,6 +134,7 @@ class Deal(BaseModel):
     date_added: str = Field(..., description="ISO format date when deal was added")
     data_source: DataSource = Field(..., description="Source of the product data")
     asin: str = Field(..., description="Amazon ASIN for reference")
+    brand: Optional[str] = Field(None, description="Product brand, used for search")
     
     @field_validator('id')
     @classmethod
@@ -119,7 +155,8 @@ class Deal(BaseModel):
         cls,
         amazon_product: AmazonProduct,
         partner_tag: str,
-        savingsguru_post: Optional[SavingsGuruPost] = None
+        savingsguru_post: Optional[SavingsGuruPost] = None,
+        marketplace: str = DEFAULT_MARKETPLACE
     ) -> Optional['Deal']:
         """
         Create a Deal from AmazonProduct data.
@@ -152,11 +189,12 @@ class Deal(BaseModel):
                 discount_percent=amazon_product.discount_percent,
                 category=category,
                 description=description,
-                affiliate_url=amazon_product.to_affiliate_url(partner_tag),
+                affiliate_url=amazon_product.to_affiliate_url(partner_tag, marketplace),
                 featured=featured,
                 date_added=datetime.utcnow().isoformat(),
                 data_source=amazon_product.data_source,
-                asin=amazon_product.asin
+                asin=amazon_product.asin,
+                brand=amazon_product.brand
             )
         except Exception:
             # If any validation fails, return None (no fake data)
@@ -193,4 +231,52 @@ class ScrapingSession(BaseModel):
     
     def add_error(self, error: str) -> None:
         """Add an error to the session."""
-        self.errors.append(f"{datetime.utcnow().isoformat()}: {error}")
\ No newline at end of file
+        self.errors.append(f"{datetime.utcnow().isoformat()}: {error}")
+
+
+class NegativeCacheEntry(BaseModel):
+    """Persisted record of repeated lookup failures for a single ASIN."""
+    asin: str = Field(..., description="Amazon ASIN that failed")
+    reason: NegativeReason = Field(..., description="Reason code of the latest failure")
+    failures: int = Field(default=1, description="Consecutive failed lookups", ge=1)
+    first_failed_at: datetime = Field(default_factory=datetime.utcnow)
+    last_failed_at: datetime = Field(default_factory=datetime.utcnow)
+    retry_after: datetime = Field(..., description="Skip network lookups until this time")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def load_stored_models(model: Type[ModelT], raw: Union[str, bytes], label: str = "record") -> List[ModelT]:
+    """
+    Load a JSON array of records this application wrote earlier (deals.json, caches).
+    The whole array is parsed and validated in one pass inside pydantic-core, with no
+    intermediate dicts or per-record Python dispatch. If any record is invalid, falls back
+    to record-by-record validation that skips (and logs) the bad ones.
+    """
+    # Building thousands of models otherwise triggers repeated full collections
+    # that find no garbage; pause the collector for the bulk load.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _list_adapter(model).validate_json(raw)
+    except ValidationError:
+        pass
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    records = json.loads(raw)
+    if not isinstance(records, list):
+        raise ValueError(f"Expected a JSON array of {label}s, got {type(records).__name__}")
+
+    loaded = []
+    for data in records:
+        try:
+            loaded.append(model.model_validate(data))
+        except Exception as e:
+            record_id = data.get('id', data.get('asin', 'unknown')) if isinstance(data, dict) else 'unknown'
+            logger.warning(f"Skipping invalid {label} {record_id}: {e}")
+    return loaded
@@ -0,0 +1,138 @@
+"""
+Multi-marketplace scraping from one process.
+Each marketplace gets its own FocusedScraper (PAAPI client and throttle, HTTP
+client, negative cache and seen sets) and they run concurrently on one event
+loop. SavingsGuru posts are fetched once and shared; output is per locale.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from .settings import Settings, get_settings
+from .models import Deal
+from .focused_scraper import FocusedScraper
+from .marketplaces import get_marketplace, parse_marketplaces, parse_partner_tags
+
+
+def marketplace_settings(settings: Settings, code: str) -> Settings:
+    """
+    Settings for one marketplace.
+    The primary marketplace (settings.amz_marketplace) keeps the configured
+    state directory; every other one gets its own namespace below it.
+    """
+    market = get_marketplace(code)
+    tags = parse_partner_tags(settings.amz_partner_tags)
+    update = {
+        'amz_marketplace': market.code,
+        'amz_partner_tag': tags.get(market.code, settings.amz_partner_tag)
+    }
+    if market.code != settings.amz_marketplace:
+        update['state_dir'] = str(Path(settings.state_dir) / market.slug)
+    return settings.model_copy(update=update)
+
+
+def marketplace_output_file(output_file: str, code: str, primary: str) -> str:
+    """Per-locale output path: the primary keeps `output_file`, others go to `<slug>/<name>` beside it."""
+    market = get_marketplace(code)
+    if market.code == primary:
+        return output_file
+    path = Path(output_file)
+    return str(path.parent / market.slug / path.name)
+
+
+class MultiMarketplaceScraper:
+    """
+    Runs one FocusedScraper per marketplace concurrently.
+    Use as an async context manager so every marketplace's clients are opened and closed together.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, marketplaces: Optional[List[str]] = None):
+        """
+        Args:
+            settings: Base settings (credentials, limits, primary marketplace)
+            marketplaces: Marketplace codes; defaults to settings.amz_marketplaces, then amz_marketplace
+        """
+        self.settings = settings or get_settings()
+        codes = marketplaces or parse_marketplaces(self.settings.amz_marketplaces) or [self.settings.amz_marketplace]
+        self.marketplaces = parse_marketplaces(",".join(codes))
+        self.scrapers: Dict[str, FocusedScraper] = {
+            code: FocusedScraper(marketplace_settings(self.settings, code)) for code in self.marketplaces
+        }
+
+    async def __aenter__(self):
+        for scraper in self.scrapers.values():
+            await scraper.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        for scraper in self.scrapers.values():
+            await scraper.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def scrape_deals(self, max_pages: Optional[int] = None, output_file: str = "deals.json") -> Dict[str, List[Deal]]:
+        """
+        Scrape SavingsGuru once, then build every marketplace's deals concurrently.
+
+        Returns:
+            Deals per marketplace code (empty list for a marketplace that failed)
+        """
+        if max_pages is None:
+            max_pages = self.settings.max_pages_to_scrape
+
+        # Posts are marketplace-independent; only product lookups and links differ
+        first = self.scrapers[self.marketplaces[0]]
+        posts = await first.scrape_savingsguru_posts(max_pages)
+        # Nothing new in the feed is not a failure: every marketplace still manages its deals
+        feed = first.feed_source
+        feed_unchanged = feed is not None and feed.last_source is not None
+        if not posts and not feed_unchanged:
+            logger.warning("No posts found on SavingsGuru - aborting all marketplaces")
+            return {code: [] for code in self.marketplaces}
+
+        results = await asyncio.gather(*(
+            scraper.scrape_deals(
+                output_file=marketplace_output_file(output_file, code, self.settings.amz_marketplace),
+                posts=posts
+            )
+            for code, scraper in self.scrapers.items()
+        ), return_exceptions=True)
+
+        deals_by_marketplace: Dict[str, List[Deal]] = {}
+        for code, result in zip(self.marketplaces, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Marketplace {code} failed: {result}")
+                result = []
+            deals_by_marketplace[code] = result
+            logger.info(f"📊 {code}: {len(result)} deals")
+
+        # The feed cursor only moves once every marketplace has saved the posts' deals
+        if feed and all(
+            not isinstance(result, BaseException) and scraper.deals_saved
+            for scraper, result in zip(self.scrapers.values(), results)
+        ):
+            feed.commit()
+
+        return deals_by_marketplace
+
+
+async def main():
+    """Scrape several marketplaces concurrently."""
+    parser = argparse.ArgumentParser(description='Scrape several Amazon marketplaces concurrently')
+    parser.add_argument('--marketplaces', help='Comma-separated codes, e.g. CA,US,UK (default: AMZ_MARKETPLACES)')
+    parser.add_argument('--max-pages', type=int, default=None, help='SavingsGuru pages to scrape')
+    parser.add_argument('--output', default="deals.json", help='Primary output file; others go to <code>/<name>')
+    args = parser.parse_args()
+
+    marketplaces = parse_marketplaces(args.marketplaces) if args.marketplaces else None
+    async with MultiMarketplaceScraper(marketplaces=marketplaces) as scraper:
+        results = await scraper.scrape_deals(max_pages=args.max_pages, output_file=args.output)
+
+    for code, deals in results.items():
+        print(f"{code}: {len(deals)} deals")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
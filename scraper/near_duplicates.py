@@ -0,0 +1,153 @@
+"""
+Near-duplicate deal detection.
+Titles are normalized (colour, size and pack-count words dropped), signed with
+MinHash and bucketed with LSH, so clustering is linear in the number of deals
+instead of comparing every pair. Each cluster keeps its best-priced deal.
+"""
+
+import hashlib
+import random
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, TypeVar
+
+from .search_index import tokenize
+
+
+T = TypeVar('T')
+
+# Words that distinguish variants of one product rather than different products
+VARIANT_WORDS = frozenset({
+    # Colours
+    "black", "white", "red", "blue", "green", "grey", "gray", "silver", "gold", "pink", "purple",
+    "yellow", "orange", "brown", "beige", "navy", "rose", "midnight", "starlight", "graphite",
+    "charcoal", "teal", "clear", "multicolor", "multicolour", "color", "colour",
+    # Sizes and pack counts
+    "xs", "s", "m", "l", "xl", "xxl", "xxxl", "x", "small", "medium", "large", "size",
+    "pack", "count", "ct", "pcs", "piece", "pieces",
+})
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_title(title: str) -> FrozenSet[str]:
+    """Token set of a title with variant words removed."""
+    return frozenset(token for token in tokenize(title) if token not in VARIANT_WORDS)
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def _token_hash(token: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+class NearDuplicateDetector:
+    """
+    MinHash + LSH clustering of titles.
+    With the default 8 bands of 4 rows, pairs above ~0.6 Jaccard become
+    candidates; candidates are then confirmed with the exact Jaccard score.
+    """
+
+    def __init__(self, threshold: float = 0.7, bands: int = 8, rows: int = 4, max_bucket_probe: int = 8):
+        """
+        Args:
+            threshold: Minimum Jaccard similarity of normalized titles to cluster
+            bands: LSH bands (more bands catch lower similarities)
+            rows: MinHash values per band (more rows are stricter)
+            max_bucket_probe: Members compared per shared bucket, bounding work for huge clusters
+        """
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket_probe = max_bucket_probe
+
+        rng = random.Random(20240611)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+
+    def signature(self, tokens: FrozenSet[str]) -> Tuple[int, ...]:
+        """MinHash signature of a token set."""
+        hashes = [_token_hash(token) for token in tokens]
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+            for a, b in self._permutations
+        )
+
+    def cluster(self, titles: Sequence[str]) -> List[int]:
+        """
+        Cluster titles by near-duplicate similarity.
+
+        Returns:
+            Cluster id per title (the index of the cluster's first title)
+        """
+        token_sets = [normalize_title(title) for title in titles]
+        clusters = _UnionFind(len(titles))
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+        for index, tokens in enumerate(token_sets):
+            if not tokens:
+                continue
+
+            signature = self.signature(tokens)
+            compared = set()
+
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows])
+                members = buckets.setdefault(key, [])
+
+                for other in members[:self.max_bucket_probe]:
+                    if other in compared:
+                        continue
+                    compared.add(other)
+                    if clusters.find(other) != clusters.find(index) and jaccard(tokens, token_sets[other]) >= self.threshold:
+                        clusters.union(index, other)
+
+                members.append(index)
+
+        return [clusters.find(index) for index in range(len(titles))]
+
+    def collapse(
+        self,
+        items: Sequence[T],
+        title: Callable[[T], str],
+        rank: Callable[[T], tuple]
+    ) -> Tuple[List[T], int]:
+        """
+        Keep the best-ranked item of each near-duplicate cluster (lowest rank wins).
+
+        Returns:
+            (kept items in original order, number of items removed)
+        """
+        cluster_ids = self.cluster([title(item) for item in items])
+
+        best: Dict[int, int] = {}
+        for index, cluster_id in enumerate(cluster_ids):
+            current: Optional[int] = best.get(cluster_id)
+            if current is None or rank(items[index]) < rank(items[current]):
+                best[cluster_id] = index
+
+        keep = set(best.values())
+        kept = [item for index, item in enumerate(items) if index in keep]
+        return kept, len(items) - len(kept)
@@ -0,0 +1,159 @@
+"""
+Persistent negative cache for dead or unavailable ASINs.
+Remembers why an ASIN failed and skips it before any network call until its backoff expires.
+"""
+
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from .models import NegativeCacheEntry, NegativeReason, load_stored_models
+from .utils import save_json_file
+
+
+class NegativeCache:
+    """
+    Per-ASIN negative cache with escalating backoff TTLs.
+    Each consecutive failure doubles the skip window, capped at max_ttl_hours.
+    BLOCKED and INVALID windows are fixed instead: blocking describes the upstream,
+    not the ASIN, and a malformed ASIN never becomes valid.
+    """
+
+    # Base skip window per reason code (first failure)
+    BASE_TTL_HOURS = {
+        NegativeReason.BLOCKED: 0.5,      # Blocking is usually about us, not the ASIN
+        NegativeReason.NO_PRICE: 6.0,     # Out of stock items often come back
+        NegativeReason.NOT_FOUND: 24.0,   # Discontinued or removed listings
+        NegativeReason.INVALID: 24.0 * 30  # Malformed ASINs never become valid
+    }
+
+    # Reasons whose window does not grow with repeated failures
+    FIXED_TTL_REASONS = (NegativeReason.BLOCKED, NegativeReason.INVALID)
+
+    # Reasons that describe the listing rather than the upstream's state at lookup time
+    PERMANENT_REASONS = (NegativeReason.NOT_FOUND, NegativeReason.INVALID)
+
+    def __init__(self, cache_file: str, max_ttl_hours: float = 168.0):
+        """Initialize the cache backed by a JSON file."""
+        self.cache_file = Path(cache_file)
+        self.max_ttl_hours = max_ttl_hours
+        self.entries: Dict[str, NegativeCacheEntry] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def load(self) -> int:
+        """Load cached entries from disk. Returns number of entries loaded."""
+        self._loaded = True
+
+        if not self.cache_file.exists():
+            return 0
+
+        try:
+            entries = load_stored_models(NegativeCacheEntry, self.cache_file.read_bytes(), label="negative cache entry")
+        except Exception as e:
+            logger.error(f"Failed to load negative cache {self.cache_file}: {e}")
+            entries = []
+        for entry in entries:
+            self.entries[entry.asin] = entry
+
+        logger.info(f"Loaded {len(self.entries)} negative cache entries from {self.cache_file}")
+        return len(self.entries)
+
+    def _ensure_loaded(self) -> None:
+        """Lazily load the cache on first use."""
+        if not self._loaded:
+            self.load()
+
+    def ttl_for(self, reason: NegativeReason, failures: int) -> timedelta:
+        """Calculate the skip window for a failure count (escalating unless the reason has a fixed window)."""
+        hours = self.BASE_TTL_HOURS[reason]
+        if reason in self.FIXED_TTL_REASONS:
+            return timedelta(hours=hours)
+        # The exponent is bounded so long failure streaks cannot overflow
+        return timedelta(hours=min(hours * 2 ** min(max(failures - 1, 0), 32), self.max_ttl_hours))
+
+    def should_skip(self, asin: str, now: Optional[datetime] = None) -> Optional[NegativeReason]:
+        """Return the cached reason if the ASIN is still inside its backoff window."""
+        self._ensure_loaded()
+
+        entry = self.entries.get(asin)
+        if not entry:
+            return None
+
+        now = now or datetime.utcnow()
+        if now < entry.retry_after:
+            return entry.reason
+
+        return None
+
+    def is_permanent(self, asin: str, now: Optional[datetime] = None) -> bool:
+        """Whether the ASIN is inside a backoff window for a reason that is about the ASIN itself (not found, invalid)."""
+        return self.should_skip(asin, now) in self.PERMANENT_REASONS
+
+    def record(self, asin: str, reason: NegativeReason, now: Optional[datetime] = None) -> NegativeCacheEntry:
+        """Record a failed lookup and extend the ASIN's backoff window."""
+        self._ensure_loaded()
+        now = now or datetime.utcnow()
+
+        entry = self.entries.get(asin)
+        if entry:
+            entry.failures += 1
+            entry.reason = reason
+            entry.last_failed_at = now
+        else:
+            entry = NegativeCacheEntry(
+                asin=asin,
+                reason=reason,
+                first_failed_at=now,
+                last_failed_at=now,
+                retry_after=now
+            )
+            self.entries[asin] = entry
+
+        entry.retry_after = now + self.ttl_for(reason, entry.failures)
+        self._dirty = True
+
+        logger.debug(f"Negative cache: {asin} {reason.value} x{entry.failures}, retry after {entry.retry_after.isoformat()}")
+        return entry
+
+    def clear(self, asin: str) -> None:
+        """Forget an ASIN after a successful lookup."""
+        self._ensure_loaded()
+        if self.entries.pop(asin, None) is not None:
+            self._dirty = True
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop entries whose backoff expired long enough ago to reset escalation."""
+        self._ensure_loaded()
+        now = now or datetime.utcnow()
+        reset_after = timedelta(hours=self.max_ttl_hours)
+
+        expired = [
+            asin for asin, entry in self.entries.items()
+            if now - entry.retry_after > reset_after
+        ]
+        for asin in expired:
+            del self.entries[asin]
+
+        if expired:
+            self._dirty = True
+            logger.info(f"Pruned {len(expired)} expired negative cache entries")
+
+        return len(expired)
+
+    def save(self) -> bool:
+        """Persist the cache to disk if it changed."""
+        if not self._dirty:
+            return True
+
+        self.prune()
+        data = [entry.model_dump(mode='json') for entry in self.entries.values()]
+        success = save_json_file(data, str(self.cache_file))
+        if success:
+            self._dirty = False
+        return success
+
+    def __len__(self) -> int:
+        return len(self.entries)
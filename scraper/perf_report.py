@@ -0,0 +1,130 @@
+"""
+Performance report over recent scrape runs.
+Prints each metric across the last N runs recorded in run_metrics.jsonl and
+how the latest run compares with the median of the runs before it. Exits 1
+when a gated metric regresses past the threshold, so scheduled runs can alert.
+
+Usage:
+    python -m scraper.perf_report --runs 5 --threshold 25 --metric 'seconds.*' --mode pipeline
+"""
+
+import argparse
+import statistics
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .run_metrics import METRICS_FILE_NAME, flatten, higher_is_better, load_runs
+
+
+DEFAULT_GATED_METRICS = ("seconds.*",)
+
+
+def change_pct(baseline: float, latest: float) -> Optional[float]:
+    """Relative change in percent, or None when the baseline is zero."""
+    return (latest - baseline) / baseline * 100 if baseline else None
+
+
+def compare_runs(
+    runs: List[Dict[str, Any]],
+    threshold_pct: float,
+    gated: Sequence[str] = DEFAULT_GATED_METRICS
+) -> Tuple[Dict[str, Tuple[List[Optional[float]], Optional[float]]], List[str]]:
+    """
+    Compare the last run with the median of the ones before it.
+
+    Returns:
+        ({metric: (value per run, change % of the latest)}, gated metrics that regressed
+        by more than threshold_pct - grew, or for hit ratios shrank)
+    """
+    flat = [flatten(run) for run in runs]
+    metrics = sorted({metric for values in flat for metric in values})
+
+    table = {}
+    regressions = []
+    for metric in metrics:
+        values = [values.get(metric) for values in flat]
+        earlier = [value for value in values[:-1] if value is not None]
+        latest = values[-1]
+        change = change_pct(statistics.median(earlier), latest) if earlier and latest is not None else None
+        table[metric] = (values, change)
+
+        if change is None or not any(fnmatch(metric, pattern) for pattern in gated):
+            continue
+        worse = -change if higher_is_better(metric) else change
+        if worse > threshold_pct:
+            regressions.append(metric)
+
+    return table, regressions
+
+
+def format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:,.3f}" if abs(value) < 10 else f"{value:,.1f}"
+    return f"{value:,.0f}"
+
+
+def print_report(runs: List[Dict[str, Any]], table, regressions: List[str], threshold_pct: float) -> None:
+    """Print one row per metric, one column per run, and the latest run's change."""
+    labels = [run.get('started_at', '?')[5:16].replace('T', ' ') for run in runs]
+    width = max(len(metric) for metric in table) if table else 10
+
+    print(f"{'metric':<{width}}  " + "  ".join(f"{label:>12}" for label in labels) + "    change")
+    for metric, (values, change) in table.items():
+        cells = "  ".join(f"{format_value(value):>12}" for value in values)
+        change_text = f"{change:+7.1f}%" if change is not None else "       -"
+        flag = "  <-- regression" if metric in regressions else ""
+        print(f"{metric:<{width}}  {cells}  {change_text}{flag}")
+
+    print()
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed more than {threshold_pct:g}% against the median of earlier runs")
+    else:
+        print(f"No gated metric regressed more than {threshold_pct:g}%")
+
+
+def main():
+    """Print the report; the exit status is 1 if the latest run regressed."""
+    parser = argparse.ArgumentParser(description='Compare performance metrics of recent scrape runs')
+    parser.add_argument('--runs', type=int, default=5, help='Recent runs to show (the last is compared with the rest)')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='Regression threshold in percent (default: PERF_REGRESSION_THRESHOLD_PCT)')
+    parser.add_argument('--metric', action='append', default=None,
+                        help="Metrics that fail the report, as glob patterns (default: 'seconds.*'; repeatable)")
+    parser.add_argument('--marketplace', default=None,
+                        help="Only compare runs of this marketplace (default: the latest run's)")
+    parser.add_argument('--mode', default=None,
+                        help="Only compare runs of this mode, e.g. batch or pipeline (default: the latest run's)")
+    parser.add_argument('--metrics-file', default=None, help=f'Metrics file (default: <state_dir>/{METRICS_FILE_NAME})')
+    args = parser.parse_args()
+
+    from .settings import get_settings
+    settings = get_settings()
+    path = args.metrics_file or str(Path(settings.state_dir) / METRICS_FILE_NAME)
+    threshold = args.threshold if args.threshold is not None else settings.perf_regression_threshold_pct
+
+    runs = load_runs(path)
+    if not runs:
+        print(f"No run metrics recorded in {path}")
+        return 0
+
+    # Batch, pipeline and backfill runs do different work, so only like is compared with like
+    marketplace = args.marketplace or runs[-1].get('marketplace')
+    mode = args.mode or runs[-1].get('mode')
+    runs = [
+        run for run in runs if run.get('marketplace') == marketplace and run.get('mode') == mode
+    ][-max(args.runs, 2):]
+    print(f"Last {len(runs)} {mode} run(s) for marketplace {marketplace} from {path}\n")
+    if len(runs) < 2:
+        print("Need at least two runs to compare")
+        return 0
+
+    table, regressions = compare_runs(runs, threshold, args.metric or DEFAULT_GATED_METRICS)
+    print_report(runs, table, regressions, threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+"""
+Streaming scrape pipeline from SavingsGuru pages to the deal store.
+Stages (page fetch -> post extraction -> ASIN resolve -> deal build -> commit)
+are connected by bounded asyncio queues, so a slow stage applies backpressure
+upstream and memory stays bounded regardless of page count. The commit stage
+saves incrementally, so new deals reach deals.json seconds after they resolve.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from .models import AmazonProduct, Deal, SavingsGuruPost
+from .focused_scraper import FocusedScraper, SAVINGSGURU_URL
+
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class StreamingPipeline:
+    """
+    Runs one streaming scrape on a FocusedScraper's warm clients and deal store.
+    Queue items after extraction are ("asin", asin, post) lookups and ("post", post)
+    markers; a marker follows its post's lookups, so a post is only remembered as
+    processed once everything it produced has been committed.
+    """
+
+    def __init__(
+        self,
+        scraper: FocusedScraper,
+        queue_size: Optional[int] = None,
+        commit_every: Optional[int] = None,
+        commit_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            scraper: Scraper providing clients, caches, deal manager and exporter
+            queue_size: Capacity of each inter-stage queue
+            commit_every: Commit once this many new deals are waiting
+            commit_interval: Commit waiting deals at least this often (seconds)
+        """
+        settings = scraper.settings
+        self.scraper = scraper
+        self.queue_size = queue_size or settings.pipeline_queue_size
+        self.commit_every = commit_every or settings.pipeline_commit_every
+        self.commit_interval = commit_interval or settings.pipeline_commit_interval_seconds
+        self.resolve_batch = settings.checkpoint_batch_size
+
+        self.final_deals: List[Deal] = []
+        self.resolved: Dict[str, AmazonProduct] = {}
+        self.commits = 0
+        self.first_commit_seconds: Optional[float] = None
+        self._started = 0.0
+
+    async def run(self, max_pages: int, output_path: str) -> List[Deal]:
+        """Stream `max_pages` SavingsGuru pages into `output_path`. Returns the last committed deal set."""
+        self._started = time.monotonic()
+        pages: asyncio.Queue = asyncio.Queue(self.queue_size)
+        lookups: asyncio.Queue = asyncio.Queue(self.queue_size)
+        built: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        stages = [
+            asyncio.create_task(self._fetch_pages(max_pages, pages), name="fetch"),
+            asyncio.create_task(self._extract_posts(pages, lookups), name="extract"),
+            asyncio.create_task(self._resolve_and_build(lookups, built), name="resolve"),
+            asyncio.create_task(self._commit(built, output_path), name="commit"),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+
+        self.scraper.remember_products(self.resolved)
+        self.scraper.stats['pipeline_commits'] = self.commits
+        if self.first_commit_seconds is not None:
+            self.scraper.stats['first_commit_seconds'] = round(self.first_commit_seconds, 2)
+        return self.final_deals
+
+    async def _fetch_pages(self, max_pages: int, out: asyncio.Queue) -> None:
+        # Reuse the warm client when the scraper runs inside its context manager
+        client = self.scraper.page_client or httpx.AsyncClient(timeout=30.0)
+        try:
+            await self._fetch_pages_with(client, max_pages, out)
+        finally:
+            if client is not self.scraper.page_client:
+                await client.aclose()
+
+    async def _fetch_pages_with(self, client, max_pages: int, out: asyncio.Queue) -> None:
+        for page in range(1, max_pages + 1):
+            url = f"{SAVINGSGURU_URL}/page/{page}" if page > 1 else SAVINGSGURU_URL
+            try:
+                logger.info(f"Scraping SavingsGuru page {page}: {url}")
+                response = await self.scraper.fetch_page(client, url)
+                if response.status_code != 200:
+                    logger.warning(f"Failed to fetch page {page}: {response.status_code}")
+                    continue
+                # Blocks while extraction is behind (backpressure)
+                await out.put(response.content)
+            except Exception as e:
+                logger.error(f"Error scraping page {page}: {e}")
+                continue
+
+            # Politeness delay between page requests
+            await asyncio.sleep(2)
+
+        await out.put(_DONE)
+
+    async def _extract_posts(self, pages: asyncio.Queue, out: asyncio.Queue) -> None:
+        queued: Set[str] = set()
+        while (content := await pages.get()) is not _DONE:
+            soup = BeautifulSoup(content, 'html.parser')
+            posts = self.scraper._extract_posts_from_page(soup, SAVINGSGURU_URL)
+            soup.decompose()
+
+            self.scraper.stats['posts_scraped'] += len(posts)
+            if self.scraper.settings.skip_seen_posts:
+                posts = self.scraper.filter_unseen_posts(posts)
+
+            for post in posts:
+                for asin in post.extracted_asins:
+                    if asin not in queued:
+                        queued.add(asin)
+                        await out.put(("asin", asin, post))
+                await out.put(("post", post))
+
+        await out.put(_DONE)
+
+    async def _resolve_and_build(self, lookups: asyncio.Queue, out: asyncio.Queue) -> None:
+        finished = False
+        while not finished:
+            # Take what is ready, up to one batch, stopping at a post marker to keep ordering
+            batch: List[Tuple[str, SavingsGuruPost]] = []
+            marker: Any = None
+            item = await lookups.get()
+            while True:
+                if item is _DONE:
+                    finished = True
+                    break
+                if item[0] == "post":
+                    marker = item
+                    break
+                batch.append((item[1], item[2]))
+                if len(batch) >= self.resolve_batch or lookups.empty():
+                    break
+                item = lookups.get_nowait()
+
+            if batch:
+                with self.scraper.metrics.stage('resolve_products'):
+                    asins = [asin for asin, _ in batch]
+                    products = self.scraper.fresh_snapshot_products(asins)
+                    missing = [asin for asin in asins if asin not in products]
+                    if missing:
+                        products.update(await self.scraper.get_real_product_data(missing))
+                self.resolved.update((asin, product) for asin, product in products.items() if product)
+                for asin, post in batch:
+                    product = products.get(asin)
+                    if not product:
+                        continue
+                    deals = self.scraper.create_deals_from_products({asin: product}, [post])
+                    for deal in deals:
+                        await out.put(("deal", deal))
+
+            if marker is not None:
+                await out.put(marker)
+
+        await out.put(_DONE)
+
+    async def _commit(self, built: asyncio.Queue, output_path: str) -> None:
+        waiting_deals: List[Deal] = []
+        waiting_posts: List[SavingsGuruPost] = []
+        last_commit = time.monotonic()
+        finished = False
+
+        while not finished:
+            timeout = max(0.0, self.commit_interval - (time.monotonic() - last_commit))
+            try:
+                item = await asyncio.wait_for(built.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _DONE:
+                finished = True
+            elif item is not None:
+                if item[0] == "deal":
+                    waiting_deals.append(item[1])
+                else:
+                    waiting_posts.append(item[1])
+
+            due = len(waiting_deals) >= self.commit_every or time.monotonic() - last_commit >= self.commit_interval
+            if (waiting_deals or waiting_posts) and (due or finished):
+                # A failed save keeps everything waiting for the next attempt
+                if await self._commit_once(waiting_deals, waiting_posts, output_path):
+                    waiting_deals, waiting_posts = [], []
+                last_commit = time.monotonic()
+            elif due:
+                last_commit = time.monotonic()
+
+        if not self.commits:
+            # Nothing new: still run existing deals through freshness and count management
+            await self._commit_once([], [], output_path)
+
+    async def _commit_once(self, deals: List[Deal], posts: List[SavingsGuruPost], output_path: str) -> bool:
+        """Save waiting deals and remember their posts. Returns whether the save succeeded."""
+        with self.scraper.metrics.stage('commit'):
+            final_deals, success = await self.scraper.commit_deals(deals, output_path)
+        if not success:
+            return False
+
+        self.final_deals = final_deals
+        self.commits += 1
+        if posts:
+            self.scraper.remember_processed_posts(posts, self.resolved)
+        if deals and self.first_commit_seconds is None:
+            self.first_commit_seconds = time.monotonic() - self._started
+            logger.info(f"First new deals committed after {self.first_commit_seconds:.1f}s")
+        return True
@@ -0,0 +1,208 @@
+"""
+On-disk ASIN -> post map for very large SavingsGuru crawls.
+Posts (and the products resolved for them) are written to a SQLite file as
+they arrive and read back in batches, so a crawl of hundreds of pages never
+holds every post, ASIN list, post lookup or product in memory at once. A
+durable store also records which pages were fetched and which ASINs resolved,
+so an interrupted backfill resumes where it stopped.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import AmazonProduct, SavingsGuruPost
+from .snapshot import epoch
+
+
+# Page statuses: fetched, past the end of its archive (404), or failed (retried on resume)
+PAGE_DONE = "done"
+PAGE_END = "end"
+PAGE_FAILED = "failed"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_url TEXT NOT NULL UNIQUE,
+    post TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS asins (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    asin TEXT NOT NULL UNIQUE,
+    post_url TEXT NOT NULL,
+    resolved INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    posts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    asin TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    product BLOB NOT NULL
+);
+"""
+
+
+class PostStore:
+    """
+    Crawled posts (deduplicated by URL), the ASINs they link to and the products resolved for them.
+    ASINs keep the order they were first seen in; an ASIN linked from several
+    posts maps to the latest one, as the in-memory post lookup does.
+    """
+
+    def __init__(self, db_path: str, scratch: bool = True, cache_kib: int = 2048):
+        """
+        Open the store. A scratch store starts empty (replacing a leftover file from an
+        interrupted crawl) and skips journaling; a durable one keeps its contents and
+        survives crashes.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.scratch = scratch
+        if scratch:
+            self.db_path.unlink(missing_ok=True)
+
+        # Autocommit mode with explicit transactions; a small page cache keeps memory flat
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+        if scratch:
+            self._conn.execute("PRAGMA journal_mode=OFF")
+            self._conn.execute("PRAGMA synchronous=OFF")
+        else:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size=-{cache_kib}")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, posts: Iterable[SavingsGuruPost]) -> int:
+        """Store posts and map their ASINs to them. Returns the number of ASINs not seen before."""
+        return self.record_page(None, posts)
+
+    def record_page(self, url: Optional[str], posts: Iterable[SavingsGuruPost], status: str = PAGE_DONE) -> int:
+        """
+        Store a page's posts and its status in one transaction, so an interrupted
+        crawl never marks a page done without its posts. Returns the number of new ASINs.
+        """
+        before = self.count_asins()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored = 0
+            for post in posts:
+                self._conn.execute(
+                    "INSERT INTO posts (post_url, post) VALUES (?, ?) "
+                    "ON CONFLICT(post_url) DO UPDATE SET post = excluded.post",
+                    (str(post.post_url), post.model_dump_json())
+                )
+                self._conn.executemany(
+                    "INSERT INTO asins (asin, post_url) VALUES (?, ?) "
+                    "ON CONFLICT(asin) DO UPDATE SET post_url = excluded.post_url",
+                    ((asin, str(post.post_url)) for asin in post.extracted_asins)
+                )
+                stored += 1
+            if url is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, status, posts, updated_at) VALUES (?, ?, ?, ?)",
+                    (url, status, stored, time.time())
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self.count_asins() - before
+
+    def page_statuses(self) -> Dict[str, str]:
+        """Status of every page recorded so far, by URL."""
+        return dict(self._conn.execute("SELECT url, status FROM pages"))
+
+    def asin_batches(self, size: int) -> Iterator[List[str]]:
+        """ASINs not yet marked resolved, in first-seen order, `size` at a time."""
+        last = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT seq, asin FROM asins WHERE seq > ? AND resolved = 0 ORDER BY seq LIMIT ?",
+                (last, max(1, size))
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield [asin for _, asin in rows]
+
+    def posts_for(self, asins: Iterable[str]) -> Dict[str, SavingsGuruPost]:
+        """The post each of `asins` maps to (ASINs not in the store are left out)."""
+        asins = list(asins)
+        if not asins:
+            return {}
+        placeholders = ",".join("?" * len(asins))
+        rows = self._conn.execute(
+            f"SELECT a.asin, p.post FROM asins a JOIN posts p ON p.post_url = a.post_url "
+            f"WHERE a.asin IN ({placeholders})",
+            asins
+        )
+        return {asin: SavingsGuruPost.model_validate_json(post) for asin, post in rows}
+
+    def post_batches(self, size: int) -> Iterator[List[SavingsGuruPost]]:
+        """Every stored post in crawl order, `size` at a time."""
+        last = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT seq, post FROM posts WHERE seq > ? ORDER BY seq LIMIT ?", (last, max(1, size))
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield [SavingsGuruPost.model_validate_json(post) for _, post in rows]
+
+    def add_products(self, products: Dict[str, Optional[AmazonProduct]]) -> None:
+        """Keep resolved products (misses are skipped) for a single snapshot update at the end of the crawl."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO products (asin, updated_at, product) VALUES (?, ?, ?)",
+            (
+                (product.asin, epoch(product.retrieved_at), product.model_dump_json().encode())
+                for product in products.values() if product
+            )
+        )
+
+    def product_asins(self, asins: Iterable[str]) -> Set[str]:
+        """Those of `asins` with a resolved product in the store."""
+        asins = list(asins)
+        if not asins:
+            return set()
+        placeholders = ",".join("?" * len(asins))
+        rows = self._conn.execute(f"SELECT asin FROM products WHERE asin IN ({placeholders})", asins)
+        return {asin for asin, in rows}
+
+    def mark_resolved(self, asins: Iterable[str]) -> None:
+        """Take ASINs whose deals were committed out of asin_batches."""
+        self._conn.executemany("UPDATE asins SET resolved = 1 WHERE asin = ?", ((asin,) for asin in asins))
+
+    def product_records(self) -> Iterator[Tuple[str, float, bytes]]:
+        """Stored products as (asin, updated_at, JSON payload) snapshot records."""
+        yield from self._conn.execute("SELECT asin, updated_at, product FROM products ORDER BY asin")
+
+    def post_for(self, asin: str) -> Optional[SavingsGuruPost]:
+        return self.posts_for([asin]).get(asin)
+
+    def count_posts(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def count_asins(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM asins").fetchone()[0]
+
+    def count_unresolved(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM asins WHERE resolved = 0").fetchone()[0]
+
+    def count_products(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def close(self, delete: Optional[bool] = None) -> None:
+        """Close the database, removing its files if `delete` (by default, when it is a scratch store)."""
+        self._conn.close()
+        if delete is None:
+            delete = self.scratch
+        if delete:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
@@ -0,0 +1,549 @@
+"""
+Read-only deals query API over the persisted deal store.
+Small asyncio HTTP/1.1 service with in-memory sorted indexes, keyset pagination,
+full-text search and ETag/304 support. Indexes are patched incrementally from the exporter's
+delta files whenever the scraper commits a new version.
+"""
+
+import asyncio
+import argparse
+import base64
+import bisect
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from loguru import logger
+
+from .settings import get_settings
+from .deal_export import MANIFEST_NAME, content_hash
+from .search_index import SEARCH_INDEX_NAME, SearchIndex, build_search_index
+
+
+SortKey = Tuple[Any, ...]
+
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 24
+RESPONSE_CACHE_SIZE = 2048
+
+
+def _field(deal: Dict[str, Any], snake: str, camel: str, default: Any = None) -> Any:
+    """Read a field from either the snake_case or camelCase deal schema."""
+    value = deal.get(snake)
+    if value is None:
+        value = deal.get(camel, default)
+    return default if value is None else value
+
+
+def _timestamp(deal: Dict[str, Any]) -> float:
+    value = _field(deal, 'date_added', 'dateAdded', '')
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+# Sort name -> key function. Keys end with the deal id so they are unique and totally ordered.
+SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], SortKey]] = {
+    'discount': lambda d: (-int(_field(d, 'discount_percent', 'discountPercent', 0)), d['id']),
+    'price': lambda d: (float(_field(d, 'price', 'price', 0.0)), d['id']),
+    'newest': lambda d: (-_timestamp(d), d['id']),
+}
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Sort key of a cursor made by encode_cursor; ValueError for anything else."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    # Every sort key is (number, deal id); anything else would not compare with the index keys
+    if not (
+        isinstance(key, list) and len(key) == 2
+        and isinstance(key[0], (int, float)) and not isinstance(key[0], bool)
+        and isinstance(key[1], str)
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+class DealIndex:
+    """
+    In-memory deal store with one sorted key list per (sort, category).
+    Supports incremental upsert/remove so delta commits avoid full rebuilds.
+    """
+
+    def __init__(self):
+        self.deals: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.content_tag = "empty"
+        self.generation = 0
+        self.search_index: Optional[SearchIndex] = None
+        # sort -> category (None = all) -> sorted keys
+        self._sorted: Dict[str, Dict[Optional[str], List[SortKey]]] = {name: {None: []} for name in SORT_KEYS}
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def load(self, deals: List[Dict[str, Any]], version: int = 0, content_tag: Optional[str] = None) -> None:
+        """Replace the whole index (full rebuild)."""
+        self.deals = {deal['id']: deal for deal in deals}
+        self._sorted = {name: {None: []} for name in SORT_KEYS}
+
+        for name, key_func in SORT_KEYS.items():
+            buckets = self._sorted[name]
+            for deal in self.deals.values():
+                key = key_func(deal)
+                buckets[None].append(key)
+                buckets.setdefault(deal.get('category'), []).append(key)
+            for keys in buckets.values():
+                keys.sort()
+
+        self._mark_changed(version, content_tag or content_hash(deals)[:16])
+
+    def upsert(self, deal: Dict[str, Any]) -> None:
+        """Insert or replace one deal, keeping every sorted list ordered."""
+        if deal['id'] in self.deals:
+            self.remove(deal['id'])
+
+        self.deals[deal['id']] = deal
+        for name, key_func in SORT_KEYS.items():
+            key = key_func(deal)
+            buckets = self._sorted[name]
+            bisect.insort(buckets[None], key)
+            bisect.insort(buckets.setdefault(deal.get('category'), []), key)
+
+    def remove(self, deal_id: str) -> None:
+        """Remove one deal from the index if present."""
+        deal = self.deals.pop(deal_id, None)
+        if deal is None:
+            return
+
+        for name, key_func in SORT_KEYS.items():
+            key = key_func(deal)
+            buckets = self._sorted[name]
+            for bucket in (buckets[None], buckets.get(deal.get('category'), [])):
+                position = bisect.bisect_left(bucket, key)
+                if position < len(bucket) and bucket[position] == key:
+                    del bucket[position]
+
+    def apply_delta(self, delta: Dict[str, Any], version: int, content_tag: str) -> None:
+        """Patch the index with an exporter delta (see deal_export.compute_delta)."""
+        for deal_id in delta.get('removed', []):
+            self.remove(deal_id)
+
+        for deal_id, fields in delta.get('changed', {}).items():
+            if deal_id in self.deals:
+                self.upsert({**self.deals[deal_id], **fields})
+
+        for deal in delta.get('added', []):
+            self.upsert(deal)
+
+        self._mark_changed(version, content_tag)
+
+    def _mark_changed(self, version: int, content_tag: str) -> None:
+        self.version = version
+        self.content_tag = content_tag
+        self.generation += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def categories(self) -> List[Dict[str, Any]]:
+        """Category names with deal counts."""
+        buckets = self._sorted['discount']
+        return [
+            {'name': name, 'count': len(keys)}
+            for name, keys in sorted(buckets.items(), key=lambda item: str(item[0]))
+            if name is not None and keys
+        ]
+
+    def search(self, text: str, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Full-text search ranked by BM25; the last word matches as a prefix."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        hits = self.search_index.search(text, limit=limit) if self.search_index else []
+        return {
+            'deals': [
+                {**self.deals[deal_id], 'score': round(score, 4)}
+                for deal_id, score in hits
+                if deal_id in self.deals
+            ],
+            'version': self.version
+        }
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        min_discount: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: str = 'discount',
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Filter and page through deals using keyset pagination.
+
+        Returns:
+            Dict with `deals`, `nextCursor` (None on the last page) and `version`
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort: {sort}. Must be one of {list(SORT_KEYS)}")
+
+        keys = self._sorted[sort].get(category, []) if category else self._sorted[sort][None]
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        start = bisect.bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+
+        # Use the sort order to skip straight past out-of-range entries
+        if sort == 'price' and min_price is not None:
+            start = max(start, bisect.bisect_left(keys, (min_price,)))
+
+        results: List[Dict[str, Any]] = []
+        last_key: Optional[SortKey] = None
+        has_more = False
+
+        for position in range(start, len(keys)):
+            key = keys[position]
+
+            if sort == 'discount' and min_discount is not None and -key[0] < min_discount:
+                break
+            if sort == 'price' and max_price is not None and key[0] > max_price:
+                break
+
+            deal = self.deals[key[-1]]
+            if not self._matches(deal, min_discount, min_price, max_price):
+                continue
+
+            if len(results) == limit:
+                has_more = True
+                break
+
+            results.append(deal)
+            last_key = key
+
+        return {
+            'deals': results,
+            'nextCursor': encode_cursor(last_key) if has_more and last_key else None,
+            'version': self.version
+        }
+
+    @staticmethod
+    def _matches(
+        deal: Dict[str, Any],
+        min_discount: Optional[int],
+        min_price: Optional[float],
+        max_price: Optional[float]
+    ) -> bool:
+        if min_discount is not None and (_field(deal, 'discount_percent', 'discountPercent', 0)) < min_discount:
+            return False
+        price = _field(deal, 'price', 'price', 0.0)
+        if min_price is not None and price < min_price:
+            return False
+        if max_price is not None and price > max_price:
+            return False
+        return True
+
+
+class DealStoreWatcher:
+    """
+    Keeps a DealIndex in sync with the exported deal store.
+    Applies delta files when the manifest chain allows, otherwise reloads the full file.
+    """
+
+    def __init__(self, index: DealIndex, deals_file: str):
+        self.index = index
+        self.deals_file = Path(deals_file)
+        self.manifest_file = self.deals_file.parent / MANIFEST_NAME
+        self._last_signature: Optional[Tuple[int, int]] = None
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        path = self.manifest_file if self.manifest_file.exists() else self.deals_file
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_json(self, path: Path) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def refresh(self) -> bool:
+        """Bring the index up to date. Returns True if it changed."""
+        signature = self._signature()
+        if signature is None or signature == self._last_signature:
+            return False
+
+        manifest = self._read_json(self.manifest_file) if self.manifest_file.exists() else None
+
+        if manifest and manifest.get('version') == self.index.version and self.index.version:
+            self._last_signature = signature
+            return False
+
+        if not (manifest and self.index.version and self._apply_deltas(manifest)):
+            deals = self._read_json(self.deals_file)
+            version = manifest.get('version', 0) if manifest else 0
+            tag = (manifest.get('sha256') or '')[:16] if manifest else None
+            self.index.load(deals, version=version, content_tag=tag or None)
+            logger.info(f"Query index rebuilt: {len(deals)} deals (version {version})")
+
+        self._reload_search_index()
+        # Only now: a read that failed on a half-written file is retried on the next poll
+        self._last_signature = signature
+        return True
+
+    def _reload_search_index(self) -> None:
+        """Map the exported search index, or build one in memory if the export has none."""
+        search_file = self.deals_file.parent / SEARCH_INDEX_NAME
+        previous = self.index.search_index
+
+        try:
+            self.index.search_index = SearchIndex.open(search_file)
+        except (OSError, ValueError):
+            self.index.search_index = SearchIndex(build_search_index(self.index.deals.values()))
+
+        if previous is not None:
+            previous.close()
+
+    def _apply_deltas(self, manifest: Dict[str, Any]) -> bool:
+        """Apply the chain of deltas from the index version to the manifest version."""
+        if manifest.get('version', 0) <= self.index.version:
+            return False
+
+        chain = {entry['from']: entry for entry in manifest.get('deltas', [])}
+        version = self.index.version
+        steps = []
+
+        while version < manifest['version']:
+            entry = chain.get(version)
+            if entry is None:
+                return False
+            steps.append(entry)
+            version = entry['to']
+
+        try:
+            for entry in steps:
+                delta = self._read_json(self.deals_file.parent / entry['path'])
+                tag = manifest['sha256'][:16] if entry['to'] == manifest['version'] else f"v{entry['to']}"
+                self.index.apply_delta(delta, version=entry['to'], content_tag=tag)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Delta apply failed ({e}) - falling back to full reload")
+            return False
+
+        logger.info(f"Query index patched to version {manifest['version']} with {len(steps)} deltas")
+        return True
+
+    async def watch(self, poll_seconds: float, stop_event: asyncio.Event) -> None:
+        """Poll for new committed versions until stopped."""
+        while not stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh query index: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+class DealQueryServer:
+    """
+    Minimal HTTP/1.1 server (keep-alive, GET only) answering deal queries.
+
+    Routes:
+        GET /deals?category=&min_discount=&min_price=&max_price=&sort=&limit=&cursor=
+        GET /deals/<id>
+        GET /search?q=&limit=
+        GET /categories
+        GET /health
+    """
+
+    def __init__(self, index: DealIndex):
+        self.index = index
+        self._cache: Dict[str, bytes] = {}
+        self._cache_generation = -1
+        self.stats = {'requests': 0, 'not_modified': 0, 'cache_hits': 0}
+
+    def _etag(self, target: str) -> str:
+        return f'"{self.index.content_tag}-{zlib.crc32(target.encode()):08x}"'
+
+    def handle(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        """Route one request. Returns (status, body, extra headers)."""
+        self.stats['requests'] += 1
+
+        if method not in ('GET', 'HEAD'):
+            return 405, b'{"error":"method not allowed"}', {'Allow': 'GET, HEAD'}
+
+        if target == '/health':
+            return 200, b'{"status":"ok"}', {}
+
+        etag = self._etag(target)
+        if headers.get('if-none-match') == etag:
+            self.stats['not_modified'] += 1
+            return 304, b'', {'ETag': etag}
+
+        if self._cache_generation != self.index.generation:
+            self._cache.clear()
+            self._cache_generation = self.index.generation
+
+        body = self._cache.get(target)
+        if body is not None:
+            self.stats['cache_hits'] += 1
+            return 200, body, {'ETag': etag}
+
+        try:
+            status, payload = self._route(target)
+        except ValueError as e:
+            return 400, json.dumps({'error': str(e)}).encode(), {}
+
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if status == 200:
+            if len(self._cache) >= RESPONSE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[target] = body
+            return status, body, {'ETag': etag}
+        return status, body, {}
+
+    def _route(self, target: str) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if path == '/deals':
+            return 200, self.index.query(
+                category=params.get('category'),
+                min_discount=int(params['min_discount']) if 'min_discount' in params else None,
+                min_price=float(params['min_price']) if 'min_price' in params else None,
+                max_price=float(params['max_price']) if 'max_price' in params else None,
+                sort=params.get('sort', 'discount'),
+                limit=int(params.get('limit', DEFAULT_PAGE_SIZE)),
+                cursor=params.get('cursor')
+            )
+
+        if path.startswith('/deals/'):
+            deal = self.index.deals.get(path[len('/deals/'):])
+            if deal is None:
+                return 404, {'error': 'deal not found'}
+            return 200, deal
+
+        if path == '/search':
+            return 200, self.index.search(params.get('q', ''), limit=int(params.get('limit', DEFAULT_PAGE_SIZE)))
+
+        if path == '/categories':
+            return 200, {'categories': self.index.categories(), 'version': self.index.version}
+
+        return 404, {'error': 'not found'}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                # Discard any request body; this API is read-only
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                status, body, extra = self.handle(method, target, headers)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                response_headers = {
+                    'Content-Type': 'application/json; charset=utf-8',
+                    'Content-Length': str(len(body)),
+                    'Cache-Control': 'public, max-age=60',
+                    'Connection': 'keep-alive' if keep_alive else 'close',
+                    **extra
+                }
+                head_lines = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}"]
+                head_lines.extend(f"{name}: {value}" for name, value in response_headers.items())
+                writer.write(('\r\n'.join(head_lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+HTTP_REASONS = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+}
+
+
+async def serve(
+    deals_file: str = "public/deals.json",
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    poll_seconds: float = 5.0,
+    stop_event: Optional[asyncio.Event] = None
+) -> None:
+    """Load the deal store, start watching it and serve queries until stopped."""
+    stop_event = stop_event or asyncio.Event()
+
+    index = DealIndex()
+    watcher = DealStoreWatcher(index, deals_file)
+    watcher.refresh()
+
+    server = DealQueryServer(index)
+    http_server = await asyncio.start_server(server.handle_connection, host, port)
+    watch_task = asyncio.create_task(watcher.watch(poll_seconds, stop_event))
+
+    logger.info(f"Deals query API listening on http://{host}:{port} ({len(index.deals)} deals)")
+
+    async with http_server:
+        await stop_event.wait()
+
+    await watch_task
+
+
+def main():
+    """Command line entry point for the query API."""
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='Serve read-only deal queries over the deal store')
+    parser.add_argument('--deals', default='public/deals.json', help='Path to the exported deals file')
+    parser.add_argument('--host', default=settings.query_api_host, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=settings.query_api_port, help='Port to listen on')
+    parser.add_argument('--poll', type=float, default=settings.query_api_poll_seconds, help='Seconds between deal store checks')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.deals, args.host, args.port, args.poll))
+    except KeyboardInterrupt:
+        logger.info("Query API stopped")
+
+
+if __name__ == "__main__":
+    main()
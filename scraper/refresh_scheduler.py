@@ -0,0 +1,317 @@
+"""
+Priority-ordered refresh scheduler for tracked ASINs.
+Hot deals (volatile prices, big discounts, featured) refresh every few minutes,
+stale ones rarely, all within the PAAPI/scraping quota budget.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from .models import AmazonProduct, Deal, load_stored_models
+from .settings import Settings
+from .snapshot import KIND_PRICE_HISTORY, SNAPSHOT_NAME, update_snapshot
+from .utils import save_json_file
+
+
+class RefreshTarget(BaseModel):
+    """Scheduling state for one tracked ASIN."""
+    asin: str = Field(..., description="Amazon ASIN to refresh")
+    discount_percent: int = Field(default=0, description="Latest known discount percentage")
+    featured: bool = Field(default=False, description="Whether the deal is featured")
+    first_seen: float = Field(default_factory=time.time, description="Epoch seconds when first tracked")
+    last_refreshed: Optional[float] = Field(None, description="Epoch seconds of the last refresh")
+    next_due: float = Field(default_factory=time.time, description="Epoch seconds when the next refresh is due")
+    prices: List[Tuple[float, float]] = Field(default_factory=list, description="Recent (epoch, price) observations")
+
+
+class QuotaBudget:
+    """
+    Token bucket limiting refreshes to a per-hour quota.
+    Allows short bursts up to `burst` tokens.
+    """
+
+    def __init__(self, per_hour: float, burst: int = 10, clock: Callable[[], float] = time.monotonic):
+        """Initialize the bucket full."""
+        self.rate = per_hour / 3600.0
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while not self.try_acquire():
+            wait = (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+            await asyncio.sleep(min(wait, 60.0))
+
+
+class RefreshScheduler:
+    """
+    Min-heap of ASINs keyed by next-due time.
+    Per-ASIN intervals shrink with price volatility, discount size and
+    featured status, and grow with deal age.
+    """
+
+    MAX_PRICE_OBSERVATIONS = 20
+
+    def __init__(
+        self,
+        settings: Settings,
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Optional[AmazonProduct]]]],
+        on_refresh: Optional[Callable[[str, Optional[AmazonProduct]], None]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            settings: Application settings
+            fetch: Product lookup, normally FocusedScraper.get_real_product_data
+            on_refresh: Optional callback invoked with each refreshed product
+            clock: Wall-clock source (epoch seconds)
+        """
+        self.settings = settings
+        self.fetch = fetch
+        self.on_refresh = on_refresh
+        self._clock = clock
+
+        self.targets: Dict[str, RefreshTarget] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+
+        self.budget = QuotaBudget(settings.refresh_quota_per_hour)
+        self.state_file = Path(settings.state_dir) / "refresh_state.json"
+
+        self.stats = {
+            'refreshes': 0,
+            'price_changes': 0,
+            'failures': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Tracking
+    # ------------------------------------------------------------------
+
+    def track(self, asin: str, discount_percent: Optional[int] = None, featured: bool = False) -> RefreshTarget:
+        """Start tracking an ASIN, or update its deal attributes if already tracked."""
+        target = self.targets.get(asin)
+        if target is None:
+            target = RefreshTarget(asin=asin, first_seen=self._clock(), next_due=self._clock())
+            self.targets[asin] = target
+            self._push(target)
+
+        target.discount_percent = discount_percent or 0
+        target.featured = featured
+        return target
+
+    def track_deals(self, deals: List[Deal]) -> int:
+        """Track every ASIN in a deal list. Returns the number of tracked ASINs."""
+        for deal in deals:
+            self.track(deal.asin, deal.discount_percent, deal.featured)
+        return len(self.targets)
+
+    def untrack(self, asin: str) -> None:
+        """Stop refreshing an ASIN. Stale heap entries are skipped lazily."""
+        self.targets.pop(asin, None)
+
+    def _push(self, target: RefreshTarget) -> None:
+        heapq.heappush(self._heap, (target.next_due, next(self._counter), target.asin))
+
+    # ------------------------------------------------------------------
+    # Interval computation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def price_change_rate(prices: List[Tuple[float, float]]) -> float:
+        """Fraction of consecutive observations where the price moved (0.0 - 1.0)."""
+        if len(prices) < 2:
+            return 0.0
+
+        changes = sum(
+            1 for (_, previous), (_, current) in zip(prices, prices[1:])
+            if abs(current - previous) >= 0.01
+        )
+        return changes / (len(prices) - 1)
+
+    def compute_interval(self, target: RefreshTarget) -> float:
+        """Calculate the refresh interval for a target in seconds."""
+        interval = self.settings.refresh_base_interval_minutes * 60
+
+        # Volatile prices: up to 5x faster
+        interval /= 1 + 4 * self.price_change_rate(target.prices)
+
+        # Big discounts matter more to visitors: 50% off refreshes 3x faster
+        interval /= 1 + max(target.discount_percent, 0) / 25
+
+        # Featured deals are on the front page
+        if target.featured:
+            interval /= 2
+
+        # Older deals drift toward rare refreshes (one more base interval per day tracked)
+        age_days = max(self._clock() - target.first_seen, 0) / 86400
+        interval *= 1 + age_days
+
+        minimum = self.settings.refresh_min_interval_minutes * 60
+        maximum = self.settings.refresh_max_interval_hours * 3600
+        return max(minimum, min(interval, maximum))
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next target is due (0 if overdue), or None if idle."""
+        while self._heap:
+            due, _, asin = self._heap[0]
+            target = self.targets.get(asin)
+            if target is None or target.next_due != due:
+                heapq.heappop(self._heap)  # Untracked or rescheduled
+                continue
+            return max(due - self._clock(), 0.0)
+        return None
+
+    def pop_due(self) -> Optional[RefreshTarget]:
+        """Pop the most overdue target, or None if nothing is due yet."""
+        wait = self.next_due_in()
+        if wait is None or wait > 0:
+            return None
+
+        _, _, asin = heapq.heappop(self._heap)
+        return self.targets[asin]
+
+    def record_result(self, target: RefreshTarget, product: Optional[AmazonProduct]) -> None:
+        """Record a refresh outcome and reschedule the target."""
+        now = self._clock()
+        target.last_refreshed = now
+
+        if product and product.current_price:
+            price = float(product.current_price)
+            if target.prices and abs(target.prices[-1][1] - price) >= 0.01:
+                self.stats['price_changes'] += 1
+            target.prices.append((now, price))
+            del target.prices[:-self.MAX_PRICE_OBSERVATIONS]
+
+            if product.discount_percent is not None:
+                target.discount_percent = product.discount_percent
+        else:
+            self.stats['failures'] += 1
+
+        target.next_due = now + self.compute_interval(target)
+        self._push(target)
+
+    async def refresh_next(self) -> Optional[str]:
+        """Refresh the most overdue ASIN if one is due and quota allows. Returns the ASIN refreshed."""
+        target = self.pop_due()
+        if target is None:
+            return None
+
+        await self.budget.acquire()
+
+        try:
+            results = await self.fetch([target.asin])
+            product = results.get(target.asin)
+        except Exception as e:
+            logger.warning(f"Refresh failed for {target.asin}: {e}")
+            product = None
+
+        self.record_result(target, product)
+        self.stats['refreshes'] += 1
+
+        if self.on_refresh:
+            self.on_refresh(target.asin, product)
+
+        logger.debug(
+            f"Refreshed {target.asin}; next in "
+            f"{(target.next_due - self._clock()) / 60:.1f} min"
+        )
+        return target.asin
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None, save_every: int = 50) -> None:
+        """Refresh targets continuously as they come due until stop_event is set."""
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"Refresh scheduler started with {len(self.targets)} tracked ASINs")
+
+        while not stop_event.is_set():
+            refreshed = await self.refresh_next()
+
+            if refreshed:
+                if self.stats['refreshes'] % save_every == 0:
+                    self.save()
+                continue
+
+            wait = self.next_due_in()
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=min(wait if wait is not None else 60.0, 60.0))
+            except asyncio.TimeoutError:
+                pass
+
+        self.save()
+        logger.info(f"Refresh scheduler stopped: {self.stats}")
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """Restore tracked targets and price history from disk."""
+        if not self.state_file.exists():
+            return 0
+
+        try:
+            targets = load_stored_models(RefreshTarget, self.state_file.read_bytes(), label="refresh target")
+        except Exception as e:
+            logger.error(f"Failed to load refresh state {self.state_file}: {e}")
+            targets = []
+        for target in targets:
+            self.targets[target.asin] = target
+            self._push(target)
+
+        logger.info(f"Restored {len(self.targets)} refresh targets from {self.state_file}")
+        return len(self.targets)
+
+    def save(self) -> bool:
+        """Persist tracked targets and price history to disk."""
+        data = [target.model_dump() for target in self.targets.values()]
+        if self.settings.snapshot_enabled:
+            update_snapshot(
+                self.state_file.with_name(SNAPSHOT_NAME), KIND_PRICE_HISTORY,
+                ((target.asin, target.last_refreshed or target.first_seen, target.model_dump_json().encode())
+                 for target in self.targets.values())
+            )
+        return save_json_file(data, str(self.state_file))
+
+
+async def main():
+    """Run the refresh scheduler continuously over the current deal set."""
+    from .focused_scraper import FocusedScraper
+
+    async with FocusedScraper() as scraper:
+        scheduler = RefreshScheduler(scraper.settings, scraper.get_real_product_data)
+        scheduler.load()
+        scheduler.track_deals(await scraper.deal_manager.load_existing_deals())
+
+        print(f"Refreshing {len(scheduler.targets)} ASINs ({datetime.now()}) - Ctrl+C to stop")
+        await scheduler.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
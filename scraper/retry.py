@@ -0,0 +1,179 @@
+"""
+Retry policy shared by the upstream clients (PAAPI, Amazon product pages, SavingsGuru).
+Backoff uses decorrelated jitter, responses are classified by status, and every
+retry in a run draws from one budget (a ratio of retries to first attempts) that
+also stops retrying once the run's deadline is near. A failing upstream can then
+neither multiply request volume nor stretch a run indefinitely.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, FrozenSet, Optional
+
+from loguru import logger
+
+from .settings import Settings
+
+
+# Statuses worth retrying by default: throttling and transient server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(response: Any) -> Optional[float]:
+    """Seconds from a response's numeric Retry-After header, if it has one."""
+    headers = getattr(response, 'headers', None)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RetryBudget:
+    """
+    Retries allowed per run: `min_retries` plus `ratio` per first attempt, so retries
+    add at most that fraction to request volume once the floor is used up. With a
+    deadline, no retry is scheduled to start after it.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, deadline_seconds: Optional[float] = None):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.deadline_seconds = deadline_seconds
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'RetryBudget':
+        return cls(
+            ratio=settings.retry_budget_ratio,
+            min_retries=settings.retry_budget_min,
+            deadline_seconds=settings.retry_deadline_minutes * 60 or None
+        )
+
+    def reset(self) -> None:
+        """Start a new run: counters cleared and the deadline measured from now."""
+        self._started = time.monotonic()
+        self.stats = {
+            'first_attempts': 0,
+            'retries': 0,
+            'denied': 0
+        }
+
+    def record_attempt(self) -> None:
+        self.stats['first_attempts'] += 1
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline_seconds is None:
+            return None
+        return self.deadline_seconds - (time.monotonic() - self._started)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False (and counted as denied) when it is used up."""
+        allowed = self.min_retries + self.ratio * self.stats['first_attempts']
+        if self.stats['retries'] >= allowed:
+            self.stats['denied'] += 1
+            return False
+        self.stats['retries'] += 1
+        return True
+
+
+class RetryPolicy:
+    """Attempt limit, backoff bounds and status classification for one kind of request."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+        retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    ):
+        """
+        Args:
+            max_attempts: Attempts per request, the first one included
+            base_delay: Shortest backoff in seconds
+            max_delay: Longest backoff in seconds
+            budget: Run-wide retry budget shared with other policies (a private one if omitted)
+            retry_statuses: HTTP statuses that are retried
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.budget = budget or RetryBudget()
+        self.retry_statuses = retry_statuses
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        budget: Optional[RetryBudget] = None,
+        retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    ) -> 'RetryPolicy':
+        return cls(
+            max_attempts=settings.max_retry_attempts,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            budget=budget or RetryBudget.from_settings(settings),
+            retry_statuses=retry_statuses
+        )
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def start(self, label: str) -> 'RetryState':
+        """Begin a request: counts its first attempt against the budget."""
+        self.budget.record_attempt()
+        return RetryState(self, label)
+
+
+class RetryState:
+    """Attempts of one request under a policy."""
+
+    def __init__(self, policy: RetryPolicy, label: str):
+        self.policy = policy
+        self.label = label
+        self.attempt = 1
+        self._delay = policy.base_delay
+
+    def next_delay(self) -> float:
+        """Decorrelated jitter: uniform between the base and three times the previous delay, capped."""
+        self._delay = min(self.policy.max_delay, random.uniform(self.policy.base_delay, self._delay * 3))
+        return self._delay
+
+    async def backoff(self, reason: str, retry_after: Optional[float] = None) -> bool:
+        """
+        Wait before the next attempt, if one is allowed.
+
+        Args:
+            reason: Why the attempt failed, for logs
+            retry_after: Minimum wait the upstream asked for (Retry-After)
+
+        Returns:
+            True after sleeping when the caller should retry; False when attempts,
+            budget or deadline are exhausted and the caller should give up
+        """
+        policy = self.policy
+        if self.attempt >= policy.max_attempts:
+            logger.warning(f"{self.label}: {reason} - giving up after {self.attempt} attempts")
+            return False
+
+        delay = self.next_delay()
+        if retry_after is not None:
+            delay = min(policy.max_delay, max(delay, retry_after))
+
+        remaining = policy.budget.remaining_seconds()
+        if remaining is not None and delay >= remaining:
+            logger.warning(f"{self.label}: {reason} - not retrying, the run deadline is {max(remaining, 0):.0f}s away")
+            return False
+        if not policy.budget.try_spend():
+            logger.warning(f"{self.label}: {reason} - not retrying, the run's retry budget is spent")
+            return False
+
+        logger.warning(f"{self.label}: {reason} - retry {self.attempt} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+        self.attempt += 1
+        return True
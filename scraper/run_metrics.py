@@ -0,0 +1,129 @@
+"""
+Per-run performance metrics: stage durations, requests and bytes per upstream,
+cache hit ratios and PAAPI quota use. Each finished run appends one JSON line
+to <state_dir>/run_metrics.jsonl, which perf_report compares across runs.
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from loguru import logger
+
+from .serialization import JsonCodec, get_codec
+
+
+METRICS_FILE_NAME = "run_metrics.jsonl"
+
+# Sections whose values are better when higher; everything else is better when lower
+HIGHER_IS_BETTER = ("cache_hit_ratio",)
+
+
+def hit_ratio(hits: int, lookups: int) -> Optional[float]:
+    """hits / lookups, or None when nothing was looked up."""
+    return round(hits / lookups, 4) if lookups else None
+
+
+class RunMetrics:
+    """Collects the measurements of one scrape run."""
+
+    def __init__(self):
+        self.started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.requests: Counter = Counter()
+        self.bytes: Counter = Counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage; repeated stages (e.g. incremental commits) add up."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] += time.perf_counter() - started
+
+    def count_request(self, source: str, size: int = 0, requests: int = 1) -> None:
+        """Record requests made to an upstream and the bytes they returned."""
+        self.requests[source] += requests
+        self.bytes[source] += size
+
+    def record(
+        self,
+        cache_hit_ratios: Dict[str, Optional[float]],
+        quota: Dict[str, int],
+        counts: Dict[str, Any],
+        **context: Any
+    ) -> Dict[str, Any]:
+        """The run as one JSON-ready record; `context` adds fields such as run_id or marketplace."""
+        seconds = {'total': time.perf_counter() - self._started, **self.stage_seconds}
+        return {
+            **context,
+            'started_at': self.started_at.isoformat(),
+            'seconds': {stage: round(value, 3) for stage, value in seconds.items()},
+            'requests': dict(self.requests),
+            'bytes': dict(self.bytes),
+            'cache_hit_ratio': {name: ratio for name, ratio in cache_hit_ratios.items() if ratio is not None},
+            'quota': quota,
+            'counts': counts,
+        }
+
+
+def append_run(path: Union[str, Path], record: Dict[str, Any], keep: int = 0, codec: Optional[JsonCodec] = None) -> bool:
+    """
+    Append a run record to the metrics file. With keep, the file is trimmed to the
+    last `keep` runs once it grows to twice that, so the rewrite cost is amortized.
+    """
+    path = Path(path)
+    codec = codec or get_codec()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') as f:
+            f.write(codec.dumps(record) + b"\n")
+
+        if keep:
+            lines = path.read_bytes().splitlines(keepends=True)
+            if len(lines) >= 2 * keep:
+                temp_path = path.with_name(f".{path.name}.tmp")
+                temp_path.write_bytes(b"".join(lines[-keep:]))
+                temp_path.replace(path)
+        return True
+    except OSError as e:
+        logger.error(f"Failed to record run metrics in {path}: {e}")
+        return False
+
+
+def load_runs(path: Union[str, Path], codec: Optional[JsonCodec] = None) -> List[Dict[str, Any]]:
+    """Run records in the order they were written; unreadable lines are skipped."""
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    codec = codec or get_codec()
+    runs = []
+    for number, line in enumerate(path.read_bytes().splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            runs.append(codec.loads(line))
+        except ValueError as e:
+            logger.warning(f"Skipping unreadable run metrics line {number} in {path}: {e}")
+    return runs
+
+
+def flatten(record: Dict[str, Any]) -> Dict[str, float]:
+    """Numeric metrics of a run keyed "section.name" (e.g. "seconds.total", "requests.paapi")."""
+    flat = {}
+    for section, values in record.items():
+        if isinstance(values, dict):
+            for name, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    flat[f"{section}.{name}"] = value
+    return flat
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.split('.', 1)[0] in HIGHER_IS_BETTER
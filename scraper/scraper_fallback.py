@@ -1,5 +1,5 @@
 """
-Web scraping fallback for Amazon.ca product pages.
+Web scraping fallback for Amazon product pages (Amazon.ca by default).
 Used when PAAPI fails or rate limits are exceeded.
 Implements anti-bot detection measures and robust error handling.
 """
@@ -17,11 +17,19 @@ from bs4 import BeautifulSoup
 from pydantic import ValidationError
 
 from .settings import Settings
-from .models import AmazonProduct, DataSource, ScrapingResult
+from .models import AmazonProduct, DataSource, NegativeReason, ScrapingResult
+from .marketplaces import get_marketplace
+from .concurrency import AdaptiveLimiter
+from .retry import RETRYABLE_STATUSES, RetryBudget, RetryPolicy, retry_after_seconds
 
 
 logger = logging.getLogger(__name__)
 
+# Responses meaning "slow down": fewer concurrent requests, then retry
+THROTTLE_STATUSES = (403, 429, 503)
+# Amazon answers 403 to clients it suspects are bots; that passes after a pause like a 429
+PAGE_RETRY_STATUSES = RETRYABLE_STATUSES | {403}
+
 
 class AmazonScrapingClient:
     """
@@ -29,15 +37,29 @@ class AmazonScrapingClient:
     Implements proper headers, delays, and retry logic to avoid detection.
     """
     
-    def __init__(self, settings: Settings):
-        """Initialize the scraping client with anti-bot measures."""
+    def __init__(self, settings: Settings, retry_budget: Optional[RetryBudget] = None):
+        """Initialize the scraping client with anti-bot measures (retries draw from `retry_budget` if given)."""
         self.settings = settings
+        self.marketplace = get_marketplace(settings.amz_marketplace)
+        
+        # Why the most recent scrape of each ASIN returned no product
+        self.failure_reasons: Dict[str, NegativeReason] = {}
+        
+        # Product page requests and response bytes (cumulative over the client's lifetime)
+        self.stats = {'requests': 0, 'bytes': 0}
+        
+        # Concurrent page requests adapt to how much the marketplace tolerates
+        self.limiter = AdaptiveLimiter.from_settings(
+            f"scrape:{self.marketplace.domain}", settings,
+            overload_exceptions=(httpx.TimeoutException, asyncio.TimeoutError)
+        )
+        self.retry_policy = RetryPolicy.from_settings(settings, budget=retry_budget, retry_statuses=PAGE_RETRY_STATUSES)
         
         # CRITICAL: Realistic browser headers to avoid bot detection
         self.base_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
+            'Accept-Language': self.marketplace.accept_languages[0],
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -56,10 +78,13 @@ class AmazonScrapingClient:
             headers=self.base_headers,
             timeout=httpx.Timeout(self.settings.request_timeout),
             follow_redirects=True,
-            limits=httpx.Limits(max_connections=5, max_keepalive_connections=2)
+            limits=httpx.Limits(
+                max_connections=max(5, self.limiter.max_limit),
+                max_keepalive_connections=max(2, self.limiter.max_limit // 2)
+            )
         )
         
-        logger.info("Amazon scraping client initialized with anti-bot measures")
+        logger.info(f"Amazon scraping client initialized for {self.marketplace.domain} with anti-bot measures")
     
     async def _add_random_delay(self) -> None:
         """Add random delay between requests to avoid pattern detection."""
@@ -84,15 +109,8 @@ class AmazonScrapingClient:
         
         headers['User-Agent'] = random.choice(user_agents)
         
-        # Add some variation to Accept-Language
-        accept_languages = [
-            'en-US,en;q=0.9',
-            'en-US,en;q=0.9,fr;q=0.8',
-            'en-CA,en;q=0.9,fr;q=0.8',
-            'en-US,en;q=0.8'
-        ]
-        
-        headers['Accept-Language'] = random.choice(accept_languages)
+        # Add some variation to Accept-Language within the marketplace's languages
+        headers['Accept-Language'] = random.choice(self.marketplace.accept_languages)
         
         return headers
     
@@ -104,7 +122,11 @@ class AmazonScrapingClient:
         if not text:
             return None
         
-        # Common price patterns on Amazon.ca
+        if self.marketplace.decimal_comma:
+            # "1.299,99 €" -> "1299.99"
+            text = text.replace('.', '').replace(',', '.')
+        
+        # Common price patterns on Amazon.ca (other marketplaces fall through to the plain number)
         patterns = [
             r'CDN\$\s*([0-9,]+\.?[0-9]*)',  # CDN$ format
             r'\$([0-9,]+\.?[0-9]*)',        # $ format
@@ -132,6 +154,7 @@ class AmazonScrapingClient:
             title = self._extract_title(soup)
             if not title:
                 logger.warning(f"Could not extract title for ASIN {asin}")
+                self.failure_reasons[asin] = NegativeReason.NOT_FOUND
                 return None
             
             # Extract current price
@@ -159,6 +182,7 @@ class AmazonScrapingClient:
             # CRITICAL: Only return product if we have essential data
             if not current_price or current_price <= 0:
                 logger.warning(f"No valid price found for ASIN {asin}")
+                self.failure_reasons[asin] = NegativeReason.NO_PRICE
                 return None
             
             product = AmazonProduct(
@@ -172,6 +196,7 @@ class AmazonScrapingClient:
                 data_source=DataSource.SCRAPED
             )
             
+            self.failure_reasons.pop(asin, None)
             logger.info(f"Successfully scraped data for {asin}: {title} - ${current_price}")
             return product
             
@@ -298,7 +323,7 @@ class AmazonScrapingClient:
     
     async def scrape_product(self, asin: str) -> Optional[AmazonProduct]:
         """
-        Scrape product information from Amazon.ca product page.
+        Scrape product information from the marketplace's product page.
         
         Args:
             asin: Amazon Standard Identification Number
@@ -308,19 +333,28 @@ class AmazonScrapingClient:
         """
         if not asin or len(asin) != 10:
             logger.warning(f"Invalid ASIN format: {asin}")
+            self.failure_reasons[asin] = NegativeReason.INVALID
             return None
         
-        url = f"https://www.amazon.ca/dp/{asin}"
+        url = self.marketplace.product_url(asin)
+        
+        # Assume blocking unless the page tells us otherwise
+        self.failure_reasons[asin] = NegativeReason.BLOCKED
         
-        # Implement retry logic with exponential backoff
-        for attempt in range(self.settings.max_retry_attempts):
+        retry = self.retry_policy.start(f"Scrape {asin}")
+        while True:
             try:
                 await self._add_random_delay()
                 
                 headers = self._get_randomized_headers()
-                logger.debug(f"Scraping attempt {attempt + 1} for {asin}: {url}")
+                logger.debug(f"Scraping attempt {retry.attempt} for {asin}: {url}")
                 
-                response = await self.client.get(url, headers=headers)
+                async with self.limiter.slot() as slot:
+                    response = await self.client.get(url, headers=headers)
+                    if response.status_code in THROTTLE_STATUSES:
+                        slot.overloaded()
+                self.stats['requests'] += 1
+                self.stats['bytes'] += len(response.content)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -328,38 +362,35 @@ class AmazonScrapingClient:
                     # Check if we got a valid product page (not blocked or captcha)
                     if self._is_valid_product_page(soup):
                         return self._extract_product_data(soup, asin)
-                    else:
-                        logger.warning(f"Got blocked or invalid page for {asin}")
-                        
-                elif response.status_code == 503:
-                    # Service temporarily unavailable - likely rate limited
-                    backoff_time = (2 ** attempt) + random.uniform(1, 3)
-                    logger.warning(f"Got 503 for {asin}, backing off for {backoff_time:.2f}s")
-                    await asyncio.sleep(backoff_time)
-                    continue
-                    
-                elif response.status_code in [403, 429]:
-                    # Forbidden or rate limited
-                    backoff_time = (3 ** attempt) + random.uniform(2, 5)
-                    logger.warning(f"Got {response.status_code} for {asin}, backing off for {backoff_time:.2f}s")
-                    await asyncio.sleep(backoff_time)
-                    continue
-                    
+                    if await retry.backoff("blocked or invalid page"):
+                        continue
+                    break
+                
+                if self.retry_policy.is_retryable_status(response.status_code):
+                    # Throttled, blocked or temporarily unavailable
+                    if await retry.backoff(f"HTTP {response.status_code}", retry_after_seconds(response)):
+                        continue
+                    break
+                
+                if response.status_code in [404, 410]:
+                    logger.warning(f"Product page not found for {asin} ({response.status_code})")
+                    self.failure_reasons[asin] = NegativeReason.NOT_FOUND
                 else:
                     logger.warning(f"Unexpected status code {response.status_code} for {asin}")
-                    break
-                    
+                break
+                
             except httpx.TimeoutException:
-                logger.warning(f"Timeout scraping {asin} (attempt {attempt + 1})")
-                if attempt < self.settings.max_retry_attempts - 1:
-                    await asyncio.sleep(2 ** attempt)
-                    
+                if await retry.backoff("timeout"):
+                    continue
+                break
+                
             except Exception as e:
-                logger.error(f"Error scraping {asin} (attempt {attempt + 1}): {e}")
-                if attempt < self.settings.max_retry_attempts - 1:
-                    await asyncio.sleep(2 ** attempt)
+                logger.error(f"Error scraping {asin} (attempt {retry.attempt}): {e}")
+                if await retry.backoff(type(e).__name__):
+                    continue
+                break
         
-        logger.error(f"Failed to scrape product data for {asin} after {self.settings.max_retry_attempts} attempts")
+        logger.error(f"Failed to scrape product data for {asin} after {retry.attempt} attempts")
         return None
     
     def _is_valid_product_page(self, soup: BeautifulSoup) -> bool:
@@ -0,0 +1,461 @@
+"""
+Full-text search over exported deals.
+Builds a compact inverted index (title, brand, category, description) at export
+time and serializes it to a memory-mappable binary file. Postings carry
+precomputed BM25 impacts: single-term queries walk them best-first and stop
+early, multi-term queries intersect rarest-first and score only the survivors.
+
+Latency: single-term, type-ahead and selective multi-term queries answer in
+well under a millisecond over 100k deals. Conjunctions of very common terms do
+not meet that target: the best-first probe is bounded, and when it finds fewer
+than `limit` matches the query falls back to exact intersection, which costs a
+few milliseconds in pure Python (bench_search_index: p50 ~0.25 ms, p99 ~4 ms).
+"""
+
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+
+from loguru import logger
+
+
+SEARCH_INDEX_NAME = "search-index.bin"
+
+MAGIC = b"SGIX"
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, docs, terms, postings, then section offsets:
+# doc keys, term table, posting docs, posting impacts, posting order, string table
+HEADER = struct.Struct("<4sHHIII6Q")
+DOC_KEY = struct.Struct("<II")          # string offset, length
+TERM = struct.Struct("<IIII")           # string offset, length, first posting, posting count
+
+# Matches in short, high-signal fields count more than in the description
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'brand': 2.0,
+    'category': 2.0,
+    'description': 1.0,
+}
+
+STOPWORDS = frozenset({"a", "an", "and", "the", "for", "of", "with", "in", "on", "to", "by", "or", "at"})
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_BOOST = 0.8
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSION = 64
+# Candidates probed best-first per multi-term query (see _top_best_first)
+PROBE_BUDGET = 400
+# Postings kept materialized as dicts for repeated (type-ahead) queries
+TERM_CACHE_POSTINGS = 500_000
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _pack(typecode: str, values: Sequence) -> bytes:
+    """Little-endian 32-bit array bytes."""
+    packed = array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def build_search_index(deals_data: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Build the binary search index for a deal set.
+
+    Args:
+        deals_data: Serialized deals (snake_case or camelCase records)
+
+    Returns:
+        Index bytes, readable with SearchIndex
+    """
+    doc_keys: List[str] = []
+    doc_lengths: List[float] = []
+    frequencies: Dict[str, Dict[int, float]] = {}
+
+    for deal in deals_data:
+        doc = len(doc_keys)
+        doc_keys.append(str(deal['id']))
+        length = 0.0
+
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(deal.get(field)):
+                term_frequencies = frequencies.setdefault(token, {})
+                term_frequencies[doc] = term_frequencies.get(doc, 0.0) + weight
+                length += weight
+
+        doc_lengths.append(length)
+
+    doc_count = len(doc_keys)
+    avg_length = (sum(doc_lengths) / doc_count) if doc_count else 1.0
+
+    strings = bytearray()
+    doc_key_table = bytearray()
+    for key in doc_keys:
+        encoded = key.encode('utf-8')
+        doc_key_table += DOC_KEY.pack(len(strings), len(encoded))
+        strings += encoded
+
+    term_table = bytearray()
+    posting_docs: List[int] = []
+    posting_impacts: List[float] = []
+    posting_order: List[int] = []
+
+    for term in sorted(frequencies, key=lambda term: term.encode('utf-8')):
+        encoded = term.encode('utf-8')
+        entries = sorted(frequencies[term].items())
+        idf = math.log(1 + (doc_count - len(entries) + 0.5) / (len(entries) + 0.5))
+
+        impacts = []
+        for doc, frequency in entries:
+            norm = 1 - BM25_B + BM25_B * doc_lengths[doc] / (avg_length or 1.0)
+            impacts.append(idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm))
+
+        term_table += TERM.pack(len(strings), len(encoded), len(posting_docs), len(entries))
+        strings += encoded
+
+        posting_docs.extend(doc for doc, _ in entries)
+        posting_impacts.extend(impacts)
+        # Local positions by descending impact, for best-first traversal
+        posting_order.extend(sorted(range(len(entries)), key=lambda i: (-impacts[i], entries[i][0])))
+
+    sections = [
+        bytes(doc_key_table),
+        bytes(term_table),
+        _pack('I', posting_docs),
+        _pack('f', posting_impacts),
+        _pack('I', posting_order),
+        bytes(strings),
+    ]
+
+    offsets = []
+    offset = HEADER.size
+    for section in sections:
+        offsets.append(offset)
+        offset += len(section)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, doc_count, len(frequencies), len(posting_docs), *offsets)
+    return b"".join([header, *sections])
+
+
+def write_search_index(deals_data: Iterable[Dict[str, Any]], path: Union[str, Path]) -> bool:
+    """Build the search index and write it atomically (open readers keep the old file)."""
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(build_search_index(deals_data))
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        logger.error(f"Failed to write search index {path}: {e}")
+        return False
+
+
+class SearchIndex:
+    """
+    Read-only view over a serialized search index.
+    Works on bytes or an mmap; posting arrays are zero-copy views into the buffer.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """Wrap an index buffer produced by build_search_index."""
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._view = memoryview(buffer)
+
+        (magic, version, _, self.doc_count, self.term_count, posting_count,
+         self._doc_keys_at, self._terms_at, docs_at, impacts_at, order_at,
+         self._strings_at) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a search index (magic={magic!r}, version={version})")
+
+        self._docs = self._array(docs_at, posting_count, 'I')
+        self._impacts = self._array(impacts_at, posting_count, 'f')
+        self._order = self._array(order_at, posting_count, 'I')
+
+        self._term_maps: 'OrderedDict[int, Dict[int, float]]' = OrderedDict()
+        self._term_map_postings = 0
+
+    def _array(self, offset: int, count: int, typecode: str) -> Sequence:
+        data = self._view[offset:offset + count * 4]
+        if sys.byteorder == 'little':
+            return data.cast(typecode)
+        converted = array(typecode, data.tobytes())
+        converted.byteswap()
+        return converted
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'SearchIndex':
+        """Memory-map an index file."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        """Release the mapping (views into it become invalid)."""
+        self._term_maps.clear()
+        for view in (self._docs, self._impacts, self._order, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # A caller still holds a slice; the mapping is freed with it
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    # ------------------------------------------------------------------
+    # Raw access
+    # ------------------------------------------------------------------
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_at + offset
+        return self._view[start:start + length].tobytes()
+
+    def _term(self, number: int) -> Tuple[bytes, int, int]:
+        offset, length, first, count = TERM.unpack_from(self._view, self._terms_at + number * TERM.size)
+        return self._string(offset, length), first, count
+
+    def doc_key(self, doc: int) -> str:
+        offset, length = DOC_KEY.unpack_from(self._view, self._doc_keys_at + doc * DOC_KEY.size)
+        return self._string(offset, length).decode('utf-8')
+
+    def _lower_bound(self, key: bytes) -> int:
+        """First term number whose bytes are >= key (binary search over the sorted term table)."""
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _matching_terms(self, token: str, prefix: bool) -> List[Tuple[float, int, int]]:
+        """(boost, first posting, posting count) for the token and, if prefix, its expansions."""
+        key = token.encode('utf-8')
+        number = self._lower_bound(key)
+        matches = []
+        prefix = prefix and len(token) >= MIN_PREFIX_LENGTH
+
+        while number < self.term_count and len(matches) < MAX_PREFIX_EXPANSION:
+            term, first, count = self._term(number)
+            if term == key:
+                matches.append((1.0, first, count))
+            elif prefix and term.startswith(key):
+                matches.append((PREFIX_BOOST, first, count))
+            else:
+                break
+            if not prefix:
+                break
+            number += 1
+
+        return matches
+
+    def _best_first(self, boost: float, first: int, count: int) -> Iterator[Tuple[float, int]]:
+        """Yield (score, doc) for one term in descending score order."""
+        docs, impacts, order = self._docs, self._impacts, self._order
+        for i in range(first, first + count):
+            position = first + order[i]
+            yield boost * impacts[position], docs[position]
+
+    def _group_score(self, terms: List[Tuple[float, int, int]], doc: int) -> Optional[float]:
+        """Best score of a document across a query term's expansions, or None if absent."""
+        best = None
+        for boost, first, count in terms:
+            position = bisect_left(self._docs, doc, first, first + count)
+            if position < first + count and self._docs[position] == doc:
+                score = boost * self._impacts[position]
+                if best is None or score > best:
+                    best = score
+        return best
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Indexed terms starting with prefix, most frequent first."""
+        token = prefix.lower().strip()
+        if not token:
+            return []
+
+        key = token.encode('utf-8')
+        number = self._lower_bound(key)
+        matches = []
+        while number < self.term_count and len(matches) < MAX_PREFIX_EXPANSION:
+            term, _, count = self._term(number)
+            if not term.startswith(key):
+                break
+            matches.append((count, term))
+            number += 1
+
+        matches.sort(key=lambda match: -match[0])
+        return [term.decode('utf-8') for _, term in matches[:limit]]
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> List[Tuple[str, float]]:
+        """
+        Rank deals for a query with BM25.
+
+        Every query term must match. With prefix=True the last term also matches
+        any indexed term it prefixes (type-ahead), at a slight discount.
+
+        Returns:
+            List of (deal id, score), best first
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.doc_count or limit <= 0:
+            return []
+
+        groups = []
+        for position, token in enumerate(tokens):
+            terms = self._matching_terms(token, prefix and position == len(tokens) - 1)
+            if not terms:
+                return []
+            groups.append(terms)
+
+        if len(groups) == 1:
+            top = self._top_single(groups[0], limit)
+        else:
+            top = self._top_conjunction(groups, limit)
+
+        return [(self.doc_key(-negative_doc), score) for score, negative_doc in sorted(top, reverse=True)]
+
+    def _top_single(self, terms: List[Tuple[float, int, int]], limit: int) -> List[Tuple[float, int]]:
+        """Walk one query term's postings best-first; stops after `limit` distinct documents."""
+        stream = heapq.merge(*(self._best_first(*term) for term in terms), reverse=True)
+        top: List[Tuple[float, int]] = []
+        seen = set()
+
+        for score, doc in stream:
+            if len(top) == limit:
+                break  # Every remaining posting scores no higher
+            if doc in seen:
+                continue  # Already scored through a better expansion
+            seen.add(doc)
+            top.append((score, -doc))
+
+        return top
+
+    def _top_conjunction(self, groups: List[List[Tuple[float, int, int]]], limit: int) -> List[Tuple[float, int]]:
+        """Top documents matching every query term."""
+        top = self._top_best_first(groups, limit, PROBE_BUDGET)
+        if top is None:
+            top = self._top_by_intersection(groups, limit)
+        return top
+
+    def _top_best_first(
+        self,
+        groups: List[List[Tuple[float, int, int]]],
+        limit: int,
+        budget: int
+    ) -> Optional[List[Tuple[float, int]]]:
+        """
+        Walk the rarest term best-first, probing the others per candidate, and stop
+        once no remaining candidate can beat the current top results.
+        When the budget runs out with `limit` matches, those are returned although an
+        unprobed candidate could still rank above the last of them; with fewer, returns
+        None so the caller intersects exactly (flat impact distributions, rare overlaps).
+        """
+        driver = min(groups, key=lambda terms: sum(count for _, _, count in terms))
+        others = [terms for terms in groups if terms is not driver]
+        others_bound = sum(
+            max(boost * self._impacts[first + self._order[first]] for boost, first, _ in terms)
+            for terms in others
+        )
+
+        stream = heapq.merge(*(self._best_first(*term) for term in driver), reverse=True)
+        top: List[Tuple[float, int]] = []
+        seen = set()
+
+        for driver_score, doc in stream:
+            if len(top) == limit and driver_score + others_bound <= top[0][0]:
+                return top  # Nothing further down can enter the top results
+            if doc in seen:
+                continue  # Already scored through a better expansion
+            if len(seen) == budget:
+                return top if len(top) == limit else None
+            seen.add(doc)
+
+            score = driver_score
+            for terms in others:
+                other = self._group_score(terms, doc)
+                if other is None:
+                    break
+                score += other
+            else:
+                entry = (score, -doc)
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+        return top
+
+    def _term_map(self, first: int, count: int) -> Dict[int, float]:
+        """Postings of one term as doc -> impact, with a bounded LRU over recent terms."""
+        cached = self._term_maps.get(first)
+        if cached is not None:
+            self._term_maps.move_to_end(first)
+            return cached
+
+        term_map = dict(zip(self._docs[first:first + count].tolist(), self._impacts[first:first + count].tolist()))
+        self._term_maps[first] = term_map
+        self._term_map_postings += count
+
+        while self._term_map_postings > TERM_CACHE_POSTINGS and len(self._term_maps) > 1:
+            _, evicted = self._term_maps.popitem(last=False)
+            self._term_map_postings -= len(evicted)
+
+        return term_map
+
+    def _top_by_intersection(self, groups: List[List[Tuple[float, int, int]]], limit: int) -> List[Tuple[float, int]]:
+        """Intersect materialized posting maps rarest-first and score the survivors."""
+        group_maps = [
+            [(boost, self._term_map(first, count)) for boost, first, count in terms]
+            for terms in groups
+        ]
+        group_maps.sort(key=lambda maps: sum(len(term_map) for _, term_map in maps))
+
+        def matched(maps: List[Tuple[float, Dict[int, float]]]):
+            return maps[0][1].keys() if len(maps) == 1 else set().union(*(term_map.keys() for _, term_map in maps))
+
+        candidates = matched(group_maps[0]) & matched(group_maps[1])
+        for maps in group_maps[2:]:
+            candidates = candidates & matched(maps)
+        if not candidates:
+            return []
+
+        # Score column by column so the inner loops stay in comprehensions
+        docs = list(candidates)
+        totals = [0.0] * len(docs)
+        for maps in group_maps:
+            if len(maps) == 1:
+                boost, term_map = maps[0]
+                column = [boost * term_map[doc] for doc in docs]
+            else:
+                column = [max(boost * term_map[doc] for boost, term_map in maps if doc in term_map) for doc in docs]
+            totals = [total + value for total, value in zip(totals, column)]
+
+        return heapq.nlargest(limit, zip(totals, [-doc for doc in docs]))
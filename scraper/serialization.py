@@ -0,0 +1,108 @@
+"""
+Pluggable JSON backends for deal export and state files.
+orjson (a requirement) or msgspec (optional) encode and decode several times
+faster than the stdlib json module; the stdlib codec stays as the fallback.
+Deals are written in the frontend's canonical camelCase schema.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from pydantic import TypeAdapter
+
+from .models import Deal
+
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+_DEAL_LIST = TypeAdapter(List[Deal])
+
+
+class JsonCodec:
+    """Encodes to and decodes from UTF-8 JSON bytes; values JSON lacks are written as str()."""
+
+    name = "json"
+
+    def dumps(self, data: Any, indent: Optional[int] = None) -> bytes:
+        if indent:
+            return json.dumps(data, indent=indent, ensure_ascii=False, default=str).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson backend. Indented output is always two spaces."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        # Datetimes go through str() like the stdlib codec, so files don't change format with the backend
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, data: Any, indent: Optional[int] = None) -> bytes:
+        options = self._options | (self._orjson.OPT_INDENT_2 if indent else 0)
+        return self._orjson.dumps(data, default=str, option=options)
+
+    def loads(self, raw: bytes) -> Any:
+        return self._orjson.loads(raw)
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec backend (optional dependency). Datetimes are written in ISO 8601."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._format = msgspec.json.format
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, data: Any, indent: Optional[int] = None) -> bytes:
+        encoded = self._encoder.encode(data)
+        return self._format(encoded, indent=indent) if indent else encoded
+
+    def loads(self, raw: bytes) -> Any:
+        return self._decoder.decode(raw)
+
+
+_CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+@lru_cache(maxsize=None)
+def get_codec(backend: str = "auto") -> JsonCodec:
+    """
+    Codec for a backend name, or the fastest installed one for "auto".
+    A named backend that is not installed falls back to the stdlib codec with a warning.
+    """
+    backend = backend.strip().lower()
+    if backend != "auto" and backend not in _CODECS:
+        raise ValueError(f"Unknown JSON backend {backend!r} (expected auto or one of {', '.join(JSON_BACKENDS)})")
+
+    for name in (JSON_BACKENDS if backend == "auto" else (backend,)):
+        try:
+            return _CODECS[name]()
+        except ImportError:
+            if backend != "auto":
+                logger.warning(f"JSON backend {name} is not installed - using the stdlib json module")
+    return JsonCodec()
+
+
+def deal_records(deals: List[Deal]) -> List[Dict[str, Any]]:
+    """Deals as JSON-ready camelCase records (one pydantic-core call, no default=str fixups)."""
+    return _DEAL_LIST.dump_python(deals, mode='json', by_alias=True)
+
+
+def encode_deals(deals: List[Deal]) -> bytes:
+    """Encode deals straight to compact camelCase JSON; pydantic-core writes the models without intermediate dicts."""
+    return _DEAL_LIST.dump_json(deals, by_alias=True)
@@ -4,13 +4,17 @@ Pattern mirrored from use-cases/pydantic-ai/examples/main_agent_reference/settin
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator, ConfigDict
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from .marketplaces import MARKETPLACES, parse_marketplaces, parse_partner_tags
+from .serialization import JSON_BACKENDS
+
+
+# Sources of SavingsGuru posts: listing pages, or structured feeds with listing pages as fallback
+POST_SOURCES = ("html", "feed")
 
 
 class Settings(BaseSettings):
@@ -42,6 +46,14 @@ class Settings(BaseSettings):
         default="CA", 
         description="Amazon marketplace country code"
     )
+    amz_marketplaces: str = Field(
+        default="",
+        description="Comma-separated marketplaces scraped concurrently in multi-marketplace mode (e.g. CA,US,UK)"
+    )
+    amz_partner_tags: str = Field(
+        default="",
+        description="Per-marketplace partner tags (e.g. US:mytag-20,UK:mytag-21); others use amz_partner_tag"
+    )
     
     # Rate limiting configuration
     api_rate_limit_delay: float = Field(
@@ -57,15 +69,73 @@ class Settings(BaseSettings):
         description="Maximum delay between scraping requests"
     )
     
+    # Adaptive concurrency configuration (per upstream: PAAPI, Amazon product pages)
+    adaptive_concurrency_enabled: bool = Field(
+        default=True,
+        description="Adapt concurrent requests per upstream to latency and throttling (off = one at a time)"
+    )
+    adaptive_initial_concurrency: int = Field(
+        default=2,
+        description="Concurrent requests per upstream at startup"
+    )
+    adaptive_min_concurrency: int = Field(
+        default=1,
+        description="Concurrent requests per upstream never drop below this"
+    )
+    adaptive_max_concurrency: int = Field(
+        default=16,
+        description="Concurrent requests per upstream never grow past this"
+    )
+    adaptive_latency_tolerance: float = Field(
+        default=2.0,
+        description="Latency over this multiple of the best observed stops growth and shrinks the limit"
+    )
+    adaptive_backoff_ratio: float = Field(
+        default=0.5,
+        description="Factor applied to the concurrency limit on 429/503 responses or timeouts"
+    )
+    
     # Scraping configuration
     max_retry_attempts: int = Field(
         default=3, 
         description="Maximum retry attempts for failed requests"
     )
+    retry_base_delay: float = Field(
+        default=1.0,
+        description="Shortest backoff before a retry, in seconds (decorrelated jitter grows from here)"
+    )
+    retry_max_delay: float = Field(
+        default=30.0,
+        description="Longest backoff before a retry, in seconds"
+    )
+    retry_budget_ratio: float = Field(
+        default=0.2,
+        description="Retries allowed per first attempt across a run, on top of retry_budget_min"
+    )
+    retry_budget_min: int = Field(
+        default=10,
+        description="Retries a run may always spend, however few requests it made"
+    )
+    retry_deadline_minutes: float = Field(
+        default=0.0,
+        description="Minutes after a run starts when no more retries are scheduled (0 = no deadline)"
+    )
     request_timeout: float = Field(
         default=30.0, 
         description="HTTP request timeout in seconds"
     )
+    negative_result_ttl: float = Field(
+        default=300.0,
+        description="Seconds to memoize failed ASIN lookups in memory"
+    )
+    negative_cache_max_ttl_hours: float = Field(
+        default=168.0,
+        description="Maximum hours a failing ASIN is skipped before being retried"
+    )
+    categories_file: Optional[str] = Field(
+        default=None,
+        description="Category keyword config (JSON); defaults to scraper/categories.json"
+    )
     
     # Deal management configuration
     target_deal_count: int = Field(
@@ -84,6 +154,196 @@ class Settings(BaseSettings):
         default=10, 
         description="Minimum discount percentage to include deal"
     )
+    near_duplicate_threshold: float = Field(
+        default=0.7,
+        description="Title similarity (Jaccard, 0-1) at which deals count as variants of one product"
+    )
+    
+    # Export configuration
+    delta_retention: int = Field(
+        default=48,
+        description="Number of versioned deals.json deltas kept for incremental sync"
+    )
+    shard_page_size: int = Field(
+        default=24,
+        description="Deals per page in the pre-sharded top-discount feed"
+    )
+    json_backend: str = Field(
+        default="auto",
+        description="JSON encoder/decoder for exports and state files: auto, orjson, msgspec or json"
+    )
+    json_pretty: bool = Field(
+        default=False,
+        description="Indent the full deals file (larger and slower; deltas and shards stay compact)"
+    )
+    
+    # Refresh scheduling configuration
+    refresh_base_interval_minutes: float = Field(
+        default=60.0,
+        description="Baseline refresh interval for an average deal"
+    )
+    refresh_min_interval_minutes: float = Field(
+        default=5.0,
+        description="Shortest refresh interval for the hottest deals"
+    )
+    refresh_max_interval_hours: float = Field(
+        default=24.0,
+        description="Longest refresh interval for stale deals"
+    )
+    refresh_quota_per_hour: int = Field(
+        default=1800,
+        description="Maximum ASIN refreshes per hour across PAAPI and scraping"
+    )
+    
+    # Daemon configuration
+    daemon_scrape_interval_hours: float = Field(
+        default=6.0,
+        description="Hours between full SavingsGuru scrapes in daemon mode"
+    )
+    daemon_commit_interval_minutes: float = Field(
+        default=5.0,
+        description="Minutes between commits of refreshed prices in daemon mode"
+    )
+    daemon_refresh_enabled: bool = Field(
+        default=True,
+        description="Run the continuous ASIN refresh scheduler in daemon mode"
+    )
+    daemon_drain_timeout: float = Field(
+        default=60.0,
+        description="Seconds to wait for in-flight jobs on shutdown before cancelling"
+    )
+    
+    # Query API configuration
+    query_api_host: str = Field(
+        default="127.0.0.1",
+        description="Interface the deals query API binds to"
+    )
+    query_api_port: int = Field(
+        default=8080,
+        description="Port the deals query API listens on"
+    )
+    query_api_poll_seconds: float = Field(
+        default=5.0,
+        description="Seconds between checks for a newly committed deal store version"
+    )
+    
+    # Sharding configuration
+    shard_workers: int = Field(
+        default=1,
+        description="Worker processes that split ASIN lookups by consistent hash (1 = resolve in-process)"
+    )
+    shard_claim_batch: int = Field(
+        default=10,
+        description="ASINs a shard worker claims from the job queue at a time"
+    )
+    paapi_credentials: str = Field(
+        default="",
+        description="Extra PAAPI credentials for shard workers, as comma-separated key:secret:tag entries"
+    )
+    
+    # Checkpoint configuration
+    checkpoint_enabled: bool = Field(
+        default=True,
+        description="Checkpoint page and ASIN progress so an interrupted scrape resumes where it stopped"
+    )
+    checkpoint_batch_size: int = Field(
+        default=10,
+        description="ASIN lookups per checkpoint commit"
+    )
+    checkpoint_max_age_hours: float = Field(
+        default=12.0,
+        description="Hours after which an unfinished run's checkpoint is discarded instead of resumed"
+    )
+    
+    # Streaming pipeline configuration
+    pipeline_enabled: bool = Field(
+        default=False,
+        description="Stream pages, lookups and deals through bounded queues with incremental commits"
+    )
+    pipeline_queue_size: int = Field(
+        default=32,
+        description="Capacity of each streaming pipeline queue (bounds memory and applies backpressure)"
+    )
+    pipeline_commit_every: int = Field(
+        default=10,
+        description="New deals that trigger an incremental commit in the streaming pipeline"
+    )
+    pipeline_commit_interval_seconds: float = Field(
+        default=15.0,
+        description="Maximum seconds new deals wait before an incremental commit"
+    )
+    
+    # Post source configuration
+    post_source: str = Field(
+        default="html",
+        description="Where SavingsGuru posts come from: html (listing pages) or feed (WordPress REST API, then RSS/Atom feed, then listing pages)"
+    )
+    feed_max_requests: int = Field(
+        default=5,
+        description="Most WordPress REST pages (100 posts each) read per run in feed mode"
+    )
+    
+    # Large crawl and backfill configuration
+    crawl_low_memory_pages: int = Field(
+        default=100,
+        description="Page count from which a scrape runs as a constant-memory crawl (posts kept on disk, deals committed in batches); 0 disables it"
+    )
+    backfill_concurrency: int = Field(
+        default=4,
+        description="Concurrent SavingsGuru page fetchers in backfill mode (the adaptive limit still applies)"
+    )
+    backfill_max_pages: int = Field(
+        default=500,
+        description="Most pages crawled per archive (month or category) in backfill mode"
+    )
+    
+    # Persistent state configuration
+    state_dir: str = Field(
+        default="data",
+        description="Directory for persistent scraper state (caches, queues, metrics)"
+    )
+    seen_filter_capacity: int = Field(
+        default=1_000_000,
+        description="Items per seen-set generation (ASINs, post URLs, short links) before a rebuild"
+    )
+    seen_filter_fp_rate: float = Field(
+        default=0.001,
+        description="Target false-positive rate of the seen-set Bloom filters"
+    )
+    seen_filter_rebuild_days: float = Field(
+        default=30.0,
+        description="Days before a seen-set generation is rotated out"
+    )
+    skip_seen_posts: bool = Field(
+        default=True,
+        description="Skip SavingsGuru posts already processed in an earlier run"
+    )
+    snapshot_enabled: bool = Field(
+        default=True,
+        description="Keep a memory-mappable binary snapshot of deals, resolved products and price history"
+    )
+    snapshot_product_max_age_hours: float = Field(
+        default=168.0,
+        description="Hours resolved products stay in the state snapshot"
+    )
+    snapshot_product_reuse_minutes: float = Field(
+        default=60.0,
+        description="Products resolved within this many minutes are read from the state snapshot instead of looked up again (0 disables)"
+    )
+    
+    # Performance metrics configuration
+    metrics_enabled: bool = Field(
+        default=True,
+        description="Append per-run performance metrics to <state_dir>/run_metrics.jsonl"
+    )
+    metrics_keep_runs: int = Field(
+        default=500,
+        description="Runs kept in the metrics file (0 keeps all)"
+    )
+    perf_regression_threshold_pct: float = Field(
+        default=25.0,
+        description="Percent change against earlier runs that perf_report treats as a regression"
+    )
     
     # Application Configuration
     app_env: str = Field(default="development")
@@ -102,25 +362,70 @@ class Settings(BaseSettings):
     @classmethod
     def validate_marketplace(cls, v):
         """Ensure marketplace is a valid country code."""
-        valid_marketplaces = ["CA", "US", "UK", "DE", "FR", "IT", "ES", "IN", "JP", "AU"]
+        valid_marketplaces = list(MARKETPLACES)
         if v not in valid_marketplaces:
             raise ValueError(f"Invalid marketplace: {v}. Must be one of {valid_marketplaces}")
         return v
+    
+    @field_validator("amz_marketplaces")
+    @classmethod
+    def validate_marketplaces(cls, v):
+        """Ensure every multi-marketplace code is known."""
+        return ",".join(parse_marketplaces(v))
+    
+    @field_validator("json_backend")
+    @classmethod
+    def validate_json_backend(cls, v):
+        """Ensure the JSON backend is auto or a known backend."""
+        v = v.strip().lower()
+        if v != "auto" and v not in JSON_BACKENDS:
+            raise ValueError(f"Invalid JSON backend: {v}. Must be auto or one of {list(JSON_BACKENDS)}")
+        return v
+    
+    @field_validator("post_source")
+    @classmethod
+    def validate_post_source(cls, v):
+        """Ensure the post source is known."""
+        v = v.strip().lower()
+        if v not in POST_SOURCES:
+            raise ValueError(f"Invalid post source: {v}. Must be one of {list(POST_SOURCES)}")
+        return v
+    
+    @field_validator("amz_partner_tags")
+    @classmethod
+    def validate_partner_tags(cls, v):
+        """Ensure per-marketplace partner tags name known marketplaces."""
+        parse_partner_tags(v)
+        return v
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Process-wide settings, built on first use so importing this module stays cheap.
+    Loads .env into the environment first (other modules read os.environ too).
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    try:
+        return Settings()
+    except Exception as e:
+        # For testing/development, create settings with dummy values if env vars missing
+        if "development" in os.environ.get("APP_ENV", "development").lower():
+            import warnings
+            warnings.warn(f"Could not load settings: {e}. Using default values for development.")
+            
+            os.environ.setdefault("AMZ_ACCESS_KEY", "dummy_access_key")
+            os.environ.setdefault("AMZ_SECRET_KEY", "dummy_secret_key") 
+            os.environ.setdefault("AMZ_PARTNER_TAG", "savingsgurucc-20")
+            
+            return Settings()
+        raise
 
 
-# Global settings instance
-try:
-    settings = Settings()
-except Exception as e:
-    # For testing/development, create settings with dummy values if env vars missing
-    if "development" in os.environ.get("APP_ENV", "development").lower():
-        import warnings
-        warnings.warn(f"Could not load settings: {e}. Using default values for development.")
-        
-        os.environ.setdefault("AMZ_ACCESS_KEY", "dummy_access_key")
-        os.environ.setdefault("AMZ_SECRET_KEY", "dummy_secret_key") 
-        os.environ.setdefault("AMZ_PARTNER_TAG", "savingsgurucc-20")
-        
-        settings = Settings()
-    else:
-        raise
\ No newline at end of file
+def __getattr__(name: str):
+    # `from .settings import settings` still works; the instance is built on first access
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,233 @@
+"""
+Horizontal sharding of ASIN lookups across worker processes.
+A coordinator assigns ASINs to shards with a consistent-hash ring and queues them
+in the SQLite job queue; each worker process drains its own shard with its own
+PAAPI credentials, throttle and cache directory, and the results merge back
+into the coordinator's deal pipeline.
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .settings import Settings, get_settings
+from .models import AmazonProduct
+from .job_queue import QUEUE_FILE_NAME, JobQueue, TaskStatus
+
+
+# Counters a worker reports back for the coordinator's run statistics
+WORKER_STATS = ('paapi_success', 'scraping_success', 'products_skipped', 'negative_cache_skips')
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+    Adding or removing a shard only moves about 1/N of the keys, so each
+    shard's negative cache stays valid when the worker count changes.
+    """
+
+    def __init__(self, nodes: Sequence[int], replicas: int = 100):
+        self.nodes = list(nodes)
+        points = sorted(
+            (_ring_hash(f"shard-{node}#{replica}"), node)
+            for node in self.nodes for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> int:
+        """Shard owning `key`."""
+        index = bisect.bisect(self._hashes, _ring_hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+    def partition(self, keys: Sequence[str]) -> Dict[int, List[str]]:
+        """Group keys by owning shard (every shard present, possibly empty)."""
+        shards: Dict[int, List[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            shards[self.node_for(key)].append(key)
+        return shards
+
+
+def parse_credentials(value: str) -> List[Tuple[str, str, str]]:
+    """Parse "key:secret:tag,key2:secret2:tag2" into (access key, secret key, partner tag) tuples."""
+    credentials = []
+    for entry in value.split(','):
+        parts = [part.strip() for part in entry.split(':')]
+        if len(parts) == 3 and all(parts):
+            credentials.append(tuple(parts))
+        elif entry.strip():
+            raise ValueError("PAAPI credentials must be key:secret:tag entries")
+    return credentials
+
+
+def shard_settings(settings: Settings, shard: int) -> Settings:
+    """
+    Settings for one shard worker: its own cache directory and, when extra
+    PAAPI credentials are configured, its own credential set (round-robin).
+    """
+    update = {'state_dir': str(Path(settings.state_dir) / "shards" / str(shard))}
+
+    credentials = parse_credentials(settings.paapi_credentials)
+    if credentials:
+        access_key, secret_key, partner_tag = credentials[shard % len(credentials)]
+        update.update(amz_access_key=access_key, amz_secret_key=secret_key, amz_partner_tag=partner_tag)
+
+    return settings.model_copy(update=update)
+
+
+def queue_path(settings: Settings) -> str:
+    return str(Path(settings.state_dir) / QUEUE_FILE_NAME)
+
+
+class ShardWorker:
+    """
+    Drains one shard of a run from the job queue.
+    Runs in its own process, so its PAAPI throttle and HTTP clients are independent of other shards.
+    """
+
+    def __init__(self, settings: Settings, db_path: str, run_id: str, shard: int, batch_size: int = 10):
+        self.settings = shard_settings(settings, shard)
+        self.db_path = db_path
+        self.run_id = run_id
+        self.shard = shard
+        self.batch_size = batch_size
+        self.worker_id = f"shard-{shard}-{uuid.uuid4().hex[:8]}"
+
+    async def run(self) -> Dict[str, int]:
+        """Resolve every claimable ASIN of this shard. Returns the worker's counters."""
+        from .focused_scraper import FocusedScraper
+
+        queue = JobQueue(self.db_path)
+        try:
+            async with FocusedScraper(self.settings) as scraper:
+                while True:
+                    asins = queue.claim(self.run_id, self.worker_id, shard=self.shard, limit=self.batch_size)
+                    if not asins:
+                        break
+
+                    try:
+                        products = await scraper.get_real_product_data(asins)
+                    except Exception as e:
+                        logger.error(f"{self.worker_id} failed a batch of {len(asins)}: {e}")
+                        for asin in asins:
+                            queue.fail(self.run_id, asin, str(e))
+                        continue
+
+                    for asin in asins:
+                        product = products.get(asin)
+                        queue.complete(self.run_id, asin, product.model_dump_json() if product else None)
+
+                return {key: scraper.stats[key] for key in WORKER_STATS}
+        finally:
+            queue.close()
+
+
+def run_shard_worker(settings: Settings, db_path: str, run_id: str, shard: int, batch_size: int = 10) -> Dict[str, int]:
+    """Process entry point for a shard worker."""
+    return asyncio.run(ShardWorker(settings, db_path, run_id, shard, batch_size).run())
+
+
+class ShardCoordinator:
+    """
+    Partitions ASINs across shard workers and merges their results.
+    Local workers are spawned as processes; workers on other hosts can drain
+    the same run by pointing `python -m scraper.sharding worker` at a shared queue file.
+    """
+
+    def __init__(self, settings: Settings, workers: Optional[int] = None, db_path: Optional[str] = None):
+        self.settings = settings
+        self.workers = max(1, workers or settings.shard_workers)
+        self.db_path = db_path or queue_path(settings)
+        self.ring = ConsistentHashRing(range(self.workers))
+
+    async def _run_shards(self, run_id: str, shards: List[int]) -> List[Dict[str, int]]:
+        """Run one worker process per shard and wait for all of them."""
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, run_shard_worker, self.settings, self.db_path, run_id, shard, self.settings.shard_claim_batch
+                )
+                for shard in shards
+            ), return_exceptions=True)
+
+        stats = []
+        for shard, result in zip(shards, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Shard {shard} worker crashed: {result}")
+            else:
+                stats.append(result)
+        return stats
+
+    async def resolve_products(self, asins: List[str]) -> Tuple[Dict[str, Optional[AmazonProduct]], Dict[str, int]]:
+        """
+        Resolve ASINs across the shard workers.
+
+        Returns:
+            (ASIN -> product or None, summed worker counters)
+        """
+        run_id = f"shard_{uuid.uuid4().hex}"
+        partition = self.ring.partition(asins)
+        busy = [shard for shard, keys in partition.items() if keys]
+
+        queue = JobQueue(self.db_path)
+        try:
+            queue.enqueue(run_id, ((asin, shard) for shard, keys in partition.items() for asin in keys))
+            sizes = {shard: len(partition[shard]) for shard in busy}
+            logger.info(f"Run {run_id}: sharded {len(asins)} ASINs across {len(busy)} workers {sizes}")
+
+            worker_stats = await self._run_shards(run_id, busy)
+
+            # A crashed worker leaves its shard in flight; give those tasks one more pass
+            if queue.release_stale(run_id, older_than=0.0):
+                worker_stats += await self._run_shards(run_id, busy)
+
+            stored = queue.results(run_id)
+            counts = queue.counts(run_id)
+            queue.delete_run(run_id)
+        finally:
+            queue.close()
+
+        if counts[TaskStatus.FAILED.value]:
+            logger.warning(f"{counts[TaskStatus.FAILED.value]} sharded lookups failed")
+
+        products: Dict[str, Optional[AmazonProduct]] = {}
+        for asin in asins:
+            result = stored.get(asin)
+            products[asin] = AmazonProduct.model_validate_json(result) if result else None
+
+        totals = {key: sum(stats.get(key, 0) for stats in worker_stats) for key in WORKER_STATS}
+        return products, totals
+
+
+def main():
+    """Run a standalone shard worker against a (shared) queue file."""
+    parser = argparse.ArgumentParser(description='Drain one shard of a sharded ASIN lookup run')
+    parser.add_argument('worker', choices=['worker'], help='Run a shard worker')
+    parser.add_argument('--run-id', required=True, help='Run to drain (logged by the coordinator)')
+    parser.add_argument('--shard', type=int, required=True, help='Shard number owned by this worker')
+    parser.add_argument('--queue', default=None, help='Queue database (default: <state_dir>/job_queue.sqlite)')
+    args = parser.parse_args()
+
+    settings = get_settings()
+    stats = run_shard_worker(settings, args.queue or queue_path(settings), args.run_id, args.shard,
+                             settings.shard_claim_batch)
+    print(f"Shard {args.shard} done: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Request coalescing (single-flight) for duplicate ASIN lookups.
+Concurrent callers asking for the same ASIN share one in-flight PAAPI/scrape call.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class SingleFlight:
+    """
+    Shares one in-flight future per key with every concurrent waiter.
+    Negative results are memoized for a short TTL so invalid ASINs
+    do not consume retry budget on every lookup.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        negative_ttl: float = 300.0,
+        is_negative: Optional[Callable[[Any], bool]] = None
+    ):
+        """Initialize the single-flight group."""
+        self.name = name
+        self.negative_ttl = negative_ttl
+        self.is_negative = is_negative or (lambda result: result is None)
+
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._negative_until: Dict[str, float] = {}
+
+        self.stats = {
+            'calls': 0,
+            'coalesced': 0,
+            'negative_hits': 0
+        }
+
+    def is_negative_cached(self, key: str) -> bool:
+        """Check whether a key has a live negative memo entry."""
+        expires_at = self._negative_until.get(key)
+        if expires_at is None:
+            return False
+
+        if time.monotonic() >= expires_at:
+            del self._negative_until[key]
+            return False
+
+        return True
+
+    def forget(self, key: str) -> None:
+        """Drop any negative memo entry for a key."""
+        self._negative_until.pop(key, None)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func for key, or join the call already in flight for it.
+
+        Args:
+            key: Deduplication key (usually the ASIN)
+            func: Zero-argument coroutine factory doing the real work
+
+        Returns:
+            The shared result, or None if the key is negatively cached
+        """
+        if self.is_negative_cached(key):
+            self.stats['negative_hits'] += 1
+            logger.debug(f"[{self.name}] Negative cache hit for {key}")
+            return None
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            logger.debug(f"[{self.name}] Joining in-flight lookup for {key}")
+            # Shield so one cancelled waiter does not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.stats['calls'] += 1
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if self.negative_ttl > 0 and self.is_negative(result):
+                self._negative_until[key] = time.monotonic() + self.negative_ttl
+            return result
+        finally:
+            self._in_flight.pop(key, None)
@@ -0,0 +1,291 @@
+"""
+Binary snapshot of working state: the deal set, resolved products and price history.
+A fixed-layout record table sorted by (kind, key) points into a string table of
+keys and a region of per-record JSON payloads. Readers memory-map the file, so
+"is this ASIN known and fresh" is a binary search over the table and nothing is
+decoded until a record is actually asked for.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+SNAPSHOT_NAME = "state.snap"
+
+MAGIC = b"SGSS"
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, records, created at, then section offsets: record table, strings, payloads
+HEADER = struct.Struct("<4sHHIdQQQ")
+# kind, key length, key offset, updated at (epoch seconds), payload offset, payload length
+RECORD = struct.Struct("<BxHIdQI")
+
+KIND_DEAL = 1
+KIND_PRODUCT = 2
+KIND_PRICE_HISTORY = 3
+
+KIND_NAMES = {KIND_DEAL: "deal", KIND_PRODUCT: "product", KIND_PRICE_HISTORY: "price history"}
+
+# (key, updated at, payload)
+SnapshotRecord = Tuple[str, float, bytes]
+
+ModelT = TypeVar('ModelT', bound='BaseModel')
+
+
+def build_snapshot(records: Iterable[Tuple[int, str, float, bytes]]) -> bytes:
+    """
+    Serialize (kind, key, updated_at, payload) records; a repeated (kind, key) keeps the last one.
+
+    Returns:
+        Snapshot bytes, readable with Snapshot
+    """
+    unique: Dict[Tuple[int, bytes], Tuple[float, bytes]] = {}
+    for kind, key, updated_at, payload in records:
+        unique[(kind, key.encode('utf-8'))] = (updated_at, payload)
+
+    record_table = bytearray()
+    strings = bytearray()
+    payloads = bytearray()
+    for (kind, key), (updated_at, payload) in sorted(unique.items()):
+        record_table += RECORD.pack(kind, len(key), len(strings), updated_at, len(payloads), len(payload))
+        strings += key
+        payloads += payload
+
+    records_at = HEADER.size
+    strings_at = records_at + len(record_table)
+    payloads_at = strings_at + len(strings)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(unique), time.time(), records_at, strings_at, payloads_at)
+    return b"".join([header, bytes(record_table), bytes(strings), bytes(payloads)])
+
+
+class Snapshot:
+    """
+    Read-only view over a serialized snapshot.
+    Works on bytes or an mmap; payloads are only copied out and decoded on request.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """Wrap a buffer produced by build_snapshot."""
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._view = memoryview(buffer)
+
+        (magic, version, _, self.record_count, self.created_at,
+         self._records_at, self._strings_at, self._payloads_at) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a state snapshot (magic={magic!r}, version={version})")
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'Snapshot':
+        """Memory-map a snapshot file."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def open_if_valid(cls, path: Union[str, Path]) -> Optional['Snapshot']:
+        """Open a snapshot, or None if it is missing or unreadable."""
+        try:
+            return cls.open(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable state snapshot {path}: {e}")
+            return None
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    # ------------------------------------------------------------------
+    # Raw access
+    # ------------------------------------------------------------------
+
+    def _record(self, number: int) -> Tuple[int, bytes, float, int, int]:
+        kind, key_length, key_offset, updated_at, payload_offset, payload_length = RECORD.unpack_from(
+            self._view, self._records_at + number * RECORD.size
+        )
+        start = self._strings_at + key_offset
+        return kind, self._view[start:start + key_length].tobytes(), updated_at, payload_offset, payload_length
+
+    def _lower_bound(self, kind: int, key: bytes) -> int:
+        """First record number whose (kind, key) is >= the given one."""
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[:2] < (kind, key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, kind: int, key: str) -> Optional[Tuple[float, int, int]]:
+        encoded = key.encode('utf-8')
+        number = self._lower_bound(kind, encoded)
+        if number < self.record_count:
+            found_kind, found_key, updated_at, payload_offset, payload_length = self._record(number)
+            if (found_kind, found_key) == (kind, encoded):
+                return updated_at, payload_offset, payload_length
+        return None
+
+    def _payload(self, offset: int, length: int) -> bytes:
+        start = self._payloads_at + offset
+        return self._view[start:start + length].tobytes()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def __contains__(self, item: Tuple[int, str]) -> bool:
+        return self._find(*item) is not None
+
+    def updated_at(self, kind: int, key: str) -> Optional[float]:
+        """Epoch seconds the record was last updated, or None if it is not in the snapshot."""
+        found = self._find(kind, key)
+        return found[0] if found else None
+
+    def is_fresh(self, kind: int, key: str, max_age_seconds: float, now: Optional[float] = None) -> bool:
+        """Whether the record exists and was updated within max_age_seconds."""
+        updated_at = self.updated_at(kind, key)
+        return updated_at is not None and (now if now is not None else time.time()) - updated_at <= max_age_seconds
+
+    def payload(self, kind: int, key: str) -> Optional[bytes]:
+        """The record's raw JSON payload."""
+        found = self._find(kind, key)
+        return self._payload(found[1], found[2]) if found else None
+
+    def load(self, kind: int, key: str, model: Type[ModelT]) -> Optional[ModelT]:
+        """Decode one record into a model."""
+        payload = self.payload(kind, key)
+        return model.model_validate_json(payload) if payload is not None else None
+
+    def records(self, kind: int) -> Iterator[SnapshotRecord]:
+        """(key, updated_at, raw payload) for every record of a kind, in key order."""
+        number = self._lower_bound(kind, b"")
+        while number < self.record_count:
+            found_kind, key, updated_at, payload_offset, payload_length = self._record(number)
+            if found_kind != kind:
+                break
+            yield key.decode('utf-8'), updated_at, self._payload(payload_offset, payload_length)
+            number += 1
+
+    def keys(self, kind: int) -> List[str]:
+        return [key for key, _, _ in self.records(kind)]
+
+    def count(self, kind: int) -> int:
+        return self._lower_bound(kind + 1, b"") - self._lower_bound(kind, b"")
+
+
+def update_snapshot(
+    path: Union[str, Path],
+    kind: int,
+    records: Iterable[SnapshotRecord],
+    keep_existing: bool = False,
+    max_age_seconds: Optional[float] = None
+) -> bool:
+    """
+    Replace one kind's records in the snapshot at `path`, copying other kinds over raw
+    (without decoding). With keep_existing, earlier records of the kind that were not
+    replaced are kept too, unless older than max_age_seconds. Written atomically, so
+    open readers keep the old file.
+    """
+    path = Path(path)
+    combined: List[Tuple[int, str, float, bytes]] = []
+    cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
+
+    previous = Snapshot.open_if_valid(path)
+    if previous is not None:
+        try:
+            for other_kind in KIND_NAMES:
+                if other_kind == kind and not keep_existing:
+                    continue
+                for key, updated_at, payload in previous.records(other_kind):
+                    if other_kind == kind and cutoff is not None and updated_at < cutoff:
+                        continue
+                    combined.append((other_kind, key, updated_at, payload))
+        finally:
+            previous.close()
+
+    combined.extend((kind, key, updated_at, payload) for key, updated_at, payload in records)
+
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(build_snapshot(combined))
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        logger.error(f"Failed to write state snapshot {path}: {e}")
+        return False
+
+
+def epoch(value: Union[str, datetime, None]) -> float:
+    """Epoch seconds of an ISO timestamp or datetime (naive values are UTC); 0.0 if unknown."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return 0.0
+    if not isinstance(value, datetime):
+        return 0.0
+    if value.tzinfo is None:
+        return (value - datetime(1970, 1, 1)).total_seconds()
+    return value.timestamp()
+
+
+def main():
+    """Report whether ASINs are known and fresh, reading only the snapshot's record table."""
+    parser = argparse.ArgumentParser(description='Look up ASINs in the state snapshot')
+    parser.add_argument('asins', nargs='+', help='ASINs to look up')
+    parser.add_argument('--snapshot', default=None, help='Snapshot file (default: <state_dir>/state.snap)')
+    parser.add_argument('--max-age-hours', type=float, default=None,
+                        help='Freshness window (default: DEAL_FRESHNESS_HOURS)')
+    args = parser.parse_args()
+
+    from .settings import get_settings
+    settings = get_settings()
+    path = args.snapshot or str(Path(settings.state_dir) / SNAPSHOT_NAME)
+    max_age = (args.max_age_hours if args.max_age_hours is not None else settings.deal_freshness_hours) * 3600
+
+    snapshot = Snapshot.open_if_valid(path)
+    if snapshot is None:
+        print(f"No state snapshot at {path}")
+        return 1
+
+    now = time.time()
+    with snapshot:
+        for asin in args.asins:
+            states = []
+            for kind, name in KIND_NAMES.items():
+                updated_at = snapshot.updated_at(kind, asin.upper())
+                if updated_at is not None:
+                    age_hours = (now - updated_at) / 3600
+                    states.append(f"{name} {'fresh' if now - updated_at <= max_age else 'stale'} ({age_hours:.1f}h)")
+            print(f"{asin.upper()}: {', '.join(states) if states else 'unknown'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,7 +20,7 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 
 
 @pytest.fixture
-def test_settings() -> Settings:
+def test_settings(tmp_path) -> Settings:
     """Create test settings with dummy values."""
     import os
     
@@ -30,6 +30,9 @@ def test_settings() -> Settings:
     os.environ["AMZ_PARTNER_TAG"] = "test-tag-20"
     os.environ["APP_ENV"] = "testing"
     
+    # Keep persistent scraper state out of the working tree
+    os.environ["STATE_DIR"] = str(tmp_path / "state")
+    
     return Settings()
 
 
@@ -0,0 +1,85 @@
+"""
+Shared builders for scraper tests: products, deals, export records and SavingsGuru pages.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from unittest.mock import AsyncMock
+
+from ..focused_scraper import FocusedScraper
+from ..models import AmazonProduct, DataSource, Deal
+
+
+def make_product(
+    asin: str = "B08N5WRWNW",
+    price: str = "19.99",
+    list_price: Optional[str] = "39.99",
+    title: Optional[str] = None
+) -> AmazonProduct:
+    """A PAAPI product with a real price (half off by default)."""
+    return AmazonProduct(
+        asin=asin, title=title or f"Test Product {asin}", current_price=Decimal(price),
+        list_price=Decimal(list_price) if list_price else None, image_url="https://example.com/image.jpg",
+        data_source=DataSource.PAAPI
+    )
+
+
+def make_deal(
+    asin: str = "B08N5WRWNW",
+    title: str = "Test Product",
+    price: float = 29.99,
+    discount: int = 40,
+    date_added: Optional[str] = None
+) -> Deal:
+    """A deal added now (or at `date_added`) whose original price matches the discount."""
+    return Deal(
+        id=f"deal_{asin}", title=title, image_url="https://example.com/image.jpg",
+        price=price, original_price=round(price / (1 - discount / 100), 2), discount_percent=discount,
+        category="Electronics", description="Test", affiliate_url=f"https://www.amazon.ca/dp/{asin}?tag=test-20",
+        featured=False, date_added=date_added or datetime.utcnow().isoformat(), data_source=DataSource.PAAPI,
+        asin=asin
+    )
+
+
+def make_record(
+    deal_id: str,
+    price: float,
+    discount: int = 20,
+    category: str = "General",
+    featured: bool = False
+) -> dict:
+    """A minimal exported deal record, as the exporter and query API see them."""
+    return {
+        "id": deal_id,
+        "title": f"Deal {deal_id}",
+        "price": price,
+        "discount_percent": discount,
+        "category": category,
+        "featured": featured,
+        "asin": deal_id.upper().ljust(10, "0")[:10],
+        "date_added": "2025-01-01T00:00:00",
+    }
+
+
+def page_html(asins) -> bytes:
+    """A SavingsGuru listing page with one post per ASIN."""
+    articles = "".join(
+        f'<article class="post"><h2><a href="/deal-{asin}">Deal {asin}</a></h2>'
+        f'<a href="https://amazon.ca/dp/{asin}">Buy</a></article>'
+        for asin in asins
+    )
+    return f"<html><body>{articles}</body></html>".encode()
+
+
+def make_scraper(settings, pages) -> FocusedScraper:
+    """A scraper reading listing pages from `pages` (anything with an async get) and never scraping Amazon."""
+    scraper = FocusedScraper(settings)
+    scraper.page_client = pages
+    scraper.scraper_client = AsyncMock()
+    return scraper
+
+
+async def lookup(self, asins):
+    """Stand-in for FocusedScraper.get_real_product_data that resolves every ASIN."""
+    return {asin: make_product(asin) for asin in asins}
@@ -0,0 +1,175 @@
+"""
+Tests for the SavingsGuru archive backfill.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from ..backfill import BACKFILL_FILE_NAME, ArchiveCrawler, archive_roots, page_url, run_backfill, seed_price_history
+from ..deal_export import DealExporter
+from ..focused_scraper import FocusedScraper
+from ..post_store import PostStore
+from .helpers import lookup, make_scraper, page_html
+
+
+class ArchivePages:
+    """SavingsGuru stand-in with `pages` pages per archive, two ASINs per page, and 404 past the end."""
+
+    def __init__(self, pages: int = 3, failing=()):
+        self.pages = pages
+        self.failing = set(failing)
+        self.requested = []
+        self.in_flight = self.peak = 0
+
+    async def get(self, url):
+        self.requested.append(url)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if url in self.failing:
+            raise httpx.ConnectError("connection reset")
+        root, _, page = url.partition("/page/")
+        page = int(page or 1)
+        if page > self.pages:
+            return SimpleNamespace(status_code=404, content=b"")
+        month = root.rsplit("/", 1)[-1]
+        return SimpleNamespace(status_code=200, content=page_html([f"B0{month}{page:02d}BFK{n}" for n in "AB"]))
+
+
+def make_crawler(settings, pages, store, concurrency: int = 3) -> ArchiveCrawler:
+    scraper = make_scraper(settings, pages)
+    return ArchiveCrawler(scraper, store, concurrency=concurrency, max_pages=10)
+
+
+class TestArchiveRoots:
+    """Test archive selection."""
+
+    def test_months_and_categories(self):
+        """Test that month archives run newest first across a year boundary, then categories."""
+        assert archive_roots("2023-11", "2024-02", ["electronics"]) == [
+            "/2024/02", "/2024/01", "/2023/12", "/2023/11", "/category/electronics"
+        ]
+        assert archive_roots() == [""]
+        assert page_url("/2024/01", 3) == "https://www.savingsguru.ca/2024/01/page/3"
+
+
+class TestArchiveCrawler:
+    """Test concurrent crawling, end detection and resume."""
+
+    @pytest.mark.asyncio
+    async def test_crawls_archives_concurrently_until_404(self, test_settings, tmp_path):
+        """Test that pages are fetched in parallel, each archive stops at its 404, and posts land in the store."""
+        store = PostStore(str(tmp_path / "backfill.sqlite"), scratch=False)
+        pages = ArchivePages(pages=3)
+        crawler = make_crawler(test_settings, pages, store)
+
+        stats = await crawler.run(["/2024/02", "/2024/01"])
+
+        assert stats['pages_fetched'] == 6 and stats['new_asins'] == 12
+        assert store.count_posts() == 12
+        assert pages.peak > 1
+        # At most one wasted fetch per worker past each archive's end
+        assert len(pages.requested) <= 6 + 2 * 3
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_resume_fetches_only_missing_pages(self, test_settings, tmp_path, monkeypatch):
+        """Test that a rerun skips recorded pages and archive ends, retrying only the failed page."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        settings = test_settings.model_copy(update={'max_retry_attempts': 1})
+        path = str(tmp_path / "backfill.sqlite")
+        failing = page_url("/2024/01", 2)
+
+        store = PostStore(path, scratch=False)
+        first = await make_crawler(settings, ArchivePages(failing=[failing]), store).run(["/2024/01"])
+        store.close()
+        assert first['pages_failed'] == 1
+
+        store = PostStore(path, scratch=False)
+        pages = ArchivePages()
+        second = await make_crawler(settings, pages, store).run(["/2024/01"])
+
+        assert pages.requested == [failing]
+        assert second['pages_resumed'] == 2 and second['new_asins'] == 2
+        assert store.count_asins() == 6
+        store.close()
+
+
+class TestSeeding:
+    """Test seeding the deal store and price history from the backfill store."""
+
+    @pytest.mark.asyncio
+    async def test_interrupted_seeding_resumes_after_last_commit(self, test_settings, tmp_path, monkeypatch):
+        """Test that ASINs committed before an interruption are not looked up again, and history is seeded once."""
+        settings = test_settings.model_copy(update={'target_deal_count': 2, 'checkpoint_batch_size': 2})
+        store = PostStore(str(tmp_path / "backfill.sqlite"), scratch=False)
+        await make_crawler(settings, ArchivePages(pages=3), store).run(["/2024/01"])
+
+        looked_up = []
+
+        async def failing_lookup(self, asins):
+            looked_up.extend(asins)
+            if len(looked_up) > 2:
+                raise RuntimeError("interrupted")
+            return await lookup(self, asins)
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", failing_lookup)
+        scraper = make_scraper(settings, ArchivePages())
+        output = tmp_path / "deals.json"
+        with pytest.raises(RuntimeError):
+            await scraper.deals_from_store(store, str(output))
+
+        looked_up.clear()
+
+        async def resumed_lookup(self, asins):
+            looked_up.extend(asins)
+            return await lookup(self, asins)
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", resumed_lookup)
+        scraper = make_scraper(settings, ArchivePages())
+        await scraper.deals_from_store(store, str(output))
+
+        # The first batch was committed before the interruption
+        assert len(looked_up) == 4
+        assert len(json.loads(output.read_text())) > 0
+        assert list(store.asin_batches(10)) == []
+        assert store.count_products() == 6
+
+        assert seed_price_history(settings, scraper, store) == 6
+        assert seed_price_history(settings, scraper, store) == 0
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_export_keeps_store_for_rerun(self, test_settings, tmp_path, monkeypatch):
+        """Test that the backfill store survives a failed deal export and is removed once a rerun commits."""
+        settings = test_settings.model_copy(update={'target_deal_count': 2, 'checkpoint_batch_size': 2})
+        store_path = tmp_path / "state" / BACKFILL_FILE_NAME
+        output = str(tmp_path / "deals.json")
+
+        async def enter(self):
+            self.page_client = SimpleNamespace(get=ArchivePages(pages=2).get, aclose=AsyncMock())
+            self.scraper_client = AsyncMock()
+            return self
+
+        monkeypatch.setattr(FocusedScraper, "__aenter__", enter)
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        monkeypatch.setattr(DealExporter, "export", lambda self, deals_data, output_path: False)
+
+        stats = await run_backfill(settings, ["/2024/01"], output, max_pages=5)
+        assert stats['pages_failed'] == 0
+        assert store_path.exists()
+        store = PostStore(str(store_path), scratch=False)
+        assert store.count_unresolved() == 4
+        store.close()
+
+        monkeypatch.undo()
+        monkeypatch.setattr(FocusedScraper, "__aenter__", enter)
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        await run_backfill(settings, ["/2024/01"], output, max_pages=5)
+        assert not store_path.exists()
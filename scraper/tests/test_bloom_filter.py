@@ -0,0 +1,159 @@
+"""
+Tests for the persistent Bloom-filter seen sets.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ..bloom_filter import BloomFilter, SeenStore, optimal_parameters
+from ..focused_scraper import FocusedScraper
+from ..models import NegativeReason, SavingsGuruPost
+from .helpers import make_product, make_scraper, page_html
+
+
+def make_post(url: str, links=None) -> SavingsGuruPost:
+    return SavingsGuruPost(
+        post_id=f"sg_{url}", post_title="Deal", post_url=url,
+        amazon_short_links=links or [], extracted_asins=["B08N5WRWNW"]
+    )
+
+
+class TestBloomFilter:
+    """Test sizing, membership and persistence."""
+
+    def test_optimal_parameters(self):
+        """Test the textbook sizing for 1% false positives."""
+        bits, hashes = optimal_parameters(1000, 0.01)
+
+        assert 9584 <= bits <= 9592
+        assert hashes == 7
+
+    def test_no_false_negatives_and_bounded_false_positives(self, tmp_path):
+        """Test that added items are always found and unrelated items rarely are."""
+        bloom = BloomFilter(str(tmp_path / "asin.bloom"), capacity=5000, fp_rate=0.01)
+        bloom.update(f"B{i:09d}" for i in range(5000))
+
+        assert all(f"B{i:09d}" in bloom for i in range(5000))
+        false_positives = sum(f"X{i:09d}" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.02
+        bloom.close()
+
+    def test_persists_across_reopen(self, tmp_path):
+        """Test that items and the count survive closing and reopening the file."""
+        path = str(tmp_path / "post_url.bloom")
+        bloom = BloomFilter(path, capacity=100)
+        assert bloom.add("https://www.savingsguru.ca/a")
+        assert not bloom.add("https://www.savingsguru.ca/a")
+        bloom.close()
+
+        reopened = BloomFilter(path)
+        assert "https://www.savingsguru.ca/a" in reopened
+        assert len(reopened) == 1
+        assert reopened.capacity == 100
+        reopened.close()
+
+    def test_rejects_foreign_files(self, tmp_path):
+        """Test that a non-filter file is refused instead of being overwritten."""
+        path = tmp_path / "asin.bloom"
+        path.write_bytes(b"not a filter" * 10)
+
+        with pytest.raises(ValueError):
+            BloomFilter(str(path))
+
+
+class TestSeenStore:
+    """Test generational rotation."""
+
+    def test_contains_does_not_create_files(self, tmp_path):
+        """Test that lookups against an empty store leave the disk untouched."""
+        store = SeenStore(str(tmp_path / "seen"))
+
+        assert not store.contains("asin", "B08N5WRWNW")
+        assert not (tmp_path / "seen").exists()
+
+    def test_rebuild_when_saturated_keeps_previous_generation(self, tmp_path):
+        """Test that a full generation rotates out but is still consulted."""
+        store = SeenStore(str(tmp_path / "seen"), capacity=10)
+        store.add("asin", [f"A{i}" for i in range(10)])
+        store.add("asin", ["NEW"])
+
+        assert store.contains("asin", "A3")
+        assert store.contains("asin", "NEW")
+        assert (tmp_path / "seen" / "asin.prev.bloom").exists()
+
+        # A second rotation forgets items not seen since the first one
+        store.rebuild("asin")
+        store.rebuild("asin")
+        assert not store.contains("asin", "A5")
+        store.close()
+
+    def test_rebuild_when_old(self, tmp_path):
+        """Test that a generation older than rebuild_days is rotated on open."""
+        store = SeenStore(str(tmp_path / "seen"), rebuild_days=1.0)
+        store.add("short_link", ["https://amzn.to/abc"])
+        store.close()
+
+        current = tmp_path / "seen" / "short_link.bloom"
+        bloom = BloomFilter(str(current))
+        bloom.created_at = time.time() - 2 * 86400
+        bloom.close()
+
+        reopened = SeenStore(str(tmp_path / "seen"), rebuild_days=1.0)
+        assert reopened.contains("short_link", "https://amzn.to/abc")
+        assert os.path.exists(tmp_path / "seen" / "short_link.prev.bloom")
+        reopened.close()
+
+
+class TestFocusedScraperSeenPosts:
+    """Test that processed posts are remembered across runs."""
+
+    def test_skips_posts_from_earlier_runs(self, test_settings):
+        """Test post URL and short link matching."""
+        scraper = FocusedScraper(test_settings)
+        scraper.remember_processed_posts([
+            make_post("https://www.savingsguru.ca/old", ["https://amzn.to/old"])
+        ], {"B08N5WRWNW"})
+
+        # A fresh scraper (next run) reads the same filters from disk
+        scraper = FocusedScraper(test_settings)
+        posts = [
+            make_post("https://www.savingsguru.ca/old"),
+            make_post("https://www.savingsguru.ca/repost", ["https://amzn.to/old"]),
+            make_post("https://www.savingsguru.ca/new", ["https://amzn.to/old", "https://amzn.to/new"]),
+        ]
+
+        unseen = scraper.filter_unseen_posts(posts)
+
+        assert [str(post.post_url) for post in unseen] == ["https://www.savingsguru.ca/new"]
+        assert scraper.stats['seen_posts_skipped'] == 2
+
+    @pytest.mark.asyncio
+    async def test_post_with_blocked_asin_is_fetched_again(self, test_settings, tmp_path, monkeypatch):
+        """Test that only posts whose ASINs all resolved or are gone for good are remembered."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        resolved, blocked, missing = "B0SEEN0001", "B0SEEN0002", "B0SEEN0003"
+        pages = SimpleNamespace(get=AsyncMock(return_value=SimpleNamespace(
+            status_code=200, content=page_html([resolved, blocked, missing])
+        )))
+
+        async def paapi(asin):
+            return make_product(asin) if asin == resolved else None
+
+        def run_scraper():
+            scraper = make_scraper(test_settings, pages)
+            scraper._try_paapi = paapi
+            scraper.scraper_client.scrape_product = AsyncMock(return_value=None)
+            scraper.scraper_client.failure_reasons = {blocked: NegativeReason.BLOCKED, missing: NegativeReason.NOT_FOUND}
+            return scraper
+
+        await run_scraper().scrape_deals(max_pages=1, output_file=str(tmp_path / "deals.json"))
+
+        scraper = run_scraper()
+        posts = await scraper.scrape_savingsguru_posts(max_pages=1)
+        unseen = scraper.filter_unseen_posts(posts)
+
+        assert [post.extracted_asins for post in unseen] == [[blocked]]
@@ -0,0 +1,68 @@
+"""
+Tests for the shared keyword categorizer.
+"""
+
+import json
+
+from ..categorizer import Categorizer, get_categorizer, keyword_variants
+
+
+class TestCategorizer:
+    """Test matching rules and weighted scoring."""
+
+    def test_default_config_categories(self):
+        """Test the shipped config on representative titles."""
+        categorizer = get_categorizer()
+
+        assert categorizer.categorize("Apple iPhone 13") == "Electronics"
+        assert categorizer.categorize("LEGO Building Set") == "Toys & Games"
+        assert categorizer.categorize("Gaiam Yoga Mat") == "Sports"
+        assert categorizer.categorize("Random Deal") == "General"
+
+    def test_word_boundaries(self):
+        """Test that keywords only match whole words."""
+        categorizer = Categorizer([{"name": "Books", "keywords": ["book"]}])
+
+        assert categorizer.categorize("Notebook Stand") == "General"
+        assert categorizer.categorize("Cook book") == "Books"
+
+    def test_plural_forms(self):
+        """Test that simple plurals of keywords match."""
+        assert keyword_variants("accessory") == ["accessory", "accessories", "accessorys", "accessoryes"]
+
+        categorizer = Categorizer([{"name": "Toys", "keywords": ["toy", {"keyword": "lego", "plural": False}]}])
+        assert categorizer.categorize("Dog Toys") == "Toys"
+        assert categorizer.categorize("Legos") == "General"
+
+    def test_weights_decide_between_categories(self):
+        """Test that the highest weighted score wins and ties go to config order."""
+        categorizer = Categorizer([
+            {"name": "Clothing", "keywords": ["shoe"]},
+            {"name": "Sports", "keywords": [{"keyword": "running", "weight": 0.5}, "trail"]},
+        ])
+
+        assert categorizer.categorize("Running Shoes") == "Clothing"
+        assert categorizer.categorize("Trail Running Shoes") == "Sports"
+        assert categorizer.scores("Trail Running Shoes") == {"Clothing": 1.0, "Sports": 1.5}
+
+    def test_multi_word_keywords_prefer_longest(self):
+        """Test that a phrase keyword wins over its shorter prefix keyword."""
+        categorizer = Categorizer([
+            {"name": "Home", "keywords": ["air fryer"]},
+            {"name": "Outdoors", "keywords": ["air"]},
+        ])
+
+        assert categorizer.scores("Ninja Air Fryer") == {"Home": 1.0}
+
+    def test_from_config_file(self, tmp_path):
+        """Test loading categories from a JSON config file."""
+        config = tmp_path / "categories.json"
+        config.write_text(json.dumps({
+            "default": "Misc",
+            "categories": [{"name": "Pets", "keywords": ["dog", "cat"]}]
+        }))
+
+        categorizer = Categorizer.from_config(str(config))
+
+        assert categorizer.categorize("Cat Tree") == "Pets"
+        assert categorizer.categorize("Desk Lamp") == "Misc"
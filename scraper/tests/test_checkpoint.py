@@ -0,0 +1,127 @@
+"""
+Tests for checkpoint/resume of interrupted scrape runs.
+"""
+
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ..checkpoint import ScrapeCheckpoint
+from ..focused_scraper import FocusedScraper
+from ..models import SavingsGuruPost
+from .helpers import make_product, make_scraper, page_html
+
+
+ASINS = ["B0CKPT0001", "B0CKPT0002", "B0CKPT0003", "B0CKPT0004"]
+
+
+class FakePages:
+    """SavingsGuru stand-in: page 1 lists the first two ASINs, page 2 the rest."""
+
+    def __init__(self, fail_page_two: bool = False):
+        self.fail_page_two = fail_page_two
+        self.requested = []
+
+    async def get(self, url):
+        page = 2 if url.endswith("/page/2") else 1
+        self.requested.append(page)
+        if page == 2 and self.fail_page_two:
+            raise ConnectionError("connection reset")
+        return SimpleNamespace(status_code=200, content=page_html(ASINS[:2] if page == 1 else ASINS[2:]))
+
+
+class TestScrapeCheckpoint:
+    """Test the checkpoint store."""
+
+    def test_round_trip_and_staleness(self, tmp_path):
+        """Test that posts and products persist, and old checkpoints are discarded."""
+        db_path = str(tmp_path / "queue.sqlite")
+        checkpoint = ScrapeCheckpoint(db_path, "public/deals.json")
+        assert not checkpoint.resumed
+        assert checkpoint.pages_to_fetch(2) == [1, 2]
+        checkpoint.record_page(1, [SavingsGuruPost(
+            post_id="sg_1", post_title="Deal", post_url="https://www.savingsguru.ca/a", extracted_asins=[ASINS[0]]
+        )])
+        checkpoint.add_asins(ASINS[:2])
+        checkpoint.claim_asins(2)
+        checkpoint.record_products({ASINS[0]: make_product(ASINS[0]), ASINS[1]: None})
+        checkpoint.close()
+
+        resumed = ScrapeCheckpoint(db_path, "public/deals.json")
+        assert resumed.resumed
+        assert resumed.pages_to_fetch(2) == [2]
+        assert [post.post_id for post in resumed.posts()] == ["sg_1"]
+        products = resumed.products()
+        assert products[ASINS[0]].current_price == Decimal("19.99")
+        assert products[ASINS[1]] is None
+        resumed.close()
+
+        stale = ScrapeCheckpoint(db_path, "public/deals.json", max_age_hours=-1)
+        assert not stale.resumed
+        assert stale.products() == {}
+        stale.close()
+
+
+class TestScraperResume:
+    """Test that a restarted scrape resumes instead of starting over."""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash(self, test_settings, tmp_path, monkeypatch):
+        """Test that finished pages and lookups are not repeated after a crash."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        settings = test_settings.model_copy(update={'checkpoint_batch_size': 1})
+        output = str(tmp_path / "deals.json")
+
+        # First run: page 2 fails, then the process dies during the third lookup
+        lookups = []
+
+        async def crashing_lookup(self, asins):
+            lookups.extend(asins)
+            if len(lookups) == 2:
+                raise RuntimeError("killed")
+            return {asin: make_product(asin) for asin in asins}
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", crashing_lookup)
+        first_pages = FakePages(fail_page_two=True)
+        assert await make_scraper(settings, first_pages).scrape_deals(max_pages=2, output_file=output) == []
+        assert first_pages.requested == [1, 2]
+
+        # Second run: only page 2 and the unfinished lookups happen
+        resumed_lookups = []
+
+        async def lookup(self, asins):
+            resumed_lookups.extend(asins)
+            return {asin: make_product(asin) for asin in asins}
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        second_pages = FakePages()
+        scraper = make_scraper(settings, second_pages)
+        deals = await scraper.scrape_deals(max_pages=2, output_file=output)
+
+        assert second_pages.requested == [2]
+        assert resumed_lookups == ASINS[1:]
+        assert scraper.stats['checkpoint_reused'] == 1
+        assert sorted(deal.asin for deal in deals) == ASINS
+        assert len(json.loads((tmp_path / "deals.json").read_text())) == 4
+
+        # A successful export clears the checkpoint
+        checkpoint = scraper._open_checkpoint(output)
+        assert not checkpoint.resumed
+        checkpoint.close()
+
+    @pytest.mark.asyncio
+    async def test_clean_abort_discards_checkpoint(self, test_settings, tmp_path, monkeypatch):
+        """Test that a run aborting because the feed is empty leaves nothing to resume."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        output = str(tmp_path / "deals.json")
+        pages = SimpleNamespace(get=AsyncMock(return_value=SimpleNamespace(status_code=200, content=page_html([]))))
+        scraper = make_scraper(test_settings, pages)
+
+        assert await scraper.scrape_deals(max_pages=1, output_file=output) == []
+
+        checkpoint = scraper._open_checkpoint(output)
+        assert not checkpoint.resumed
+        checkpoint.close()
@@ -0,0 +1,127 @@
+"""
+Tests for the adaptive (AIMD) upstream concurrency limiter.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ..concurrency import AdaptiveLimiter
+from ..focused_scraper import FocusedScraper
+from ..models import AmazonProduct, DataSource
+from ..scraper_fallback import AmazonScrapingClient
+
+
+async def run_requests(limiter: AdaptiveLimiter, count: int, latency: float = 0.0, throttle=lambda: False):
+    """Send `count` requests through the limiter; returns the peak number in flight."""
+    in_flight = peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limiter.slot() as slot:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(latency)
+            in_flight -= 1
+            if throttle():
+                slot.overloaded()
+
+    await asyncio.gather(*(request() for _ in range(count)))
+    return peak
+
+
+async def no_sleep(*_):
+    return None
+
+
+class TestAdaptiveLimiter:
+    """Test additive increase, multiplicative decrease and admission."""
+
+    @pytest.mark.asyncio
+    async def test_grows_while_healthy_and_caps(self):
+        """Test that healthy responses raise the limit up to the maximum, never exceeding capacity."""
+        # Latency is not under test here; scheduling jitter on 1 ms requests must not read as congestion
+        limiter = AdaptiveLimiter("test", initial=1, max_limit=4, latency_tolerance=100.0)
+
+        peak = await run_requests(limiter, 60, latency=0.001)
+
+        assert limiter.capacity == 4 and limiter.stats['peak_limit'] == 4
+        assert 1 < peak <= 4
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_backs_off_once_per_burst(self):
+        """Test that a burst of throttled responses halves the limit once, not once per response."""
+        limiter = AdaptiveLimiter("test", initial=8, max_limit=8)
+        await run_requests(limiter, 8, latency=0.01)
+
+        await run_requests(limiter, 8, latency=0.01, throttle=lambda: True)
+
+        assert limiter.stats['overloads'] == 8
+        assert limiter.stats['backoffs'] == 1
+        assert limiter.capacity == 4
+
+    @pytest.mark.asyncio
+    async def test_timeouts_overload_other_errors_do_not(self):
+        """Test that overload exceptions cut the limit and unrelated errors leave it alone."""
+        limiter = AdaptiveLimiter("test", initial=4, max_limit=8, overload_exceptions=(asyncio.TimeoutError,))
+
+        with pytest.raises(ValueError):
+            async with limiter.slot():
+                raise ValueError("parse error")
+        assert limiter.capacity == 4
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with limiter.slot():
+                raise asyncio.TimeoutError()
+        assert limiter.capacity == 2 and limiter.in_flight == 0
+
+    def test_disabled_is_sequential(self, test_settings):
+        """Test that turning adaptation off pins every upstream to one request at a time."""
+        settings = test_settings.model_copy(update={'adaptive_concurrency_enabled': False})
+        limiter = AdaptiveLimiter.from_settings("test", settings)
+        assert limiter.capacity == limiter.max_limit == 1
+
+
+class TestUpstreams:
+    """Test that the clients and scraper use the limiters."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_page_shrinks_limit(self, test_settings, monkeypatch):
+        """Test that 429 responses from product pages cut the scraping limiter."""
+        monkeypatch.setattr("asyncio.sleep", no_sleep)
+        client = AmazonScrapingClient(test_settings)
+        client.client = AsyncMock()
+        client.client.get.return_value = MagicMock(status_code=429, content=b"")
+        client.limiter.limit = 8.0
+
+        await client.scrape_product("B08N5WRWNW")
+
+        assert client.limiter.stats['overloads'] == test_settings.max_retry_attempts
+        assert client.limiter.capacity < 8
+
+    @pytest.mark.asyncio
+    async def test_lookups_overlap_and_keep_order(self, test_settings):
+        """Test that ASINs resolve concurrently and results come back in request order."""
+        scraper = FocusedScraper(test_settings)
+        in_flight = peak = 0
+
+        async def slow_paapi(asin):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AmazonProduct(
+                asin=asin, title=f"Product {asin}", current_price=19.99, list_price=39.99,
+                image_url="https://example.com/image.jpg", data_source=DataSource.PAAPI
+            )
+
+        scraper._try_paapi = slow_paapi
+        asins = [f"B0CONC{number:04d}" for number in range(8)]
+        results = await scraper.get_real_product_data(asins)
+
+        assert list(results) == asins and all(results.values())
+        assert peak > 1
+        assert scraper.stats['paapi_success'] == 8
@@ -0,0 +1,152 @@
+"""
+Tests for the long-running scraper daemon and warm deal store.
+"""
+
+import asyncio
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from ..daemon import ScraperDaemon
+from ..deal_manager import DealManager
+from ..focused_scraper import FocusedScraper
+from ..models import AmazonProduct, DataSource
+from .helpers import make_deal, make_product
+
+
+class TestScraperDaemon:
+    """Test in-process scheduling and graceful drain."""
+    
+    @pytest.mark.asyncio
+    async def test_jobs_repeat_until_stopped(self, test_settings):
+        """Test that a scheduled job runs repeatedly on the same loop."""
+        daemon = ScraperDaemon(test_settings)
+        runs = 0
+        
+        async def job():
+            nonlocal runs
+            runs += 1
+        
+        daemon.every(0.01, "tick", job)
+        await asyncio.sleep(0.05)
+        daemon.request_stop()
+        await daemon._drain()
+        
+        assert runs >= 2
+    
+    @pytest.mark.asyncio
+    async def test_stop_drains_in_flight_job(self, test_settings):
+        """Test that shutdown waits for a running job instead of cancelling it."""
+        daemon = ScraperDaemon(test_settings)
+        finished = asyncio.Event()
+        
+        async def slow_job():
+            await asyncio.sleep(0.05)
+            finished.set()
+        
+        daemon.every(3600, "slow", slow_job)
+        await asyncio.sleep(0.01)
+        daemon.request_stop()
+        await daemon._drain()
+        
+        assert finished.is_set()
+    
+    @pytest.mark.asyncio
+    async def test_job_failure_does_not_stop_loop(self, test_settings):
+        """Test that a crashing job is counted and rescheduled."""
+        daemon = ScraperDaemon(test_settings)
+        
+        async def broken_job():
+            raise RuntimeError("boom")
+        
+        daemon.every(0.01, "broken", broken_job)
+        await asyncio.sleep(0.05)
+        daemon.request_stop()
+        await daemon._drain()
+        
+        assert daemon.stats['job_failures'] >= 2
+    
+    @pytest.mark.asyncio
+    async def test_refreshes_pause_during_scrape(self, test_settings):
+        """Test that refresh lookups wait for a running scrape instead of joining its session."""
+        daemon = ScraperDaemon(test_settings)
+        daemon.scraper = FocusedScraper(test_settings)
+        release = asyncio.Event()
+        
+        async def scrape_deals(output_file):
+            await release.wait()
+            return []
+        
+        daemon.scraper.scrape_deals = scrape_deals
+        daemon.scraper.get_real_product_data = AsyncMock(return_value={})
+        
+        scrape = asyncio.create_task(daemon.scrape_job())
+        await asyncio.sleep(0)
+        refresh = asyncio.create_task(daemon._refresh_lookup(["B08N5WRWNW"]))
+        await asyncio.sleep(0.01)
+        daemon.scraper.get_real_product_data.assert_not_called()
+        
+        release.set()
+        await asyncio.gather(scrape, refresh)
+        daemon.scraper.get_real_product_data.assert_awaited_once_with(["B08N5WRWNW"])
+
+
+class TestWarmDealStore:
+    """Test deal store reuse across daemon cycles."""
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_not_reparsed(self, test_settings, tmp_path):
+        """Test that a remembered deal set is reused while the file is unchanged."""
+        from ..utils import save_json_file
+        
+        mock_deal = make_deal()
+        deals_file = str(tmp_path / "deals.json")
+        save_json_file([mock_deal.dict()], deals_file)
+        
+        manager = DealManager(test_settings)
+        manager.remember_saved_deals([mock_deal], deals_file)
+        
+        loaded = await manager.load_existing_deals(deals_file)
+        
+        assert loaded[0] is mock_deal
+        assert manager.existing_asins == {mock_deal.asin}
+    
+    def test_apply_price_updates(self, test_settings):
+        """Test that refreshed real prices update deals and missing data is ignored."""
+        mock_deal = make_deal()
+        manager = DealManager(test_settings)
+        product = AmazonProduct(
+            asin=mock_deal.asin,
+            title="Test Product",
+            current_price=Decimal("19.99"),
+            list_price=Decimal("49.99"),
+            discount_percent=60,
+            data_source=DataSource.PAAPI
+        )
+        
+        assert manager.apply_price_updates([mock_deal], {mock_deal.asin: product}) == 1
+        assert mock_deal.price == 19.99
+        assert mock_deal.discount_percent == 60
+        
+        assert manager.apply_price_updates([mock_deal], {mock_deal.asin: None}) == 0
+        assert mock_deal.price == 19.99
+    
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_cache_and_updates(self, test_settings, tmp_path):
+        """Test that a failed export leaves the cached deals untouched and retries the updates."""
+        from ..utils import save_json_file
+        
+        deal = make_deal()
+        deals_file = str(tmp_path / "deals.json")
+        save_json_file([deal.model_dump(mode='json')], deals_file)
+        
+        daemon = ScraperDaemon(test_settings, output_file=deals_file)
+        daemon.scraper = FocusedScraper(test_settings)
+        daemon.scraper.deal_manager.remember_saved_deals([deal], deals_file)
+        daemon.scraper.exporter.export = MagicMock(return_value=False)
+        daemon._on_refresh(deal.asin, make_product(deal.asin, price="9.99"))
+        
+        await daemon.commit_job()
+        
+        assert deal.price == 29.99
+        assert deal.asin in daemon._pending_updates
@@ -0,0 +1,143 @@
+"""
+Tests for the deal export stage and incremental delta output.
+"""
+
+import json
+
+from ..deal_export import DealExporter, compute_delta, apply_delta, build_shards, MANIFEST_NAME
+from .helpers import make_record
+
+
+class TestComputeDelta:
+    """Test diffing of deal sets keyed by id."""
+    
+    def test_added_removed_changed(self):
+        """Test that the delta captures exactly what changed."""
+        previous = [make_record("a", 10.0), make_record("b", 20.0), make_record("c", 30.0)]
+        current = [make_record("b", 18.0), make_record("c", 30.0), make_record("d", 40.0)]
+        
+        delta = compute_delta(previous, current)
+        
+        assert [deal["id"] for deal in delta["added"]] == ["d"]
+        assert delta["removed"] == ["a"]
+        assert delta["changed"] == {"b": {"price": 18.0}}
+        assert "order" not in delta  # Survivors kept their places and the new deal is last
+        assert apply_delta(previous, delta) == current
+    
+    def test_order_sent_only_when_ranking_moves(self):
+        """Test that a reordered deal set carries the full order."""
+        previous = [make_record("a", 10.0), make_record("b", 20.0)]
+        current = [make_record("b", 20.0), make_record("a", 10.0)]
+        
+        delta = compute_delta(previous, current)
+        
+        assert delta == {"added": [], "removed": [], "changed": {}, "order": ["b", "a"]}
+        assert apply_delta(previous, delta) == current
+    
+    def test_apply_delta_reproduces_current(self):
+        """Test that applying a delta to the previous set yields the current set."""
+        previous = [make_record("a", 10.0), make_record("b", 20.0)]
+        current = [make_record("c", 5.0), make_record("b", 19.0, discount=25)]
+        
+        assert apply_delta(previous, compute_delta(previous, current)) == current
+
+
+class TestDealExporter:
+    """Test versioned delta files and the manifest."""
+    
+    def test_export_writes_versioned_deltas(self, test_settings, tmp_path):
+        """Test that successive exports bump the version and chain deltas."""
+        exporter = DealExporter(test_settings)
+        output = tmp_path / "deals.json"
+        
+        first = [make_record("a", 10.0), make_record("b", 20.0)]
+        second = [make_record("a", 9.0), make_record("c", 30.0)]
+        
+        assert exporter.export(first, str(output)) is True
+        assert exporter.export(second, str(output)) is True
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert manifest["version"] == 2
+        assert manifest["count"] == 2
+        assert len(manifest["deltas"]) == 1
+        
+        delta = json.loads((tmp_path / manifest["deltas"][0]["path"]).read_text())
+        assert delta["fromVersion"] == 1
+        assert apply_delta(first, delta) == second
+        assert json.loads(output.read_text()) == second
+    
+    def test_unchanged_export_keeps_version(self, test_settings, tmp_path):
+        """Test that re-exporting identical deals does not create a new version."""
+        exporter = DealExporter(test_settings)
+        output = tmp_path / "deals.json"
+        deals = [make_record("a", 10.0)]
+        
+        exporter.export(deals, str(output))
+        exporter.export(deals, str(output))
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert manifest["version"] == 1
+        assert manifest["deltas"] == []
+    
+    def test_external_rewrite_resets_chain(self, test_settings, tmp_path):
+        """Test that a deals file changed outside the exporter breaks the delta chain."""
+        exporter = DealExporter(test_settings)
+        output = tmp_path / "deals.json"
+        
+        exporter.export([make_record("a", 10.0)], str(output))
+        output.write_text(json.dumps([make_record("z", 1.0)]))
+        exporter.export([make_record("a", 8.0)], str(output))
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert manifest["version"] == 2
+        assert manifest["deltas"] == []
+    
+    def test_old_deltas_pruned(self, test_settings, tmp_path):
+        """Test that only delta_retention deltas are kept on disk."""
+        test_settings.delta_retention = 2
+        exporter = DealExporter(test_settings)
+        output = tmp_path / "deals.json"
+        
+        for price in range(1, 6):
+            exporter.export([make_record("a", float(price))], str(output))
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert [entry["to"] for entry in manifest["deltas"]] == [4, 5]
+        assert len(list((tmp_path / "deltas").iterdir())) == 2
+
+
+class TestDealShards:
+    """Test pre-sharded static deal feeds."""
+    
+    def test_build_shards_layout(self):
+        """Test category, featured and paged top-discount shards plus the index."""
+        deals = [
+            make_record("a", 10.0, discount=10, category="Home & Garden"),
+            make_record("b", 20.0, discount=50, category="Electronics", featured=True),
+            make_record("c", 30.0, discount=30, category="Electronics"),
+        ]
+        
+        shards = build_shards(deals, page_size=2)
+        
+        assert [deal["id"] for deal in shards["category/electronics.json"]] == ["b", "c"]
+        assert [deal["id"] for deal in shards["category/home-garden.json"]] == ["a"]
+        assert [deal["id"] for deal in shards["featured.json"]] == ["b"]
+        assert [deal["id"] for deal in shards["top-discount/page-1.json"]] == ["b", "c"]
+        assert [deal["id"] for deal in shards["top-discount/page-2.json"]] == ["a"]
+        assert shards["index.json"]["total"] == 3
+        assert shards["index.json"]["topDiscount"]["pages"] == 2
+    
+    def test_export_swaps_shard_generations(self, test_settings, tmp_path):
+        """Test that each export atomically replaces the live shards directory."""
+        exporter = DealExporter(test_settings)
+        output = tmp_path / "deals.json"
+        
+        exporter.export([make_record("a", 10.0, category="Books")], str(output))
+        exporter.export([make_record("a", 9.0, category="Books")], str(output))
+        exporter.export([make_record("b", 8.0, category="Sports")], str(output))
+        
+        index = json.loads((tmp_path / "deals" / "index.json").read_text())
+        assert index["version"] == 3
+        assert (tmp_path / "deals" / "category" / "sports.json").exists()
+        assert not (tmp_path / "deals" / "category" / "books.json").exists()
+        assert len(list((tmp_path / "deals-gen").iterdir())) == 2
@@ -0,0 +1,129 @@
+"""
+Tests for WordPress REST / RSS ingestion of SavingsGuru posts.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from ..feed_source import FEED_STATE_FILE_NAME, FeedSource, parse_feed
+from ..focused_scraper import FocusedScraper
+from .helpers import page_html
+
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>SavingsGuru</title>
+<item><title>Deal &amp; more</title><link>https://www.savingsguru.ca/deal-1</link>
+<pubDate>Tue, 05 Mar 2024 14:00:00 +0000</pubDate>
+<content:encoded><![CDATA[<p>Great price <a href="https://amazon.ca/dp/B0FEED0001">Buy</a></p>]]></content:encoded></item>
+<item><title>No date</title><link>https://www.savingsguru.ca/deal-2</link></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>SavingsGuru</title>
+<entry><title>Atom deal</title><link rel="alternate" href="https://www.savingsguru.ca/deal-3"/>
+<updated>2024-03-05T15:00:00Z</updated><content type="html">&lt;a href="https://amazon.ca/dp/B0FEED0003"&gt;Buy&lt;/a&gt;</content></entry>
+</feed>"""
+
+
+def rest_item(number: int, date: str) -> dict:
+    return {
+        'id': number, 'date': date, 'link': f"https://www.savingsguru.ca/deal-{number}",
+        'title': {'rendered': f"Deal &#8211; {number}"},
+        'content': {'rendered': f'<p>Now 40% off <a href="https://amazon.ca/dp/B0REST{number:04d}">Buy</a></p>'}
+    }
+
+
+class WordPressSite:
+    """SavingsGuru stand-in serving the REST API with an ETag, and HTML listing pages."""
+
+    def __init__(self, rest_status: int = 200, feed: bytes = RSS):
+        self.rest_status = rest_status
+        self.feed = feed
+        self.items = [rest_item(2, "2024-03-05T10:00:00"), rest_item(1, "2024-03-04T09:00:00")]
+        self.requests = []
+
+    async def get(self, url, headers=None):
+        self.requests.append((url, headers or {}))
+        if "/wp-json/" in url:
+            if self.rest_status != 200:
+                return httpx.Response(self.rest_status)
+            etag = f'"{len(self.items)}"'
+            if (headers or {}).get('If-None-Match') == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, json=self.items, headers={'ETag': etag, 'X-WP-TotalPages': '1'})
+        if url.endswith("/feed"):
+            return httpx.Response(200, content=self.feed)
+        return httpx.Response(200, content=page_html(["B0HTML0001"]))
+
+
+def make_source(settings) -> FeedSource:
+    return FeedSource(FocusedScraper(settings), str(Path(settings.state_dir) / FEED_STATE_FILE_NAME))
+
+
+class TestParseFeed:
+    """Test RSS and Atom parsing."""
+
+    def test_rss_and_atom(self):
+        """Test that entries keep link, UTC date and body, and undated entries are dropped."""
+        rss = parse_feed(RSS)
+        atom = parse_feed(ATOM)
+
+        assert [entry.link for entry in rss] == ["https://www.savingsguru.ca/deal-1"]
+        assert rss[0].title == "Deal & more" and "B0FEED0001" in rss[0].content
+        assert rss[0].published.isoformat() == "2024-03-05T14:00:00+00:00"
+        assert atom[0].link == "https://www.savingsguru.ca/deal-3" and "B0FEED0003" in atom[0].content
+
+
+class TestFeedSource:
+    """Test cursors, conditional requests and fallbacks."""
+
+    @pytest.mark.asyncio
+    async def test_rest_cursor_and_not_modified(self, test_settings):
+        """Test that a committed cursor narrows the next request and an unchanged API costs one 304."""
+        site = WordPressSite()
+        source = make_source(test_settings)
+
+        posts = await source.fetch_posts(site)
+        assert [post.extracted_asins for post in posts] == [["B0REST0002"], ["B0REST0001"]]
+        assert posts[0].post_id == "sg_2" and posts[0].post_title == "Deal – 2"
+        assert "order=desc" in site.requests[-1][0]
+
+        # Not committed (the run failed): the same request is made again
+        await source.fetch_posts(site)
+        assert site.requests[-1][0] == site.requests[0][0]
+
+        source.commit()
+        reloaded = make_source(test_settings)
+        first = await reloaded.fetch_posts(site)
+        url, headers = site.requests[-1]
+        assert "after=2024-03-05T10%3A00%3A00" in url and "order=asc" in url
+        assert first and not headers
+
+        reloaded.commit()
+        assert await reloaded.fetch_posts(site) == []
+        assert site.requests[-1][1] == {'If-None-Match': '"2"'}
+        assert reloaded.last_source == "REST API"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_rss_then_html(self, test_settings, monkeypatch):
+        """Test that RSS is read when the REST API fails, and listing pages when both fail."""
+        site = WordPressSite(rest_status=404)
+        source = make_source(test_settings)
+
+        posts = await source.fetch_posts(site)
+        assert [post.extracted_asins for post in posts] == [["B0FEED0001"]]
+        assert source.last_source == "feed"
+
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        settings = test_settings.model_copy(update={'post_source': 'feed'})
+        scraper = FocusedScraper(settings)
+        scraper.page_client = WordPressSite(rest_status=404, feed=b"<html><body>Not a feed<br></body></html>")
+
+        posts = await scraper.scrape_savingsguru_posts(max_pages=1)
+
+        assert [post.extracted_asins for post in posts] == [["B0HTML0001"]]
+        assert scraper.feed_source.last_source is None
@@ -0,0 +1,58 @@
+"""
+Tests for loading stored records back into models.
+"""
+
+import json
+
+import pytest
+from pydantic.alias_generators import to_camel
+
+from ..deal_manager import DealManager
+from ..models import DataSource, Deal, load_stored_models
+
+
+def deal_record(asin: str) -> dict:
+    return {
+        'id': f"deal_{asin}_20240101", 'title': f"Stored Product {asin}",
+        'image_url': f"https://m.media-amazon.com/images/I/{asin}.jpg", 'price': 19.99, 'original_price': 39.99,
+        'discount_percent': 50, 'category': "Electronics", 'description': "Great deal",
+        'affiliate_url': f"https://www.amazon.ca/dp/{asin}?tag=test-20", 'featured': False,
+        'date_added': "2024-01-01T00:00:00", 'data_source': "PAAPI", 'asin': asin, 'brand': None
+    }
+
+
+class TestLoadStoredModels:
+    """Test the one-pass loader for our own stored records."""
+
+    def test_snake_and_camel_case_records(self):
+        """Test that both key styles load into equal, fully typed models."""
+        records = [deal_record("B0STORE001"), deal_record("B0STORE002")]
+        camel = [{to_camel(key): value for key, value in record.items()} for record in records]
+
+        snake_deals = load_stored_models(Deal, json.dumps(records))
+        camel_deals = load_stored_models(Deal, json.dumps(camel).encode())
+
+        assert snake_deals == camel_deals
+        assert snake_deals[0].data_source is DataSource.PAAPI
+        assert str(snake_deals[1].affiliate_url).endswith("tag=test-20")
+
+    def test_invalid_records_are_skipped(self):
+        """Test that one bad record falls back to per-record loading instead of failing the file."""
+        records = [deal_record("B0STORE001"), dict(deal_record("B0STORE002"), price=-1), deal_record("B0STORE003")]
+
+        deals = load_stored_models(Deal, json.dumps(records), label="deal")
+
+        assert [deal.asin for deal in deals] == ["B0STORE001", "B0STORE003"]
+        with pytest.raises(ValueError):
+            load_stored_models(Deal, json.dumps({"not": "a list"}))
+
+    @pytest.mark.asyncio
+    async def test_deal_manager_loads_camel_case_file(self, test_settings, tmp_path):
+        """Test that the deal store accepts a camelCase deals.json."""
+        deals_file = tmp_path / "deals.json"
+        deals_file.write_text(json.dumps([{to_camel(key): value for key, value in deal_record("B0STORE001").items()}]))
+
+        deals = await DealManager(test_settings).load_existing_deals(str(deals_file))
+
+        assert [deal.asin for deal in deals] == ["B0STORE001"]
+        assert deals[0].original_price == 39.99
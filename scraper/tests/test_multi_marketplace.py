@@ -0,0 +1,114 @@
+"""
+Tests for the marketplace table and concurrent multi-marketplace scraping.
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ..marketplaces import parse_marketplaces, parse_partner_tags
+from ..models import SavingsGuruPost
+from ..multi_marketplace import MultiMarketplaceScraper, marketplace_output_file, marketplace_settings
+from ..scraper_fallback import AmazonScrapingClient
+from ..utils import create_affiliate_url
+from .helpers import make_product
+
+
+class TestMarketplaces:
+    """Test the marketplace table and per-marketplace URLs."""
+
+    def test_affiliate_urls_follow_marketplace(self):
+        """Test that affiliate links use the marketplace's domain."""
+        product = make_product()
+
+        assert product.to_affiliate_url("tag-20") == "https://www.amazon.ca/dp/B08N5WRWNW?tag=tag-20"
+        assert product.to_affiliate_url("tag-21", "UK") == "https://www.amazon.co.uk/dp/B08N5WRWNW?tag=tag-21"
+        assert create_affiliate_url("B08N5WRWNW", "tag-22", "JP") == "https://www.amazon.co.jp/dp/B08N5WRWNW?tag=tag-22"
+
+    def test_parsing(self):
+        """Test marketplace list and partner tag parsing."""
+        assert parse_marketplaces("ca, us,UK,US") == ["CA", "US", "UK"]
+        assert parse_partner_tags("US:us-tag-20, UK:uk-tag-21") == {"US": "us-tag-20", "UK": "uk-tag-21"}
+        with pytest.raises(ValueError):
+            parse_marketplaces("CA,XX")
+
+    def test_decimal_comma_prices(self, test_settings):
+        """Test that European price formats parse to the right amount."""
+        client = AmazonScrapingClient(test_settings.model_copy(update={'amz_marketplace': "DE"}))
+
+        assert client.marketplace.product_url("B08N5WRWNW") == "https://www.amazon.de/dp/B08N5WRWNW"
+        assert client._extract_price_from_text("1.299,99 €") == Decimal("1299.99")
+
+    def test_marketplace_settings_namespace_state(self, test_settings):
+        """Test that secondary marketplaces get their own state directory and partner tag."""
+        settings = test_settings.model_copy(update={'amz_partner_tags': "US:us-tag-20"})
+
+        primary = marketplace_settings(settings, "CA")
+        us = marketplace_settings(settings, "us")
+
+        assert primary.state_dir == settings.state_dir
+        assert us.amz_marketplace == "US"
+        assert us.amz_partner_tag == "us-tag-20"
+        assert Path(us.state_dir) == Path(settings.state_dir) / "us"
+        assert marketplace_output_file("public/deals.json", "UK", "CA") == str(Path("public/uk/deals.json"))
+
+
+class TestMultiMarketplaceScraper:
+    """Test concurrent scraping across marketplaces."""
+
+    @pytest.mark.asyncio
+    async def test_posts_fetched_once_and_outputs_per_locale(self, test_settings, tmp_path):
+        """Test that posts are shared and each marketplace writes its own deals file."""
+        post = SavingsGuruPost(
+            post_id="sg_1", post_title="Echo Dot deal", post_url="https://www.savingsguru.ca/echo",
+            extracted_asins=["B08N5WRWNW"]
+        )
+
+        async with MultiMarketplaceScraper(test_settings, ["CA", "US"]) as multi:
+            for scraper in multi.scrapers.values():
+                scraper.scrape_savingsguru_posts = AsyncMock(return_value=[post])
+                scraper.get_real_product_data = AsyncMock(return_value={"B08N5WRWNW": make_product()})
+
+            results = await multi.scrape_deals(output_file=str(tmp_path / "deals.json"))
+
+            multi.scrapers["CA"].scrape_savingsguru_posts.assert_awaited_once()
+            multi.scrapers["US"].scrape_savingsguru_posts.assert_not_called()
+
+        assert [deal.asin for deal in results["CA"]] == ["B08N5WRWNW"]
+        assert [deal.asin for deal in results["US"]] == ["B08N5WRWNW"]
+
+        ca = json.loads((tmp_path / "deals.json").read_text())
+        us = json.loads((tmp_path / "us" / "deals.json").read_text())
+        assert ca[0]["affiliateUrl"].startswith("https://www.amazon.ca/")
+        assert us[0]["affiliateUrl"].startswith("https://www.amazon.com/")
+
+    @pytest.mark.asyncio
+    async def test_unchanged_feed_manages_deals_and_commits_after_all_saved(self, test_settings, tmp_path):
+        """Test that an unchanged feed still manages every marketplace, and its cursor waits for every save."""
+        post = SavingsGuruPost(
+            post_id="sg_1", post_title="Echo Dot deal", post_url="https://www.savingsguru.ca/echo",
+            extracted_asins=["B08N5WRWNW"]
+        )
+        output = str(tmp_path / "deals.json")
+        async with MultiMarketplaceScraper(test_settings, ["CA", "US"]) as multi:
+            for scraper in multi.scrapers.values():
+                scraper.scrape_savingsguru_posts = AsyncMock(return_value=[post])
+                scraper.get_real_product_data = AsyncMock(return_value={"B08N5WRWNW": make_product()})
+            await multi.scrape_deals(output_file=output)
+
+        for fail_us, committed in ((False, True), (True, False)):
+            async with MultiMarketplaceScraper(test_settings, ["CA", "US"]) as multi:
+                first = multi.scrapers["CA"]
+                first.scrape_savingsguru_posts = AsyncMock(return_value=[])
+                first.feed_source = MagicMock(last_source="REST API")
+                if fail_us:
+                    multi.scrapers["US"].exporter.export = MagicMock(return_value=False)
+
+                results = await multi.scrape_deals(output_file=output)
+
+            assert [deal.asin for deal in results["CA"]] == ["B08N5WRWNW"]
+            assert [deal.asin for deal in results["US"]] == ["B08N5WRWNW"]
+            assert first.feed_source.commit.called is committed
@@ -0,0 +1,81 @@
+"""
+Tests for near-duplicate deal detection.
+"""
+
+import pytest
+
+from ..deal_manager import DealManager
+from ..near_duplicates import NearDuplicateDetector, normalize_title
+from .helpers import make_deal
+
+
+class TestNearDuplicateDetector:
+    """Test title normalization and LSH clustering."""
+
+    def test_variant_words_are_ignored(self):
+        """Test that colour and size words do not distinguish titles."""
+        assert normalize_title("Apple AirPods Max - Space Gray") == normalize_title("Apple AirPods Max, Space Silver")
+        assert normalize_title("Hanes T-Shirt XL (Pack of 6)") == normalize_title("Hanes T-Shirt Small Pack of 6")
+
+    def test_clusters_variants_but_not_distinct_products(self):
+        """Test that variants cluster together while different products stay apart."""
+        detector = NearDuplicateDetector()
+        clusters = detector.cluster([
+            "Sony WH-1000XM5 Wireless Noise Cancelling Headphones, Black",
+            "Instant Pot Duo 7-in-1 Electric Pressure Cooker, 6 Quart",
+            "Sony WH-1000XM5 Wireless Noise Cancelling Headphones, Silver",
+            "Sony WH-1000XM5 Wireless Noise Cancelling Headphones - Midnight Blue",
+            "LEGO Star Wars Millennium Falcon Building Kit",
+        ])
+
+        assert clusters[0] == clusters[2] == clusters[3]
+        assert len({clusters[0], clusters[1], clusters[4]}) == 3
+
+    def test_collapse_keeps_best_ranked(self):
+        """Test that collapse keeps the lowest-ranked member in original order."""
+        detector = NearDuplicateDetector()
+        items = [("Echo Dot 5th Gen Smart Speaker, Charcoal", 49.99),
+                 ("Kindle Paperwhite 16 GB", 189.99),
+                 ("Echo Dot 5th Gen Smart Speaker, Glacier White", 39.99)]
+
+        kept, removed = detector.collapse(items, title=lambda item: item[0], rank=lambda item: (item[1],))
+
+        assert removed == 1
+        assert kept == [items[1], items[2]]
+
+    def test_large_pool_of_distinct_titles_stays_distinct(self):
+        """Test that unrelated titles in a big pool do not merge."""
+        detector = NearDuplicateDetector()
+        titles = [f"Product line {i} model {i * 7} edition {i * 13}" for i in range(500)]
+
+        assert len(set(detector.cluster(titles))) == 500
+
+
+class TestDealManagerNearDuplicates:
+    """Test near-duplicate collapsing in the deal pipeline."""
+
+    def test_collapse_keeps_best_priced_variant(self, test_settings):
+        """Test that the cheapest colour variant survives."""
+        manager = DealManager(test_settings)
+        deals = [
+            make_deal("B0AAAAAAA1", "Anker PowerCore 10000 Portable Charger, Black", 29.99),
+            make_deal("B0AAAAAAA2", "Anker PowerCore 10000 Portable Charger, White", 24.99),
+            make_deal("B0AAAAAAA3", "Yoga Mat Extra Thick Non Slip", 19.99),
+        ]
+
+        kept = manager.collapse_near_duplicates(deals)
+
+        assert [deal.asin for deal in kept] == ["B0AAAAAAA2", "B0AAAAAAA3"]
+
+    @pytest.mark.asyncio
+    async def test_process_deals_collapses_new_variants(self, test_settings, tmp_path):
+        """Test that process_deals removes variants across the combined pool."""
+        manager = DealManager(test_settings)
+        new_deals = [
+            make_deal("B0BBBBBBB1", "Ninja Air Fryer Max XL 5.5 Quart, Grey", 119.99),
+            make_deal("B0BBBBBBB2", "Ninja Air Fryer Max XL 5.5 Quart, Black", 99.99),
+        ]
+
+        result = await manager.process_deals(new_deals, str(tmp_path / "deals.json"))
+
+        assert [deal.asin for deal in result["deals"]] == ["B0BBBBBBB2"]
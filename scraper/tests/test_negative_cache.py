@@ -0,0 +1,105 @@
+"""
+Tests for the persistent negative cache of dead or unavailable ASINs.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from ..negative_cache import NegativeCache
+from ..models import NegativeReason
+
+
+class TestNegativeCache:
+    """Test reason codes, escalating TTLs and persistence."""
+    
+    def test_record_and_skip(self, tmp_path):
+        """Test that a recorded failure is skipped until its window expires."""
+        cache = NegativeCache(str(tmp_path / "negative.json"))
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        
+        cache.record("B08N5WRWNW", NegativeReason.NO_PRICE, now=now)
+        
+        assert cache.should_skip("B08N5WRWNW", now=now + timedelta(hours=1)) == NegativeReason.NO_PRICE
+        assert cache.should_skip("B08N5WRWNW", now=now + timedelta(hours=7)) is None
+        assert cache.should_skip("B000000000", now=now) is None
+    
+    def test_escalating_backoff(self, tmp_path):
+        """Test that each consecutive failure doubles the skip window up to the cap."""
+        cache = NegativeCache(str(tmp_path / "negative.json"), max_ttl_hours=48)
+        now = datetime(2024, 1, 1)
+        
+        windows = []
+        for _ in range(4):
+            entry = cache.record("B08N5WRWNW", NegativeReason.NOT_FOUND, now=now)
+            windows.append(entry.retry_after - now)
+        
+        assert windows == [
+            timedelta(hours=24),
+            timedelta(hours=48),
+            timedelta(hours=48),
+            timedelta(hours=48),
+        ]
+        assert cache.entries["B08N5WRWNW"].failures == 4
+    
+    def test_blocked_and_invalid_windows_are_fixed(self, tmp_path):
+        """Test that BLOCKED and INVALID keep one window however often they are recorded."""
+        cache = NegativeCache(str(tmp_path / "negative.json"), max_ttl_hours=48)
+        now = datetime(2024, 1, 1)
+        
+        for _ in range(40):
+            blocked = cache.record("B08N5WRWNW", NegativeReason.BLOCKED, now=now)
+            invalid = cache.record("INVALID", NegativeReason.INVALID, now=now)
+        
+        assert blocked.retry_after - now == timedelta(hours=0.5)
+        assert invalid.retry_after - now == timedelta(days=30)
+        assert cache.ttl_for(NegativeReason.NOT_FOUND, 2000) == timedelta(hours=48)
+    
+    @pytest.mark.asyncio
+    async def test_invalid_asin_recorded_once(self, test_settings):
+        """Test that a malformed ASIN is recorded once and then skipped from the cache."""
+        from ..focused_scraper import FocusedScraper
+        
+        scraper = FocusedScraper(test_settings)
+        for _ in range(3):
+            assert (await scraper.get_real_product_data(["BAD"]))["BAD"] is None
+        
+        assert scraper.negative_cache.entries["BAD"].failures == 1
+        assert scraper.stats['negative_cache_skips'] == 3
+    
+    def test_clear_on_success(self, tmp_path):
+        """Test that a successful lookup resets the ASIN."""
+        cache = NegativeCache(str(tmp_path / "negative.json"))
+        cache.record("B08N5WRWNW", NegativeReason.BLOCKED)
+        
+        cache.clear("B08N5WRWNW")
+        
+        assert cache.should_skip("B08N5WRWNW") is None
+        assert len(cache) == 0
+    
+    def test_persistence_round_trip(self, tmp_path):
+        """Test that entries survive a save/load cycle."""
+        cache_file = str(tmp_path / "negative.json")
+        cache = NegativeCache(cache_file)
+        cache.record("B08N5WRWNW", NegativeReason.NOT_FOUND)
+        assert cache.save() is True
+        
+        reloaded = NegativeCache(cache_file)
+        
+        assert reloaded.should_skip("B08N5WRWNW") == NegativeReason.NOT_FOUND
+        assert reloaded.entries["B08N5WRWNW"].failures == 1
+    
+    @pytest.mark.asyncio
+    async def test_scraper_skips_cached_asin_before_network(self, test_settings):
+        """Test that FocusedScraper never calls PAAPI for a negatively cached ASIN."""
+        from ..focused_scraper import FocusedScraper
+        
+        scraper = FocusedScraper(test_settings)
+        scraper.negative_cache.record("B08N5WRWNW", NegativeReason.NOT_FOUND)
+        scraper.amazon_api.get_product_info = AsyncMock(return_value=None)
+        
+        results = await scraper.get_real_product_data(["B08N5WRWNW"])
+        
+        assert results["B08N5WRWNW"] is None
+        assert scraper.stats['negative_cache_skips'] == 1
+        scraper.amazon_api.get_product_info.assert_not_called()
@@ -0,0 +1,128 @@
+"""
+Tests for the streaming SavingsGuru -> deal store pipeline.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ..focused_scraper import FocusedScraper
+from ..pipeline import StreamingPipeline
+from .helpers import lookup, make_product, make_scraper, page_html
+
+
+# Captured before tests patch out the politeness delay
+real_sleep = asyncio.sleep
+
+ASINS = ["B0PIPE0001", "B0PIPE0002", "B0PIPE0003", "B0PIPE0004"]
+
+
+class GatedPages:
+    """SavingsGuru stand-in whose second page only loads once `release` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.requested = []
+
+    async def get(self, url):
+        page = 2 if url.endswith("/page/2") else 1
+        self.requested.append(page)
+        if page == 2:
+            await self.release.wait()
+        return SimpleNamespace(status_code=200, content=page_html(ASINS[:2] if page == 1 else ASINS[2:]))
+
+
+class TestStreamingPipeline:
+    """Test incremental commits and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_commits_before_later_pages_load(self, test_settings, tmp_path, monkeypatch):
+        """Test that page 1's deals are saved while page 2 is still loading."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        settings = test_settings.model_copy(update={'pipeline_enabled': True, 'pipeline_commit_every': 1})
+        output = tmp_path / "deals.json"
+        pages = GatedPages()
+        scraper = make_scraper(settings, pages)
+
+        commit_deals = scraper.commit_deals
+        committed_before_page_two = []
+
+        async def commit_then_release(new_deals, output_path):
+            result = await commit_deals(new_deals, output_path)
+            if not pages.release.is_set():
+                committed_before_page_two.extend(json.loads(output.read_text()))
+                pages.release.set()
+            return result
+
+        scraper.commit_deals = commit_then_release
+        deals = await asyncio.wait_for(scraper.scrape_deals(max_pages=2, output_file=str(output)), timeout=10)
+
+        assert committed_before_page_two
+        assert sorted(deal.asin for deal in deals) == ASINS
+        assert len(json.loads(output.read_text())) == 4
+        assert scraper.stats['pipeline_commits'] >= 2
+        assert scraper.stats['first_commit_seconds'] >= 0
+
+        # Committed posts are skipped by the next run
+        seen = scraper.deal_manager.seen
+        assert seen.contains("post_url", "https://www.savingsguru.ca/deal-B0PIPE0001")
+
+    @pytest.mark.asyncio
+    async def test_bounded_queues_apply_backpressure(self, test_settings, tmp_path, monkeypatch):
+        """Test that a stalled lookup stage stops page fetching from running ahead."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        stalled = asyncio.Event()
+
+        async def stalled_lookup(self, asins):
+            await stalled.wait()
+            return {asin: make_product(asin) for asin in asins}
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", stalled_lookup)
+        requested = []
+
+        class Pages:
+            async def get(self, url):
+                requested.append(url)
+                return SimpleNamespace(status_code=200, content=page_html(ASINS))
+
+        scraper = make_scraper(test_settings, Pages())
+        pipeline = StreamingPipeline(scraper, queue_size=1, commit_every=1)
+        run = asyncio.create_task(pipeline.run(max_pages=20, output_path=str(tmp_path / "deals.json")))
+
+        await real_sleep(0.1)
+        assert len(requested) < 20
+
+        stalled.set()
+        deals = await asyncio.wait_for(run, timeout=10)
+        assert len(requested) == 20
+        assert sorted(deal.asin for deal in deals) == ASINS
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_waiting_deals(self, test_settings, tmp_path, monkeypatch):
+        """Test that deals from a failed intermediate save are written by a later commit."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        output = tmp_path / "deals.json"
+
+        class Pages:
+            async def get(self, url):
+                return SimpleNamespace(status_code=200, content=page_html(ASINS[2:] if url.endswith("/page/2") else ASINS[:2]))
+
+        scraper = make_scraper(test_settings, Pages())
+        export = scraper.exporter.export
+        attempts = []
+
+        def failing_once(records, path):
+            attempts.append(len(records))
+            return len(attempts) > 1 and export(records, path)
+
+        scraper.exporter.export = failing_once
+        deals = await StreamingPipeline(scraper, commit_every=1).run(max_pages=2, output_path=str(output))
+
+        assert len(attempts) > 1
+        assert sorted(deal.asin for deal in deals) == ASINS
+        assert sorted(deal['asin'] for deal in json.loads(output.read_text())) == ASINS
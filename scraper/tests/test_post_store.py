@@ -0,0 +1,96 @@
+"""
+Tests for the on-disk post store and the constant-memory crawl.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ..focused_scraper import FocusedScraper
+from ..models import SavingsGuruPost
+from ..post_store import PostStore
+from .helpers import lookup, make_scraper, page_html
+
+
+def make_post(number: int, asins) -> SavingsGuruPost:
+    return SavingsGuruPost(
+        post_id=f"sg_{number}", post_title=f"Post {number}",
+        post_url=f"https://www.savingsguru.ca/deal-{number}", extracted_asins=list(asins)
+    )
+
+
+class NumberedPages:
+    """SavingsGuru stand-in serving two distinct ASINs per page."""
+
+    def __init__(self):
+        self.requested = 0
+
+    async def get(self, url):
+        self.requested += 1
+        page = int(url.rsplit("/", 1)[-1]) if "/page/" in url else 1
+        return SimpleNamespace(status_code=200, content=page_html([f"B0CRWL{page:03d}{n}" for n in "AB"]))
+
+
+class TestPostStore:
+    """Test the ASIN -> post map."""
+
+    def test_batches_keep_first_seen_order(self, tmp_path):
+        """Test that duplicate ASINs are stored once, in first-seen order, mapped to their latest post."""
+        store = PostStore(str(tmp_path / "crawl.sqlite"))
+
+        assert store.add([make_post(1, ["B0STORE001", "B0STORE002"])]) == 2
+        assert store.add([make_post(2, ["B0STORE002", "B0STORE003"])]) == 1
+
+        assert list(store.asin_batches(2)) == [["B0STORE001", "B0STORE002"], ["B0STORE003"]]
+        assert store.post_for("B0STORE002").post_id == "sg_2"
+        assert set(store.posts_for(["B0STORE001", "B0UNKNOWN0"])) == {"B0STORE001"}
+        assert [[post.post_id for post in batch] for batch in store.post_batches(1)] == [["sg_1"], ["sg_2"]]
+
+        store.close()
+        assert not (tmp_path / "crawl.sqlite").exists()
+
+
+class TestCrawlDeals:
+    """Test the constant-memory crawl mode."""
+
+    @pytest.mark.asyncio
+    async def test_large_crawl_commits_in_batches(self, test_settings, tmp_path, monkeypatch):
+        """Test that a crawl past the threshold streams pages to disk and commits every full deal set."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+        settings = test_settings.model_copy(update={
+            'crawl_low_memory_pages': 5, 'target_deal_count': 4, 'checkpoint_batch_size': 3
+        })
+        output = tmp_path / "deals.json"
+        pages = NumberedPages()
+        scraper = make_scraper(settings, pages)
+        commit_deals = scraper.commit_deals
+        commits = []
+
+        async def counting_commit(new_deals, output_path):
+            commits.append(len(new_deals))
+            return await commit_deals(new_deals, output_path)
+
+        scraper.commit_deals = counting_commit
+        deals = await scraper.scrape_deals(max_pages=6, output_file=str(output))
+
+        assert pages.requested == 6
+        assert len(commits) > 1 and sum(commits) == 12
+        assert len(deals) == len(json.loads(output.read_text())) > 0
+        assert not list((tmp_path / "state").glob("crawl_*.sqlite"))
+        assert scraper.filter_unseen_posts([make_post(9, ["B0CRWL001A"]).model_copy(
+            update={'post_url': "https://www.savingsguru.ca/deal-B0CRWL001A"}
+        )]) == []
+
+    @pytest.mark.asyncio
+    async def test_empty_crawl_is_not_an_error(self, test_settings, tmp_path, monkeypatch):
+        """Test that a crawl over listing pages without ASINs returns cleanly."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        settings = test_settings.model_copy(update={'crawl_low_memory_pages': 1})
+        pages = SimpleNamespace(get=AsyncMock(return_value=SimpleNamespace(status_code=200, content=page_html([]))))
+        scraper = make_scraper(settings, pages)
+
+        assert await scraper.scrape_deals(max_pages=1, output_file=str(tmp_path / "deals.json")) == []
+        assert scraper.session.errors == []
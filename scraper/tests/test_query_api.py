@@ -0,0 +1,161 @@
+"""
+Tests for the read-only deals query API.
+"""
+
+import asyncio
+
+import pytest
+
+from ..deal_export import DealExporter
+from ..query_api import DealIndex, DealQueryServer, DealStoreWatcher, encode_cursor
+from .helpers import make_record
+
+
+@pytest.fixture
+def index():
+    """Index over a small mixed deal set."""
+    deal_index = DealIndex()
+    deal_index.load([
+        make_record("a", 10.0, 50, "Electronics"),
+        make_record("b", 25.0, 30, "Electronics"),
+        make_record("c", 5.0, 70, "Books"),
+        make_record("d", 99.0, 15, "Books"),
+        make_record("e", 40.0, 30, "Electronics"),
+    ], version=1)
+    return deal_index
+
+
+class TestDealIndex:
+    """Test filtering, sorting and keyset pagination."""
+
+    def test_filters_by_category_discount_and_price(self, index):
+        """Test that every filter is applied."""
+        result = index.query(category="Electronics", min_discount=30, max_price=30.0)
+
+        assert [deal["id"] for deal in result["deals"]] == ["a", "b"]
+        assert result["nextCursor"] is None
+
+    def test_keyset_pagination_covers_all_deals_once(self, index):
+        """Test that following cursors walks the full result set without gaps."""
+        seen, cursor = [], None
+        while True:
+            page = index.query(sort="price", limit=2, cursor=cursor)
+            seen.extend(deal["id"] for deal in page["deals"])
+            cursor = page["nextCursor"]
+            if cursor is None:
+                break
+
+        assert seen == ["c", "a", "b", "e", "d"]
+
+    def test_incremental_delta_matches_full_rebuild(self, index):
+        """Test that applying a delta gives the same answers as a rebuild."""
+        index.apply_delta({
+            "added": [make_record("f", 1.0, 90, "Books")],
+            "removed": ["c"],
+            "changed": {"a": {"price": 60.0}},
+        }, version=2, content_tag="v2")
+
+        rebuilt = DealIndex()
+        rebuilt.load(list(index.deals.values()), version=2)
+
+        for sort in ("discount", "price", "newest"):
+            assert index.query(sort=sort, limit=100)["deals"] == rebuilt.query(sort=sort, limit=100)["deals"]
+        assert index.query(category="Books")["deals"][0]["id"] == "f"
+
+    def test_invalid_sort_rejected(self, index):
+        """Test that unknown sort orders raise ValueError."""
+        with pytest.raises(ValueError):
+            index.query(sort="random")
+
+
+class TestDealQueryServer:
+    """Test routing and conditional requests."""
+
+    def test_etag_returns_304_until_new_version(self, index):
+        """Test that a matching If-None-Match gets 304 and a new version invalidates it."""
+        server = DealQueryServer(index)
+        status, _, headers = server.handle("GET", "/deals?category=Books", {})
+        assert status == 200
+
+        status, body, _ = server.handle("GET", "/deals?category=Books", {"if-none-match": headers["ETag"]})
+        assert status == 304 and body == b""
+
+        index.apply_delta({"added": [], "removed": ["c"], "changed": {}}, version=2, content_tag="v2")
+        status, _, _ = server.handle("GET", "/deals?category=Books", {"if-none-match": headers["ETag"]})
+        assert status == 200
+
+    def test_bad_parameters_return_400(self, index):
+        """Test that malformed query parameters are client errors."""
+        server = DealQueryServer(index)
+        status, _, _ = server.handle("GET", "/deals?min_price=cheap", {})
+        assert status == 400
+
+        for cursor in (encode_cursor(("a", "b")), encode_cursor((1,)), "bm90IGpzb24", "NQ"):
+            status, _, _ = server.handle("GET", f"/deals?sort=price&cursor={cursor}", {})
+            assert status == 400
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_connection(self, index):
+        """Test that one connection serves several requests."""
+        server = DealQueryServer(index)
+        http_server = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = http_server.sockets[0].getsockname()[1]
+
+        async with http_server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for path in ("/deals/a", "/categories"):
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+                await writer.drain()
+                head = await reader.readuntil(b"\r\n\r\n")
+                assert head.startswith(b"HTTP/1.1 200")
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+            writer.close()
+
+
+class TestDealStoreWatcher:
+    """Test syncing the index with exported versions."""
+
+    def test_watcher_applies_exported_deltas(self, test_settings, tmp_path):
+        """Test that a new export is picked up through its delta."""
+        output = tmp_path / "deals.json"
+        exporter = DealExporter(test_settings)
+        exporter.export([make_record("a", 10.0), make_record("b", 20.0)], str(output))
+
+        index = DealIndex()
+        watcher = DealStoreWatcher(index, str(output))
+        assert watcher.refresh() is True
+        generation = index.generation
+
+        exporter.export([make_record("a", 8.0), make_record("c", 30.0)], str(output))
+        assert watcher.refresh() is True
+
+        assert index.version == 2
+        assert index.generation == generation + 1
+        assert sorted(index.deals) == ["a", "c"]
+        assert index.deals["a"]["price"] == 8.0
+
+    def test_failed_read_is_retried(self, tmp_path):
+        """Test that a half-written file is read again on the next poll, not skipped until it changes."""
+        output = tmp_path / "deals.json"
+        output.write_text('[{"id": "a", "price"')
+        watcher = DealStoreWatcher(DealIndex(), str(output))
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                watcher.refresh()
+
+    def test_search_uses_exported_index(self, test_settings, tmp_path):
+        """Test that /search answers from the search index written at export."""
+        output = tmp_path / "deals.json"
+        records = [make_record("a", 10.0), make_record("b", 20.0)]
+        records[0]["title"] = "Wireless Headphones"
+        DealExporter(test_settings).export(records, str(output))
+
+        index = DealIndex()
+        DealStoreWatcher(index, str(output)).refresh()
+        status, body, _ = DealQueryServer(index).handle("GET", "/search?q=wireless%20head", {})
+
+        assert (tmp_path / "search-index.bin").exists()
+        assert status == 200
+        assert b'"id":"a"' in body and b'"id":"b"' not in body
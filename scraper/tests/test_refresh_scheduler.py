@@ -0,0 +1,122 @@
+"""
+Tests for the priority-ordered ASIN refresh scheduler.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from ..refresh_scheduler import RefreshScheduler, QuotaBudget
+from .helpers import make_product
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic scheduling."""
+    
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRefreshScheduler:
+    """Test interval computation and due-time ordering."""
+    
+    def test_hot_deals_refresh_faster(self, test_settings):
+        """Test that featured, high-discount, volatile deals get shorter intervals."""
+        clock = FakeClock()
+        scheduler = RefreshScheduler(test_settings, AsyncMock(), clock=clock)
+        
+        cold = scheduler.track("ASIN000001", discount_percent=0)
+        hot = scheduler.track("ASIN000002", discount_percent=60, featured=True)
+        hot.prices = [(clock.now, 10.0), (clock.now, 12.0), (clock.now, 9.0)]
+        
+        hot_interval = scheduler.compute_interval(hot)
+        cold_interval = scheduler.compute_interval(cold)
+        
+        assert hot_interval < cold_interval
+        assert hot_interval == test_settings.refresh_min_interval_minutes * 60
+    
+    def test_old_deals_refresh_rarely(self, test_settings):
+        """Test that deal age stretches the interval up to the maximum."""
+        clock = FakeClock()
+        scheduler = RefreshScheduler(test_settings, AsyncMock(), clock=clock)
+        target = scheduler.track("ASIN000001")
+        fresh_interval = scheduler.compute_interval(target)
+        
+        clock.now += 30 * 86400
+        
+        assert scheduler.compute_interval(target) > fresh_interval
+        assert scheduler.compute_interval(target) == test_settings.refresh_max_interval_hours * 3600
+    
+    def test_pop_due_orders_by_next_due(self, test_settings):
+        """Test that the most overdue ASIN is popped first and future ones wait."""
+        clock = FakeClock()
+        scheduler = RefreshScheduler(test_settings, AsyncMock(), clock=clock)
+        
+        scheduler.track("ASIN000001")
+        scheduler.record_result(scheduler.pop_due(), make_product("ASIN000001", "10.00"))
+        scheduler.track("ASIN000002")
+        
+        assert scheduler.pop_due().asin == "ASIN000002"
+        assert scheduler.pop_due() is None
+        
+        clock.now += test_settings.refresh_max_interval_hours * 3600
+        assert scheduler.pop_due().asin == "ASIN000001"
+    
+    def test_untracked_asins_are_skipped(self, test_settings):
+        """Test that untracking removes an ASIN from the queue lazily."""
+        scheduler = RefreshScheduler(test_settings, AsyncMock(), clock=FakeClock())
+        scheduler.track("ASIN000001")
+        scheduler.untrack("ASIN000001")
+        
+        assert scheduler.next_due_in() is None
+        assert scheduler.pop_due() is None
+    
+    @pytest.mark.asyncio
+    async def test_refresh_next_records_price_changes(self, test_settings):
+        """Test that refreshes call the fetcher and track price movement."""
+        clock = FakeClock()
+        fetch = AsyncMock(side_effect=[
+            {"ASIN000001": make_product("ASIN000001", "10.00")},
+            {"ASIN000001": make_product("ASIN000001", "8.00")},
+        ])
+        scheduler = RefreshScheduler(test_settings, fetch, clock=clock)
+        scheduler.track("ASIN000001")
+        
+        assert await scheduler.refresh_next() == "ASIN000001"
+        clock.now += test_settings.refresh_max_interval_hours * 3600
+        assert await scheduler.refresh_next() == "ASIN000001"
+        
+        assert scheduler.stats['refreshes'] == 2
+        assert scheduler.stats['price_changes'] == 1
+        assert [price for _, price in scheduler.targets["ASIN000001"].prices] == [10.0, 8.0]
+    
+    def test_state_round_trip(self, test_settings):
+        """Test that targets and price history persist across restarts."""
+        scheduler = RefreshScheduler(test_settings, AsyncMock(), clock=FakeClock())
+        target = scheduler.track("ASIN000001", discount_percent=30)
+        scheduler.record_result(scheduler.pop_due(), make_product("ASIN000001", "10.00"))
+        assert scheduler.save() is True
+        
+        restored = RefreshScheduler(test_settings, AsyncMock(), clock=FakeClock())
+        
+        assert restored.load() == 1
+        assert restored.targets["ASIN000001"].next_due == target.next_due
+        assert restored.targets["ASIN000001"].prices[0][1] == 10.0
+
+
+class TestQuotaBudget:
+    """Test the refresh quota token bucket."""
+    
+    def test_budget_limits_burst(self):
+        """Test that the bucket refuses tokens beyond the burst until refilled."""
+        clock = FakeClock(0.0)
+        budget = QuotaBudget(per_hour=3600, burst=2, clock=clock)
+        
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+        
+        clock.now += 1.0
+        assert budget.try_acquire() is True
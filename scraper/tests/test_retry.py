@@ -0,0 +1,111 @@
+"""
+Tests for the shared retry policy, budget and deadline.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from amazon_paapi.errors import TooManyRequests
+
+from ..amazon_api import AmazonAPIClient
+from ..focused_scraper import FocusedScraper
+from ..retry import RetryBudget, RetryPolicy, retry_after_seconds
+
+
+class TestRetryPolicy:
+    """Test backoff, budget and deadline decisions."""
+
+    def test_decorrelated_jitter_bounds(self):
+        """Test that delays stay between the base and the cap and can grow past the base."""
+        retry = RetryPolicy(max_attempts=50, base_delay=1.0, max_delay=8.0).start("test")
+
+        delays = [retry.next_delay() for _ in range(200)]
+
+        assert all(1.0 <= delay <= 8.0 for delay in delays)
+        assert max(delays) > 3.0
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_retries_per_first_attempt(self, monkeypatch):
+        """Test that a run may retry min_retries plus ratio x first attempts, then gives up."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        policy = RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0.5, min_retries=1))
+
+        retries = 0
+        for _ in range(4):
+            retry = policy.start("test")
+            while await retry.backoff("HTTP 503"):
+                retries += 1
+
+        assert retries == 1 + 0.5 * 4
+        assert policy.budget.stats['denied'] == 4
+
+    @pytest.mark.asyncio
+    async def test_deadline_and_retry_after(self, monkeypatch):
+        """Test that Retry-After raises the delay and no retry is scheduled past the deadline."""
+        sleep = AsyncMock()
+        monkeypatch.setattr("asyncio.sleep", sleep)
+        policy = RetryPolicy(base_delay=0.1, max_delay=60.0, budget=RetryBudget(deadline_seconds=30))
+
+        assert await policy.start("test").backoff("HTTP 429", retry_after=20)
+        assert sleep.await_args.args[0] == 20
+        assert not await policy.start("test").backoff("HTTP 429", retry_after=45)
+
+        assert retry_after_seconds(SimpleNamespace(headers={'Retry-After': '7'})) == 7.0
+        assert retry_after_seconds(SimpleNamespace(headers={'Retry-After': 'Wed, 21 Oct 2026 07:28:00 GMT'})) is None
+        assert retry_after_seconds(SimpleNamespace()) is None
+
+
+class TestClientRetries:
+    """Test that the upstream clients share the run's retry budget."""
+
+    @pytest.mark.asyncio
+    async def test_failing_upstream_cannot_multiply_requests(self, test_settings, monkeypatch):
+        """Test that once the shared budget is spent, each request is tried only once."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        settings = test_settings.model_copy(update={'retry_budget_min': 2, 'retry_budget_ratio': 0.0})
+        scraper = FocusedScraper(settings)
+        async with scraper:
+            scraper.scraper_client.client = AsyncMock()
+            scraper.scraper_client.client.get.return_value = MagicMock(status_code=503, content=b"")
+
+            for asin in ["B0RETRY001", "B0RETRY002", "B0RETRY003"]:
+                assert await scraper.scraper_client.scrape_product(asin) is None
+
+            # 3 first attempts + the 2 retries the budget allows
+            assert scraper.scraper_client.client.get.call_count == 5
+            assert scraper.retry_budget.stats['denied'] == 2
+
+    @pytest.mark.asyncio
+    async def test_paapi_retries_throttling(self, test_settings, monkeypatch):
+        """Test that PAAPI throttling is retried and bad requests are not."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        client = AmazonAPIClient(test_settings)
+        client.amazon_api = MagicMock()
+        get_items = client.amazon_api.get_items
+        get_items.side_effect = [TooManyRequests("slow down"), "items"]
+
+        assert await client._get_items("B08N5WRWNW", []) == "items"
+        assert get_items.call_count == 2
+
+        get_items.reset_mock(side_effect=True)
+        get_items.side_effect = ValueError("Invalid partner tag")
+        with pytest.raises(ValueError):
+            await client._get_items("B08N5WRWNW", [])
+        assert get_items.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_savingsguru_page_retried(self, test_settings, monkeypatch):
+        """Test that a 503 from SavingsGuru is retried instead of skipping the page."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        scraper = FocusedScraper(test_settings)
+        client = AsyncMock()
+        client.get.side_effect = [
+            SimpleNamespace(status_code=503, content=b""),
+            SimpleNamespace(status_code=200, content=b"ok")
+        ]
+
+        response = await scraper.fetch_page(client, "https://www.savingsguru.ca")
+
+        assert response.status_code == 200
+        assert scraper.metrics.requests['savingsguru'] == 2
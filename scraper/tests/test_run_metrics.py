@@ -0,0 +1,117 @@
+"""
+Tests for per-run metrics and the perf_report regression check.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from .. import perf_report
+from ..focused_scraper import FocusedScraper
+from ..perf_report import compare_runs
+from ..run_metrics import METRICS_FILE_NAME, RunMetrics, append_run, flatten, load_runs
+from .helpers import lookup, page_html
+
+
+ASINS = ["B0MTRC0001", "B0MTRC0002"]
+
+
+def make_run(total: float, paapi_hit_ratio: float, marketplace: str = "CA", mode: str = "batch") -> dict:
+    return {
+        'marketplace': marketplace, 'mode': mode, 'started_at': '2024-01-01T00:00:00',
+        'seconds': {'total': total, 'resolve_products': total / 2},
+        'requests': {'paapi': 40}, 'cache_hit_ratio': {'paapi_flight': paapi_hit_ratio},
+    }
+
+
+class TestRunMetrics:
+    """Test collection and the metrics file."""
+
+    def test_record_sections(self):
+        """Test that stages add up and the record flattens to section.name metrics."""
+        metrics = RunMetrics()
+        with metrics.stage('commit'):
+            pass
+        with metrics.stage('commit'):
+            pass
+        metrics.count_request('savingsguru', 1000)
+        metrics.count_request('savingsguru', 500)
+
+        record = metrics.record({'negative_cache': 0.25, 'checkpoint': None}, {'paapi': 7}, {'deals_created': 3}, mode='batch')
+        flat = flatten(record)
+
+        assert record['mode'] == 'batch'
+        assert flat['requests.savingsguru'] == 2 and flat['bytes.savingsguru'] == 1500
+        assert flat['cache_hit_ratio.negative_cache'] == 0.25 and 'cache_hit_ratio.checkpoint' not in flat
+        assert flat['quota.paapi'] == 7 and flat['seconds.commit'] <= flat['seconds.total']
+
+    def test_append_trims_and_skips_bad_lines(self, tmp_path):
+        """Test that the file is trimmed to the last runs kept and corrupt lines are ignored."""
+        path = tmp_path / METRICS_FILE_NAME
+        for number in range(5):
+            assert append_run(path, {'run': number}, keep=2)
+        with open(path, 'ab') as f:
+            f.write(b"{not json\n")
+
+        assert [run['run'] for run in load_runs(path)] == [2, 3, 4]
+        assert load_runs(tmp_path / "missing.jsonl") == []
+
+    @pytest.mark.asyncio
+    async def test_scrape_appends_run(self, test_settings, tmp_path, monkeypatch):
+        """Test that a finished scrape records its requests, bytes and stage durations."""
+        monkeypatch.setattr("asyncio.sleep", AsyncMock())
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", lookup)
+
+        class Pages:
+            async def get(self, url):
+                return SimpleNamespace(status_code=200, content=page_html(ASINS))
+
+        scraper = FocusedScraper(test_settings.model_copy(update={'pipeline_enabled': True}))
+        scraper.page_client = Pages()
+        scraper.scraper_client = AsyncMock()
+        await scraper.scrape_deals(max_pages=2, output_file=str(tmp_path / "deals.json"))
+
+        runs = load_runs(Path(test_settings.state_dir) / METRICS_FILE_NAME)
+        assert len(runs) == 1
+        assert runs[0]['mode'] == 'pipeline' and runs[0]['marketplace'] == test_settings.amz_marketplace
+        assert runs[0]['requests']['savingsguru'] == 2 and runs[0]['bytes']['savingsguru'] == 2 * len(page_html(ASINS))
+        assert {'total', 'fetch_posts', 'resolve_products', 'commit'} <= set(runs[0]['seconds'])
+
+
+class TestPerfReport:
+    """Test regression detection against earlier runs."""
+
+    def test_compare_against_median(self):
+        """Test that durations regress upwards, hit ratios downwards, and only gated metrics count."""
+        runs = [make_run(100, 0.5), make_run(300, 0.5), make_run(110, 0.5), make_run(130, 0.3)]
+
+        table, regressions = compare_runs(runs, threshold_pct=25)
+        assert table['seconds.total'][1] == pytest.approx(18.18, abs=0.01)
+        assert regressions == []
+
+        _, regressions = compare_runs(runs, threshold_pct=15, gated=['seconds.*', 'cache_hit_ratio.*'])
+        assert regressions == ['cache_hit_ratio.paapi_flight', 'seconds.resolve_products', 'seconds.total']
+
+    def test_exit_status(self, test_settings, tmp_path, monkeypatch, capsys):
+        """Test that the CLI fails only when the latest run of the marketplace and mode regressed."""
+        path = tmp_path / METRICS_FILE_NAME
+        runs = [
+            make_run(100, 0.5), make_run(100, 0.5), make_run(10, 0.5, "US"), make_run(10, 0.5, mode="pipeline"),
+            make_run(10, 0.5, mode="pipeline"), make_run(200, 0.5)
+        ]
+        for run in runs:
+            append_run(path, run)
+
+        def report(*args):
+            monkeypatch.setattr(sys, 'argv', ['perf_report', '--metrics-file', str(path), *args])
+            return perf_report.main()
+
+        assert report() == 1
+        assert "seconds.total" in capsys.readouterr().out
+        assert report('--threshold', '150') == 0
+        assert report('--marketplace', 'US') == 0
+        assert report('--mode', 'pipeline') == 0
+        assert report('--metric', 'requests.*') == 0
@@ -0,0 +1,113 @@
+"""
+Tests for the binary full-text search index.
+"""
+
+import pytest
+
+from .. import search_index
+from ..search_index import SearchIndex, build_search_index, tokenize, write_search_index
+
+
+DEALS = [
+    {"id": "d1", "title": "Sony WH-1000XM5 Wireless Headphones", "brand": "Sony",
+     "category": "Electronics", "description": "Noise cancelling over-ear headphones"},
+    {"id": "d2", "title": "Anker USB-C Charger 65W", "brand": "Anker",
+     "category": "Electronics", "description": "Compact wall charger for laptops and phones"},
+    {"id": "d3", "title": "Gaiam Yoga Mat", "brand": "Gaiam",
+     "category": "Sports & Outdoors", "description": "Non-slip mat, great with wireless earbuds for workouts"},
+    {"id": "d4", "title": "LEGO Classic Creative Bricks", "brand": "LEGO",
+     "category": "Toys & Games", "description": "Bricks for creative play"},
+    {"id": "d5", "title": "Sony Wireless Speaker", "brand": "Sony",
+     "category": "Electronics", "description": "Portable bluetooth speaker"},
+]
+
+
+@pytest.fixture
+def index():
+    """Search index over the sample deals."""
+    return SearchIndex(build_search_index(DEALS))
+
+
+class TestTokenize:
+    """Test query and document tokenization."""
+
+    def test_lowercases_and_drops_stopwords(self):
+        """Test that tokens are lowercased words without stopwords."""
+        assert tokenize("The Best Deals for Home & Kitchen!") == ["best", "deals", "home", "kitchen"]
+
+
+class TestSearchIndex:
+    """Test ranking, prefix matching and the on-disk format."""
+
+    def test_title_matches_outrank_description_matches(self, index):
+        """Test that field weights rank title hits above description hits."""
+        results = [deal_id for deal_id, _ in index.search("wireless")]
+
+        assert set(results) == {"d1", "d3", "d5"}
+        assert results[-1] == "d3"
+
+    def test_all_terms_must_match(self, index):
+        """Test conjunctive matching across query terms."""
+        assert [deal_id for deal_id, _ in index.search("sony speaker")] == ["d5"]
+        assert index.search("sony lego") == []
+
+    def test_prefix_on_last_term(self, index):
+        """Test type-ahead matching of a partial last word."""
+        assert [deal_id for deal_id, _ in index.search("creative bri")] == ["d4"]
+        assert index.search("bri", prefix=False) == []
+
+    def test_brand_and_category_are_searchable(self, index):
+        """Test that brand and category fields are indexed."""
+        assert [deal_id for deal_id, _ in index.search("gaiam")] == ["d3"]
+        assert {deal_id for deal_id, _ in index.search("toys")} == {"d4"}
+
+    def test_complete_suggests_terms(self, index):
+        """Test term completion for a prefix."""
+        assert index.complete("spe") == ["speaker"]
+
+    def test_mmap_file_round_trip(self, tmp_path):
+        """Test that a written index file can be memory-mapped and queried."""
+        path = tmp_path / "search-index.bin"
+        assert write_search_index(DEALS, path) is True
+
+        mapped = SearchIndex.open(path)
+        try:
+            assert len(mapped) == len(DEALS)
+            assert mapped.search("charger")[0][0] == "d2"
+        finally:
+            mapped.close()
+
+    def test_large_conjunction_matches_brute_force(self):
+        """Test that the intersection path agrees with a brute-force scan."""
+        deals = [
+            {"id": f"x{i}", "title": f"{'alpha' if i % 2 else 'beta'} {'gamma' if i % 3 else 'delta'} item {i}"}
+            for i in range(3000)
+        ]
+        large = SearchIndex(build_search_index(deals))
+
+        results = large.search("alpha gamma", limit=3000)
+        expected = {f"x{i}" for i in range(3000) if i % 2 and i % 3}
+        assert {deal_id for deal_id, _ in results} == expected
+
+    def test_bounded_probe_keeps_a_full_top(self, monkeypatch):
+        """Test that a multi-term query filling its top within the probe budget skips full intersection."""
+        deals = [
+            {
+                "id": f"x{i}",
+                "title": f"{'alpha' if i % 2 else 'beta'} {'gamma' if i % 3 else 'delta'} item {i}",
+                "description": "filler " * (i % 40),
+            }
+            for i in range(3000)
+        ]
+        large = SearchIndex(build_search_index(deals))
+        large._top_by_intersection = None  # Must not be reached
+        monkeypatch.setattr(search_index, "PROBE_BUDGET", 30)
+
+        results = large.search("alpha gamma", limit=10)
+        assert len(results) == 10
+        assert all(int(deal_id[1:]) % 2 and int(deal_id[1:]) % 3 for deal_id, _ in results)
+
+    def test_rejects_foreign_files(self):
+        """Test that a buffer without the index header is rejected."""
+        with pytest.raises(ValueError):
+            SearchIndex(b"\0" * 128)
@@ -0,0 +1,70 @@
+"""
+Tests for the pluggable JSON backends and canonical deal records.
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from ..deal_export import DealExporter
+from ..models import Deal, load_stored_models
+from ..serialization import JSON_BACKENDS, JsonCodec, deal_records, encode_deals, get_codec
+from .helpers import make_deal
+
+
+def installed_codecs():
+    codecs = []
+    for backend in JSON_BACKENDS:
+        codec = get_codec(backend)
+        if codec.name == backend:
+            codecs.append(codec)
+    return codecs
+
+
+class TestCodecs:
+    """Test that every installed backend reads and writes the same documents."""
+
+    @pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+    def test_round_trip_matches_stdlib(self, codec):
+        """Test compact and indented output, non-JSON values and non-ASCII text."""
+        data = {"title": "Café", "price": Decimal("19.99"), "tags": ["a"], "count": 3}
+
+        compact = codec.dumps(data)
+        assert b"\n" not in compact
+        assert codec.loads(compact) == json.loads(JsonCodec().dumps(data)) == {**data, "price": "19.99"}
+        assert codec.loads(codec.dumps(data, indent=2)) == codec.loads(compact)
+        assert "Café".encode() in compact
+
+    def test_unknown_backend(self):
+        """Test that a misspelled backend is rejected."""
+        with pytest.raises(ValueError):
+            get_codec("ujson")
+
+
+class TestDealRecords:
+    """Test the canonical camelCase deal schema."""
+
+    def test_camel_case_json_native_records(self):
+        """Test that records are camelCase, JSON-native and load back into equal deals."""
+        deals = [make_deal("B0SERIAL01"), make_deal("B0SERIAL02")]
+
+        records = deal_records(deals)
+
+        assert records[0]["affiliateUrl"] == "https://www.amazon.ca/dp/B0SERIAL01?tag=test-20"
+        assert records[0]["dataSource"] == "PAAPI" and "original_price" not in records[0]
+        assert json.loads(encode_deals(deals)) == records
+        assert load_stored_models(Deal, encode_deals(deals)) == deals
+
+    def test_exporter_writes_compact_file(self, test_settings, tmp_path):
+        """Test that deals.json is compact by default and indented with JSON_PRETTY."""
+        output = tmp_path / "deals.json"
+        records = deal_records([make_deal("B0SERIAL01")])
+
+        assert DealExporter(test_settings).export(records, str(output))
+        assert b"\n" not in output.read_bytes()
+
+        pretty = test_settings.model_copy(update={'json_pretty': True})
+        assert DealExporter(pretty).export(records, str(output))
+        assert json.loads(output.read_text()) == records
+        assert output.read_text().startswith("[\n")
@@ -0,0 +1,107 @@
+"""
+Tests for the SQLite job queue and consistent-hash sharding of ASIN lookups.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ..focused_scraper import FocusedScraper
+from ..job_queue import JobQueue, TaskStatus
+from ..sharding import ConsistentHashRing, ShardCoordinator, ShardWorker, parse_credentials, shard_settings
+from .helpers import make_product
+
+
+class TestJobQueue:
+    """Test claims, completion and stale task recovery."""
+
+    def test_claims_are_exclusive_per_shard(self, tmp_path):
+        """Test that two workers never claim the same task."""
+        queue = JobQueue(str(tmp_path / "queue.sqlite"))
+        assert queue.enqueue("run", [("A1", 0), ("A2", 0), ("A3", 1)]) == 3
+        assert queue.enqueue("run", [("A1", 0)]) == 0
+
+        first = queue.claim("run", "w1", shard=0, limit=1)
+        second = queue.claim("run", "w2", shard=0, limit=5)
+
+        assert first == ["A1"] and second == ["A2"]
+        assert queue.claim("run", "w3", shard=0) == []
+        assert queue.counts("run")[TaskStatus.IN_FLIGHT.value] == 2
+
+    def test_results_and_stale_release(self, tmp_path):
+        """Test that finished results persist and dead workers' tasks are requeued."""
+        path = str(tmp_path / "queue.sqlite")
+        queue = JobQueue(path)
+        queue.enqueue("run", [("A1", 0), ("A2", 0), ("A3", 0)])
+        queue.claim("run", "w1", limit=3)
+        queue.complete("run", "A1", '{"ok": true}')
+        queue.complete("run", "A2", None)
+        queue.close()
+
+        reopened = JobQueue(path)
+        assert reopened.results("run") == {"A1": '{"ok": true}', "A2": None}
+        assert reopened.release_stale("run", older_than=0.0) == 1
+        assert reopened.claim("run", "w2") == ["A3"]
+
+
+class TestConsistentHashRing:
+    """Test key distribution and stability."""
+
+    def test_balanced_and_stable_when_growing(self):
+        """Test that shards get similar loads and adding one moves about 1/N of keys."""
+        keys = [f"B{i:09d}" for i in range(20000)]
+        four = ConsistentHashRing(range(4))
+        five = ConsistentHashRing(range(5))
+
+        sizes = [len(shard) for shard in four.partition(keys).values()]
+        assert min(sizes) > 0.7 * len(keys) / 4
+
+        moved = sum(four.node_for(key) != five.node_for(key) for key in keys)
+        assert moved < 0.3 * len(keys)
+
+    def test_shard_settings(self, test_settings):
+        """Test per-shard cache directories and round-robin credentials."""
+        settings = test_settings.model_copy(update={'paapi_credentials': "k1:s1:tag-1, k2:s2:tag-2"})
+
+        shard = shard_settings(settings, 3)
+
+        assert Path(shard.state_dir) == Path(settings.state_dir) / "shards" / "3"
+        assert (shard.amz_access_key, shard.amz_partner_tag) == ("k2", "tag-2")
+        with pytest.raises(ValueError):
+            parse_credentials("missing-parts")
+
+
+class TestShardCoordinator:
+    """Test that sharded results merge back like an in-process lookup."""
+
+    @pytest.mark.asyncio
+    async def test_in_process_workers_merge_results(self, test_settings, monkeypatch):
+        """Test the coordinator with workers run on the test's event loop."""
+        async def fake_lookup(self, asins):
+            self.stats['paapi_success'] += len(asins)
+            return {asin: make_product(asin) for asin in asins}
+
+        monkeypatch.setattr(FocusedScraper, "get_real_product_data", fake_lookup)
+        coordinator = ShardCoordinator(test_settings, workers=3)
+
+        async def run_in_process(run_id, shards):
+            return [await ShardWorker(test_settings, coordinator.db_path, run_id, shard, 4).run() for shard in shards]
+
+        monkeypatch.setattr(coordinator, "_run_shards", run_in_process)
+        asins = [f"B0{i:08d}" for i in range(30)]
+
+        products, stats = await coordinator.resolve_products(asins)
+
+        assert list(products) == asins
+        assert all(products[asin].asin == asin for asin in asins)
+        assert stats['paapi_success'] == 30
+
+    @pytest.mark.asyncio
+    async def test_worker_processes(self, test_settings):
+        """Test real worker processes end to end (invalid ASINs resolve offline)."""
+        coordinator = ShardCoordinator(test_settings, workers=2)
+
+        products, stats = await coordinator.resolve_products(["BAD1", "BAD2", "BAD3"])
+
+        assert products == {"BAD1": None, "BAD2": None, "BAD3": None}
+        assert stats['negative_cache_skips'] == 3
@@ -0,0 +1,95 @@
+"""
+Tests for single-flight request coalescing of ASIN lookups.
+"""
+
+import asyncio
+import pytest
+
+from ..singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test request coalescing and negative memoization."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that concurrent lookups for one key run the work once."""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def lookup():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "product"
+
+        results = await asyncio.gather(*[flight.do("B08N5WRWNW", lookup) for _ in range(5)])
+
+        assert results == ["product"] * 5
+        assert calls == 1
+        assert flight.stats['coalesced'] == 4
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_not_coalesced(self):
+        """Test that different ASINs get their own calls."""
+        flight = SingleFlight("test")
+
+        async def lookup():
+            return "product"
+
+        await asyncio.gather(flight.do("ASIN000001", lookup), flight.do("ASIN000002", lookup))
+
+        assert flight.stats['calls'] == 2
+        assert flight.stats['coalesced'] == 0
+
+    @pytest.mark.asyncio
+    async def test_negative_result_memoized(self):
+        """Test that a miss is remembered and skips the next lookup."""
+        flight = SingleFlight("test", negative_ttl=60)
+        calls = 0
+
+        async def lookup():
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await flight.do("B08N5WRWNW", lookup) is None
+        assert await flight.do("B08N5WRWNW", lookup) is None
+
+        assert calls == 1
+        assert flight.stats['negative_hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_negative_result_expires(self):
+        """Test that negative memo entries expire after the TTL."""
+        flight = SingleFlight("test", negative_ttl=0.01)
+        calls = 0
+
+        async def lookup():
+            nonlocal calls
+            calls += 1
+            return None
+
+        await flight.do("B08N5WRWNW", lookup)
+        await asyncio.sleep(0.02)
+        await flight.do("B08N5WRWNW", lookup)
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_all_waiters(self):
+        """Test that a failing lookup raises for every waiter and is not memoized."""
+        flight = SingleFlight("test")
+
+        async def lookup():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            flight.do("B08N5WRWNW", lookup),
+            flight.do("B08N5WRWNW", lookup),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not flight.is_negative_cached("B08N5WRWNW")
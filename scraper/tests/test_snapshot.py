@@ -0,0 +1,97 @@
+"""
+Tests for the binary state snapshot.
+"""
+
+import time
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ..deal_manager import DealManager
+from ..focused_scraper import FocusedScraper
+from ..models import AmazonProduct, Deal
+from ..snapshot import (
+    KIND_DEAL, KIND_PRICE_HISTORY, KIND_PRODUCT, SNAPSHOT_NAME, Snapshot, build_snapshot, epoch, update_snapshot
+)
+from .helpers import make_product
+
+
+class TestSnapshotFormat:
+    """Test the record table, lookups and partial updates."""
+
+    def test_lookup_without_decoding(self):
+        """Test binary search by (kind, key), freshness and lazy payload decoding."""
+        now = time.time()
+        snapshot = Snapshot(build_snapshot([
+            (KIND_PRODUCT, "B0SNAP0002", now - 7200, make_product("B0SNAP0002").model_dump_json().encode()),
+            (KIND_PRODUCT, "B0SNAP0001", now, make_product("B0SNAP0001").model_dump_json().encode()),
+            (KIND_DEAL, "B0SNAP0001", now, b"{}"),
+        ]))
+
+        assert len(snapshot) == 3 and snapshot.count(KIND_PRODUCT) == 2
+        assert snapshot.keys(KIND_PRODUCT) == ["B0SNAP0001", "B0SNAP0002"]
+        assert (KIND_DEAL, "B0SNAP0001") in snapshot
+        assert (KIND_DEAL, "B0SNAP0002") not in snapshot
+        assert snapshot.is_fresh(KIND_PRODUCT, "B0SNAP0001", 3600, now=now)
+        assert not snapshot.is_fresh(KIND_PRODUCT, "B0SNAP0002", 3600, now=now)
+        assert snapshot.load(KIND_PRODUCT, "B0SNAP0002", AmazonProduct).current_price == Decimal("19.99")
+        assert snapshot.load(KIND_PRODUCT, "B0MISSING0", AmazonProduct) is None
+
+    def test_update_replaces_one_kind(self, tmp_path):
+        """Test that updating a kind keeps the others and, optionally, unexpired entries."""
+        path = tmp_path / SNAPSHOT_NAME
+        now = time.time()
+        update_snapshot(path, KIND_PRICE_HISTORY, [("B0SNAP0001", now, b"[1]")])
+        update_snapshot(path, KIND_PRODUCT, [("B0SNAP0001", now - 10 * 3600, b"{}"), ("B0SNAP0002", now, b"{}")])
+        update_snapshot(path, KIND_PRODUCT, [("B0SNAP0003", now, b"{}")], keep_existing=True, max_age_seconds=3600)
+
+        with Snapshot.open(path) as snapshot:
+            assert snapshot.keys(KIND_PRODUCT) == ["B0SNAP0002", "B0SNAP0003"]
+            assert snapshot.payload(KIND_PRICE_HISTORY, "B0SNAP0001") == b"[1]"
+
+        path.write_bytes(b"garbage")
+        assert Snapshot.open_if_valid(path) is None
+        assert Snapshot.open_if_valid(tmp_path / "missing.snap") is None
+
+    def test_epoch(self):
+        """Test that naive timestamps are treated as UTC."""
+        assert epoch("1970-01-02T00:00:00") == 86400
+        assert epoch("1970-01-02T00:00:00Z") == 86400
+        assert epoch("not a date") == 0.0
+
+
+class TestStateWriters:
+    """Test that the deal store and scraper keep the snapshot current."""
+
+    def test_deals_and_products_are_snapshotted(self, test_settings, mock_savingsguru_post, tmp_path):
+        """Test that saved deals and resolved products can be looked up from the snapshot."""
+        deal = Deal.from_amazon_product(make_product("B0SNAP0001"), "test-20", mock_savingsguru_post)
+        DealManager(test_settings).remember_saved_deals([deal], str(tmp_path / "deals.json"))
+        FocusedScraper(test_settings).remember_products({"B0SNAP0001": make_product("B0SNAP0001"), "B0NONE0000": None})
+
+        with Snapshot.open(Path(test_settings.state_dir) / SNAPSHOT_NAME) as snapshot:
+            assert snapshot.load(KIND_DEAL, "B0SNAP0001", Deal) == deal
+            assert snapshot.keys(KIND_PRODUCT) == ["B0SNAP0001"]
+
+    @pytest.mark.asyncio
+    async def test_fresh_products_are_not_looked_up_again(self, test_settings):
+        """Test that products resolved moments ago come from the snapshot instead of the API."""
+        FocusedScraper(test_settings).remember_products({"B0SNAP0001": make_product("B0SNAP0001")})
+
+        scraper = FocusedScraper(test_settings)
+        scraper.get_real_product_data = AsyncMock(return_value={"B0SNAP0002": make_product("B0SNAP0002")})
+        products = await scraper._resolve_products(["B0SNAP0001", "B0SNAP0002"], None)
+
+        scraper.get_real_product_data.assert_awaited_once_with(["B0SNAP0002"])
+        assert products["B0SNAP0001"].asin == "B0SNAP0001"
+        assert scraper.stats['snapshot_reused'] == 1
+
+    def test_reuse_window_zero_disables(self, test_settings):
+        """Test that a zero reuse window always looks products up."""
+        test_settings.snapshot_product_reuse_minutes = 0
+        scraper = FocusedScraper(test_settings)
+        scraper.remember_products({"B0SNAP0001": make_product("B0SNAP0001")})
+
+        assert scraper.fresh_snapshot_products(["B0SNAP0001"]) == {}
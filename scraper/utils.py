@@ -5,8 +5,8 @@ Following error handling patterns from existing codebase.
 
 import asyncio
 import logging
+import os
 import time
-import json
 import re
 from typing import Dict, Any, Optional, List
 from pathlib import Path
@@ -15,6 +15,9 @@ from urllib.parse import urlparse, parse_qs
 
 from loguru import logger
 
+from .marketplaces import DEFAULT_MARKETPLACE, MARKETPLACES
+from .serialization import JsonCodec, get_codec
+
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> None:
     """
@@ -122,10 +125,18 @@ def sanitize_filename(filename: str) -> str:
     return filename.strip('-')
 
 
-def save_json_file(data: Any, filepath: str, indent: int = 2) -> bool:
+def save_json_file(
+    data: Any,
+    filepath: str,
+    indent: Optional[int] = 2,
+    atomic: bool = False,
+    codec: Optional[JsonCodec] = None
+) -> bool:
     """
     Save data to JSON file with proper error handling.
     Pattern based on database operation timing from mcp-server utils.
+    With atomic=True, readers never observe a partially written file.
+    Encodes with `codec`, or the fastest installed JSON backend.
     """
     start_time = time.time()
     
@@ -133,8 +144,12 @@ def save_json_file(data: Any, filepath: str, indent: int = 2) -> bool:
         filepath_obj = Path(filepath)
         filepath_obj.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath_obj, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, ensure_ascii=False, default=str)
+        target = filepath_obj.with_name(f".{filepath_obj.name}.tmp") if atomic else filepath_obj
+        with open(target, 'wb') as f:
+            f.write((codec or get_codec()).dumps(data, indent=indent))
+        
+        if atomic:
+            os.replace(target, filepath_obj)
         
         duration = time.time() - start_time
         logger.info(f"JSON file saved successfully in {duration*1000:.1f}ms: {filepath}")
@@ -146,13 +161,13 @@ def save_json_file(data: Any, filepath: str, indent: int = 2) -> bool:
         return False
 
 
-def load_json_file(filepath: str) -> Optional[Any]:
+def load_json_file(filepath: str, codec: Optional[JsonCodec] = None) -> Optional[Any]:
     """Load data from JSON file with proper error handling."""
     start_time = time.time()
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = (codec or get_codec()).loads(f.read())
         
         duration = time.time() - start_time
         logger.info(f"JSON file loaded successfully in {duration*1000:.1f}ms: {filepath}")
@@ -200,16 +215,10 @@ def is_valid_url(url: str) -> bool:
         return False
 
 
-def create_affiliate_url(asin: str, partner_tag: str, marketplace: str = "CA") -> str:
-    """Create Amazon affiliate URL."""
-    base_urls = {
-        "CA": "https://www.amazon.ca",
-        "US": "https://www.amazon.com",
-        "UK": "https://www.amazon.co.uk"
-    }
-    
-    base_url = base_urls.get(marketplace, base_urls["CA"])
-    return f"{base_url}/dp/{asin}?tag={partner_tag}"
+def create_affiliate_url(asin: str, partner_tag: str, marketplace: str = DEFAULT_MARKETPLACE) -> str:
+    """Create Amazon affiliate URL (unknown marketplaces fall back to Amazon.ca)."""
+    market = MARKETPLACES.get(marketplace.upper(), MARKETPLACES[DEFAULT_MARKETPLACE])
+    return market.affiliate_url(asin, partner_tag)
 
 
 def batch_items(items: List[Any], batch_size: int = 10) -> List[List[Any]]:
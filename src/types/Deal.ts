@@ -17,6 +17,7 @@ export interface Deal {
   dateAdded: string; // ISO format
   dataSource: 'PAAPI' | 'SCRAPED' | 'FALLBACK';
   asin: string;
+  brand?: string;
 }
 
 export interface DealsState {